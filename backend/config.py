@@ -10,10 +10,133 @@ class Config:
     MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "travelbuddy")
     JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None  # e.g. a local OpenAI-compatible server
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+    # Structured output: "off" (prompted JSON), "json" (JSON mode) or "function" (schema via function calling)
+    OPENAI_STRUCTURED_OUTPUT = os.getenv("OPENAI_STRUCTURED_OUTPUT", "off").lower()
+    # Shared OpenAI HTTP client (services/openai_client.py)
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+    OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+    OPENAI_POOL_MAX_CONNECTIONS = int(os.getenv("OPENAI_POOL_MAX_CONNECTIONS", "20"))
+    OPENAI_POOL_MAX_KEEPALIVE = int(os.getenv("OPENAI_POOL_MAX_KEEPALIVE", "10"))
+    OPENAI_POOL_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_POOL_KEEPALIVE_EXPIRY", "60"))
     PEXELS_API_KEY = os.getenv("PEXELS_API_KEY", "ooDr6lftY3myoAY1pumqxFVxs6m3pXwsBVOrquaKdgRbf4IQ1K1VpHO0")
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
     CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",") if origin.strip()]
     JWT_EXPIRY = 7 * 24 * 60 * 60  # 7 days in seconds
+    # Concurrent landmark image lookups (per itinerary request)
+    IMAGE_LOOKUP_WORKERS = int(os.getenv("IMAGE_LOOKUP_WORKERS", "6"))
+    IMAGE_LOOKUP_BUDGET_SECONDS = float(os.getenv("IMAGE_LOOKUP_BUDGET_SECONDS", "10"))
+    # Pexels searches: per-request timeout, process-wide concurrent searches, strategies in flight
+    # per landmark and the delay before hedging with the next one, time budget for a landmark's
+    # ranked strategies, remaining-quota level below which strategies run one at a time, and the
+    # backoff after a 429 without Retry-After / X-Ratelimit-Reset (doubles, capped)
+    PEXELS_TIMEOUT = float(os.getenv("PEXELS_TIMEOUT", "8"))
+    PEXELS_SEARCH_WORKERS = int(os.getenv("PEXELS_SEARCH_WORKERS", "8"))
+    PEXELS_STRATEGY_CONCURRENCY = int(os.getenv("PEXELS_STRATEGY_CONCURRENCY", "2"))
+    PEXELS_HEDGE_DELAY_SECONDS = float(os.getenv("PEXELS_HEDGE_DELAY_SECONDS", "1.5"))
+    PEXELS_SEARCH_BUDGET_SECONDS = float(os.getenv("PEXELS_SEARCH_BUDGET_SECONDS", "8"))
+    PEXELS_QUOTA_RESERVE = int(os.getenv("PEXELS_QUOTA_RESERVE", "50"))
+    PEXELS_BACKOFF_SECONDS = float(os.getenv("PEXELS_BACKOFF_SECONDS", "60"))
+    PEXELS_MAX_BACKOFF_SECONDS = float(os.getenv("PEXELS_MAX_BACKOFF_SECONDS", "3600"))
+    # Result cache for /api/itinerary/generate-public
+    ITINERARY_CACHE_TTL = int(os.getenv("ITINERARY_CACHE_TTL", str(6 * 3600)))
+    ITINERARY_CACHE_STALE_TTL = int(os.getenv("ITINERARY_CACHE_STALE_TTL", str(24 * 3600)))
+    ITINERARY_CACHE_MAX_BYTES = int(os.getenv("ITINERARY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    ITINERARY_CACHE_BUDGET_STEP = float(os.getenv("ITINERARY_CACHE_BUDGET_STEP", "0.25"))  # 25% wide budget buckets
+    # Local geographic planner: "preplan" (LLM follows a local day plan), "local" (no LLM) or "off"
+    ITINERARY_PLANNER = os.getenv("ITINERARY_PLANNER", "preplan").lower()
+    # Long trips are generated as concurrent day chunks (one completion per chunk)
+    ITINERARY_CHUNK_MIN_DAYS = int(os.getenv("ITINERARY_CHUNK_MIN_DAYS", "8"))
+    ITINERARY_CHUNK_DAYS = int(os.getenv("ITINERARY_CHUNK_DAYS", "4"))
+    ITINERARY_CHUNK_WORKERS = int(os.getenv("ITINERARY_CHUNK_WORKERS", "4"))
+    ITINERARY_CHUNK_MAX_TOKENS = int(os.getenv("ITINERARY_CHUNK_MAX_TOKENS", "2500"))
+    # Background generation jobs (worker.py)
+    JOB_WORKER_PROCESSES = int(os.getenv("JOB_WORKER_PROCESSES", "2"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "600"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    # OSRM routing server (route/table services)
+    OSRM_URL = os.getenv("OSRM_URL", "https://router.project-osrm.org").rstrip("/")
+    # Geocoding: concurrent lookups per request and in-process cache size
+    GEOCODE_WORKERS = int(os.getenv("GEOCODE_WORKERS", "4"))
+    GEOCODE_CACHE_SIZE = int(os.getenv("GEOCODE_CACHE_SIZE", "5000"))
+    # Persistent geocode cache (Mongo geocode_cache): found places / "not found" answers
+    GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", str(90 * 24 * 3600)))
+    GEOCODE_NEGATIVE_TTL = int(os.getenv("GEOCODE_NEGATIVE_TTL", str(24 * 3600)))
+    # Nominatim policy: 1 request/second, shared by all processes on the host
+    NOMINATIM_RATE = float(os.getenv("NOMINATIM_RATE", "1.0"))
+    NOMINATIM_BURST = float(os.getenv("NOMINATIM_BURST", "1"))
+    NOMINATIM_MAX_WAIT = float(os.getenv("NOMINATIM_MAX_WAIT", "5"))
+    RATE_LIMIT_DIR = os.getenv("RATE_LIMIT_DIR", "")  # defaults to the system temp dir
+    # Overpass attraction queries: geohash tile precision (4 ~ 39x20 km), cache TTL, concurrent fetches
+    OVERPASS_TILE_PRECISION = int(os.getenv("OVERPASS_TILE_PRECISION", "4"))
+    OVERPASS_TILE_TTL = int(os.getenv("OVERPASS_TILE_TTL", str(30 * 24 * 3600)))
+    OVERPASS_TILE_WORKERS = int(os.getenv("OVERPASS_TILE_WORKERS", "2"))
+    OVERPASS_TIMEOUT = int(os.getenv("OVERPASS_TIMEOUT", "25"))
+    OVERPASS_TILE_MAX_PLACES = int(os.getenv("OVERPASS_TILE_MAX_PLACES", "150"))
+    # In-memory POI index: places kept per process before least recently used tiles are dropped
+    POI_INDEX_MAX_PLACES = int(os.getenv("POI_INDEX_MAX_PLACES", "200000"))
+    # In-memory binary caches (services/cache_service.py): byte budget per cache, eviction
+    # policy ("tinylfu" or "lru"), optional disk tier for evicted entries, expiry sweep period
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_POLICY = os.getenv("CACHE_POLICY", "tinylfu")
+    CACHE_DISK_DIR = os.getenv("CACHE_DISK_DIR", "")
+    CACHE_DISK_MAX_BYTES = int(os.getenv("CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+    CACHE_SWEEP_INTERVAL = float(os.getenv("CACHE_SWEEP_INTERVAL", "60"))
+    # Cache backend for photos and landmark image URLs: "memory" (per process),
+    # "sqlite" (shared by the workers on one host) or "redis" (shared by all hosts)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_SQLITE_DIR = os.getenv("CACHE_SQLITE_DIR", "")  # defaults to /dev/shm
+    CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "travelbuddy")
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", "0.5"))
+    PHOTO_CACHE_TTL = int(os.getenv("PHOTO_CACHE_TTL", str(24 * 3600)))
+    # Pexels image URLs; fallback (placeholder) URLs are kept shorter so Pexels is retried
+    LANDMARK_CACHE_TTL = int(os.getenv("LANDMARK_CACHE_TTL", str(7 * 24 * 3600)))
+    LANDMARK_FALLBACK_TTL = int(os.getenv("LANDMARK_FALLBACK_TTL", "3600"))
+    # Photo proxy: largest image kept in the in-memory cache (bytes)
+    PHOTO_CACHE_MAX_BYTES = int(os.getenv("PHOTO_CACHE_MAX_BYTES", str(5 * 1024 * 1024)))
+    # Photo proxy image pipeline (needs Pillow): resize to maxwidth and re-encode as AVIF/WebP
+    # when the client's Accept header allows it, in a process pool; preferred formats first
+    IMAGE_PIPELINE_ENABLED = os.getenv("IMAGE_PIPELINE_ENABLED", "true").lower() == "true"
+    IMAGE_FORMATS = [fmt.strip().lower() for fmt in os.getenv("IMAGE_FORMATS", "avif,webp").split(",") if fmt.strip()]
+    IMAGE_TRANSCODE_WORKERS = int(os.getenv("IMAGE_TRANSCODE_WORKERS", "2"))
+    IMAGE_TRANSCODE_TIMEOUT = float(os.getenv("IMAGE_TRANSCODE_TIMEOUT", "10"))
+    IMAGE_AVIF_QUALITY = int(os.getenv("IMAGE_AVIF_QUALITY", "55"))
+    IMAGE_WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+    IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "82"))
+    # Largest upstream image the pipeline downloads (bytes); bigger ones are passed through
+    IMAGE_SOURCE_MAX_BYTES = int(os.getenv("IMAGE_SOURCE_MAX_BYTES", str(20 * 1024 * 1024)))
+    # Hosts the photo proxy fetches `url=` images from (Pexels / Picsum URLs from ImageService)
+    PHOTO_PROXY_HOSTS = [host.strip().lower() for host in os.getenv(
+        "PHOTO_PROXY_HOSTS", "images.pexels.com,picsum.photos,fastly.picsum.photos"
+    ).split(",") if host.strip()]
+    # Map marker clusters (/api/maps/clusters): seconds a clustered tile stays cached
+    CLUSTER_CACHE_TTL = int(os.getenv("CLUSTER_CACHE_TTL", "3600"))
+    # Offline POI store built by import_osm.py (memory-mapped; used before Overpass when present)
+    POI_STORE_PATH = os.getenv(
+        "POI_STORE_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "pois.bin")
+    )
+    # Offline gazetteer for city-level geocoding: GeoNames cities15000.txt and countryInfo.txt
+    # (download into data/, see README). The bundled *_sample files are a small test fixture,
+    # used only when these don't exist
+    GAZETTEER_CITIES_PATH = os.getenv(
+        "GAZETTEER_CITIES_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cities15000.txt")
+    )
+    GAZETTEER_COUNTRIES_PATH = os.getenv(
+        "GAZETTEER_COUNTRIES_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "countryInfo.txt")
+    )
+    GAZETTEER_MIN_POPULATION = int(os.getenv("GAZETTEER_MIN_POPULATION", "0"))
+    # Known destinations and landmark attractions (services/destination_catalog.py)
+    DESTINATIONS_PATH = os.getenv(
+        "DESTINATIONS_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "destinations.json")
+    )
 
 class DevelopmentConfig(Config):
     """Development configuration"""
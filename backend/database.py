@@ -52,6 +52,27 @@ class MongoDatabase:
                 db.itineraries.create_index([("user_id", 1), ("created_at", -1)])
             except Exception as e:
                 print(f"Warning: Could not create itinerary indexes: {e}")
+
+            # Job queue indexes
+            try:
+                db.jobs.create_index([("status", 1), ("created_at", 1)])
+                db.jobs.create_index("user_id")
+                # Finished jobs are removed after 7 days
+                db.jobs.create_index("finished_at", expireAfterSeconds=7 * 24 * 60 * 60)
+            except Exception as e:
+                print(f"Warning: Could not create job indexes: {e}")
+
+            # Geocode cache: entries are removed once expires_at has passed
+            try:
+                db.geocode_cache.create_index("expires_at", expireAfterSeconds=0)
+            except Exception as e:
+                print(f"Warning: Could not create geocode cache indexes: {e}")
+
+            # Overpass tile cache: tiles are removed once expires_at has passed
+            try:
+                db.overpass_tiles.create_index("expires_at", expireAfterSeconds=0)
+            except Exception as e:
+                print(f"Warning: Could not create overpass tile indexes: {e}")
         except Exception as e:
             print(f"Warning: Index creation failed: {e}")
 
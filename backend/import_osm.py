@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Offline OpenStreetMap importer for AI Travel Buddy
+Extracts attractions (the same tag filters as the live Overpass queries)
+from an OSM extract and writes the memory-mapped POI store that
+MapsService reads before falling back to Overpass.
+
+Input: .osm.pbf / .osm extracts (needs `pip install osmium`) or an Overpass
+JSON dump (`[out:json]; ...; out center;`).
+
+Usage: python import_osm.py EXTRACT [--output data/pois.bin]
+"""
+import argparse
+import sys
+import time
+
+from config import Config
+from services.poi_store import PoiStoreWriter
+from utils import osm_tags
+from utils.json_stream import JsonArrayStream
+
+try:
+    import osmium
+    OSMIUM_AVAILABLE = True
+except ImportError:
+    OSMIUM_AVAILABLE = False
+
+READ_CHUNK_CHARS = 1 << 20
+
+
+def import_overpass_json(path, writer):
+    """Stream the "elements" array of an Overpass JSON dump into the writer"""
+    parser = JsonArrayStream("elements")
+    skipped = 0
+    with open(path, encoding="utf-8") as f:
+        while not parser.done:
+            chunk = f.read(READ_CHUNK_CHARS)
+            if not chunk:
+                break
+            for element in parser.feed(chunk):
+                if "center" not in element and element.get("geometry"):
+                    # `out geom` dumps: use the mean of the way's points
+                    points = element["geometry"]
+                    element["center"] = {
+                        "lat": sum(p["lat"] for p in points) / len(points),
+                        "lon": sum(p["lon"] for p in points) / len(points)
+                    }
+                if not osm_tags.is_attraction(element.get("type", "node"), element.get("tags", {})):
+                    continue
+                if osm_tags.element_id(element) is None:
+                    skipped += 1
+                    continue
+                place = osm_tags.element_place(element)
+                if place:
+                    writer.add(place)
+    if skipped:
+        print(f"Skipped {skipped} elements without an integer id")
+
+
+def import_pbf(path, writer):
+    """Scan an OSM extract with pyosmium; ways are placed at the mean of their nodes"""
+    if not OSMIUM_AVAILABLE:
+        sys.exit("Reading .osm.pbf extracts needs pyosmium: pip install osmium")
+
+    class AttractionHandler(osmium.SimpleHandler):
+        def node(self, node):
+            if "name" not in node.tags:
+                return
+            tags = {tag.k: tag.v for tag in node.tags}
+            if osm_tags.is_attraction("node", tags):
+                place = osm_tags.attraction_place("node", node.id, node.location.lat, node.location.lon, tags)
+                if place:
+                    writer.add(place)
+
+        def way(self, way):
+            if "name" not in way.tags:
+                return
+            tags = {tag.k: tag.v for tag in way.tags}
+            if not osm_tags.is_attraction("way", tags):
+                return
+            points = [(n.location.lat, n.location.lon) for n in way.nodes if n.location.valid()]
+            if not points:
+                return
+            place = osm_tags.attraction_place(
+                "way",
+                way.id,
+                sum(lat for lat, _ in points) / len(points),
+                sum(lng for _, lng in points) / len(points),
+                tags
+            )
+            if place:
+                writer.add(place)
+
+    # locations=True resolves way node coordinates while reading
+    AttractionHandler().apply_file(path, locations=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline POI store from an OSM extract")
+    parser.add_argument("extract", help=".osm.pbf / .osm extract or Overpass JSON dump")
+    parser.add_argument("--output", default=Config.POI_STORE_PATH, help="POI store to write")
+    parser.add_argument("--cell-degrees", type=float, default=0.02, help="spatial index grid cell size")
+    parser.add_argument("--coverage-degrees", type=float, default=0.05,
+                        help="coverage grid cell size (cells holding a POI count as covered)")
+    args = parser.parse_args()
+
+    started = time.time()
+    writer = PoiStoreWriter(cell_degrees=args.cell_degrees, coverage_degrees=args.coverage_degrees)
+    if args.extract.endswith(".json"):
+        import_overpass_json(args.extract, writer)
+    else:
+        import_pbf(args.extract, writer)
+
+    writer.save(args.output, source=args.extract)
+    print(f"Imported {len(writer)} places from {args.extract} into {args.output} "
+          f"in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
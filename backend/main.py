@@ -10,6 +10,10 @@ from routes.maps_routes import maps_bp
 from routes.bigquery_routes import bigquery_bp
 from routes.image_routes import image_bp
 from services.bigquery_service import BigQueryService
+from services.destination_catalog import DestinationCatalog
+from services.gazetteer import Gazetteer
+from services.poi_index import PoiIndex
+from services.poi_store import PoiStore
 
 def create_app(config_name="development"):
     """Application factory"""
@@ -26,6 +30,12 @@ def create_app(config_name="development"):
     with app.app_context():
         MongoDatabase.connect()
     
+    # Load the destination catalog, gazetteer, POI index and POI store once, before the first request needs them
+    DestinationCatalog.get()
+    Gazetteer.get()
+    PoiIndex.get()
+    PoiStore.get()
+    
     # Initialize BigQuery and create tables
     print("\n" + "="*60)
     print("Initializing BigQuery...")
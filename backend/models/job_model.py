@@ -0,0 +1,42 @@
+# backend/models/job_model.py
+from datetime import datetime
+from bson.objectid import ObjectId
+
+class Job:
+    """Background itinerary generation job"""
+
+    @staticmethod
+    def create(user_id, destination, budget, travel_duration, travel_style):
+        """Create a new queued job document"""
+        return {
+            "_id": ObjectId(),
+            "user_id": ObjectId(user_id) if isinstance(user_id, str) else user_id,
+            "type": "generate_itinerary",
+            "params": {
+                "destination": destination,
+                "budget": budget,
+                "travel_duration": travel_duration,
+                "travel_style": travel_style
+            },
+            "status": "queued",  # queued, running, done, failed
+            "attempts": 0,
+            "worker_id": None,
+            "lease_expires_at": None,
+            "itinerary_id": None,
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+            "finished_at": None
+        }
+
+    @staticmethod
+    def to_dict(job):
+        """Convert job document to dict for JSON response"""
+        job_dict = dict(job)
+        job_dict["_id"] = str(job_dict["_id"])
+        job_dict["user_id"] = str(job_dict["user_id"])
+        if job_dict.get("itinerary_id"):
+            job_dict["itinerary_id"] = str(job_dict["itinerary_id"])
+        job_dict.pop("worker_id", None)
+        job_dict.pop("lease_expires_at", None)
+        return job_dict
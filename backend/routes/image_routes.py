@@ -1,6 +1,6 @@
 # backend/routes/image_routes.py
 from flask import Blueprint, request, jsonify
-from services.image_service import ImageService
+from services.image_service import ImageService, PexelsQuota
 
 image_bp = Blueprint("images", __name__, url_prefix="/api/images")
 
@@ -32,3 +32,15 @@ def get_landmark_image():
             "success": False,
             "error": str(e)
         }), 500
+
+
+@image_bp.route("/metrics", methods=["GET"])
+def get_image_metrics():
+    """Expose the Pexels quota (X-Ratelimit-* headers, 429 backoff) and landmark image cache stats"""
+    try:
+        return jsonify({
+            "pexels": PexelsQuota.stats(),
+            "landmark_cache": ImageService._landmark_cache.stats()
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -1,14 +1,61 @@
 # backend/routes/itinerary_routes.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from database import MongoDatabase
 from models.itinerary_model import Itinerary
 from services.jwt_handler import JWTHandler
 from services.ai_engine import AIEngine
 from services.bigquery_service import BigQueryService
+from services.itinerary_cache import itinerary_cache
+from services.itinerary_store import ItineraryStore
+from services.job_queue import JobQueue
+from services.openai_client import OpenAIClient
+from services.single_flight import generation_flight
+from models.job_model import Job
 from bson.objectid import ObjectId
+import json
 
 itinerary_bp = Blueprint("itinerary", __name__, url_prefix="/api/itinerary")
 bigquery_service = BigQueryService()
+itinerary_store = ItineraryStore(bigquery_service)
+
+
+def _parse_generation_request(data):
+    """Validate a generation request body.
+
+    Returns ((destination, budget, days, travel_style), None) on success or
+    (None, (response, status)) with the error to return.
+    """
+    if not data:
+        return None, (jsonify({"error": "Request body required"}), 400)
+
+    destination = data.get("destination")
+    budget = data.get("budget")
+    days = data.get("days", 3)
+    travel_style = data.get("travel_style", "leisure")
+
+    if not all([destination, budget]):
+        return None, (jsonify({"error": "Destination and budget required"}), 400)
+
+    # Validate input types
+    try:
+        budget = float(budget)
+        days = int(days)
+        if budget <= 0:
+            return None, (jsonify({"error": "Budget must be greater than 0"}), 400)
+        if days < 1 or days > 30:
+            return None, (jsonify({"error": "Days must be between 1 and 30"}), 400)
+        if travel_style not in ["leisure", "adventure", "cultural", "budget"]:
+            return None, (jsonify({"error": "Invalid travel style"}), 400)
+    except (ValueError, TypeError):
+        return None, (jsonify({"error": "Invalid input format"}), 400)
+
+    return (destination, budget, days, travel_style), None
+
+
+def _sse(event, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
 
 @itinerary_bp.route("/generate", methods=["POST"])
 def generate_itinerary():
@@ -24,42 +71,25 @@ def generate_itinerary():
         if "error" in payload:
             return jsonify(payload), 401
 
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "Request body required"}), 400
-            
-        destination = data.get("destination")
-        budget = data.get("budget")
-        days = data.get("days", 3)
-        travel_style = data.get("travel_style", "leisure")
-
-        if not all([destination, budget]):
-            return jsonify({"error": "Destination and budget required"}), 400
-        
-        # Validate input types
-        try:
-            budget = float(budget)
-            days = int(days)
-            if budget <= 0:
-                return jsonify({"error": "Budget must be greater than 0"}), 400
-            if days < 1 or days > 30:
-                return jsonify({"error": "Days must be between 1 and 30"}), 400
-            if travel_style not in ["leisure", "adventure", "cultural", "budget"]:
-                return jsonify({"error": "Invalid travel style"}), 400
-        except (ValueError, TypeError):
-            return jsonify({"error": "Invalid input format"}), 400
-
-        # Generate itinerary using AI engine
-        ai_engine = AIEngine()
-        # Check if OpenAI key is set, otherwise use sample
-        from config import Config
-        if Config.OPENAI_API_KEY:
-            itinerary_data = ai_engine.generate_itinerary(destination, budget, days, travel_style)
-        else:
-            itinerary_data = ai_engine.get_sample_itinerary(destination, budget, days, travel_style)
-
-        # Create itinerary document
-        itinerary_doc = Itinerary.create(
+        params, error = _parse_generation_request(request.get_json())
+        if error:
+            return error
+        destination, budget, days, travel_style = params
+
+        # Async mode: queue the job for worker.py and return immediately
+        if request.args.get("async", "").lower() in ("1", "true", "yes"):
+            job = JobQueue.enqueue(payload["user_id"], destination, budget, days, travel_style)
+            return jsonify({
+                "message": "Itinerary generation queued",
+                "job_id": str(job["_id"]),
+                "status": job["status"],
+                "status_url": f"/api/itinerary/jobs/{job['_id']}"
+            }), 202
+
+        # Generate itinerary using AI engine (identical concurrent requests share one run)
+        itinerary_data = AIEngine.generate(destination, budget, days, travel_style)
+
+        itinerary_doc = itinerary_store.save_generated(
             payload["user_id"],
             destination,
             budget,
@@ -68,40 +98,108 @@ def generate_itinerary():
             itinerary_data
         )
 
-        # Save to database
-        db = MongoDatabase.get_db()
-        result = db.itineraries.insert_one(itinerary_doc)
-        
-        # Log to BigQuery
-        try:
-            total_cost = itinerary_data.get("estimated_cost", budget) if itinerary_data else budget
-            bigquery_service.log_itinerary(
-                itinerary_id=str(result.inserted_id),
-                user_id=payload["user_id"],
-                destination=destination,
-                budget=budget,
-                days=days,
-                travel_style=travel_style,
-                total_cost=total_cost
-            )
-            bigquery_service.log_event(
-                user_id=payload["user_id"],
-                event_type="itinerary_created",
-                destination=destination,
-                metadata={"days": days, "travel_style": travel_style}
-            )
-        except Exception as bq_error:
-            print(f"⚠ BigQuery logging failed: {str(bq_error)}")
-
         return jsonify({
             "message": "Itinerary generated successfully",
-            "itinerary": Itinerary.to_dict({**itinerary_doc, "_id": result.inserted_id})
+            "itinerary": Itinerary.to_dict(itinerary_doc)
         }), 201
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@itinerary_bp.route("/generate-stream", methods=["POST"])
+def generate_itinerary_stream():
+    """Generate an itinerary and stream it as Server-Sent Events
+
+    Same request body and auth as /generate. Events, in order:
+    attractions, day (one per day), tips, cost, done (saved itinerary).
+    An error event is sent if generation fails part-way.
+    """
+    try:
+        auth_header = request.headers.get("Authorization")
+        token = JWTHandler.get_token_from_header(auth_header)
+
+        if not token:
+            return jsonify({"error": "Token required"}), 401
+
+        payload = JWTHandler.verify_token(token)
+        if "error" in payload:
+            return jsonify(payload), 401
+
+        params, error = _parse_generation_request(request.get_json())
+        if error:
+            return error
+        destination, budget, days, travel_style = params
+        user_id = payload["user_id"]
+
+        def event_stream():
+            try:
+                ai_engine = AIEngine()
+                for event, data in ai_engine.stream_itinerary(destination, budget, days, travel_style):
+                    if event == "done":
+                        itinerary_doc = itinerary_store.save_generated(
+                            user_id, destination, budget, days, travel_style, data["itinerary"]
+                        )
+                        data = {"itinerary": Itinerary.to_dict(itinerary_doc)}
+                    yield _sse(event, data)
+            except Exception as e:
+                print(f"Error streaming itinerary: {str(e)}")
+                yield _sse("error", {"error": str(e)})
+
+        return Response(
+            event_stream(),
+            mimetype="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+            }
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@itinerary_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_generation_job(job_id):
+    """Poll an async generation job; includes the itinerary once done"""
+    try:
+        auth_header = request.headers.get("Authorization")
+        token = JWTHandler.get_token_from_header(auth_header)
+
+        if not token:
+            return jsonify({"error": "Token required"}), 401
+
+        payload = JWTHandler.verify_token(token)
+        if "error" in payload:
+            return jsonify(payload), 401
+
+        # Validate ObjectId format
+        try:
+            ObjectId(job_id)
+        except Exception:
+            return jsonify({"error": "Invalid job ID format"}), 400
+
+        job = JobQueue.get(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        # Users can only poll their own jobs (unless admin)
+        if str(job["user_id"]) != payload["user_id"] and payload.get("role") != "admin":
+            return jsonify({"error": "Unauthorized"}), 403
+
+        response = {"job": Job.to_dict(job)}
+        if job["status"] == "done" and job.get("itinerary_id"):
+            db = MongoDatabase.get_db()
+            itinerary = db.itineraries.find_one({"_id": job["itinerary_id"]})
+            if itinerary:
+                response["itinerary"] = Itinerary.to_dict(itinerary)
+
+        return jsonify(response), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @itinerary_bp.route("/generate-public", methods=["POST"])
 def generate_itinerary_public():
     """Generate AI-powered itinerary without authentication (for WordPress widget/public use)
@@ -110,42 +208,20 @@ def generate_itinerary_public():
     Consider adding rate limiting in production.
     """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "Request body required"}), 400
-            
-        destination = data.get("destination")
-        budget = data.get("budget")
-        days = data.get("days", 3)
-        travel_style = data.get("travel_style", "leisure")
-
-        if not all([destination, budget]):
-            return jsonify({"error": "Destination and budget required"}), 400
-        
-        # Validate input types
-        try:
-            budget = float(budget)
-            days = int(days)
-            if budget <= 0:
-                return jsonify({"error": "Budget must be greater than 0"}), 400
-            if days < 1 or days > 30:
-                return jsonify({"error": "Days must be between 1 and 30"}), 400
-            if travel_style not in ["leisure", "adventure", "cultural", "budget"]:
-                return jsonify({"error": "Invalid travel style"}), 400
-        except (ValueError, TypeError):
-            return jsonify({"error": "Invalid input format"}), 400
-
-        # Generate itinerary using AI engine
-        ai_engine = AIEngine()
-        from config import Config
-        if Config.OPENAI_API_KEY:
-            itinerary_data = ai_engine.generate_itinerary(destination, budget, days, travel_style)
-        else:
-            itinerary_data = ai_engine.get_sample_itinerary(destination, budget, days, travel_style)
+        params, error = _parse_generation_request(request.get_json())
+        if error:
+            return error
+        destination, budget, days, travel_style = params
+
+        # Widget traffic repeats the same few trips, so serve them from the result cache
+        itinerary_data, cache_status = itinerary_cache.get_or_generate(
+            destination, budget, days, travel_style,
+            lambda: AIEngine.generate(destination, budget, days, travel_style)
+        )
 
         # Return itinerary without saving to database (public use)
         # Optionally, you could save with a guest user_id or skip saving entirely
-        return jsonify({
+        response = jsonify({
             "message": "Itinerary generated successfully",
             "itinerary": {
                 "destination": destination,
@@ -155,6 +231,23 @@ def generate_itinerary_public():
                 "itinerary": itinerary_data,
                 "is_public": True
             }
+        })
+        response.headers["X-Cache"] = cache_status
+        return response, 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@itinerary_bp.route("/metrics", methods=["GET"])
+def get_generation_metrics():
+    """Expose itinerary generation counters (result cache, coalescing, LLM parsing)"""
+    try:
+        return jsonify({
+            "result_cache": itinerary_cache.stats(),
+            "single_flight": generation_flight.stats(),
+            "llm": AIEngine.metrics(),
+            "openai_pool": OpenAIClient.stats()
         }), 200
 
     except Exception as e:
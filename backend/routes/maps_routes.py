@@ -1,29 +1,46 @@
 # backend/routes/maps_routes.py
 from flask import Blueprint, request, jsonify
 from services.maps_service import MapsService
+from services.map_clusters import MapClusters
+from services.poi_index import PoiIndex
+from services.poi_store import PoiStore
 from services.image_service import ImageService
+from services.image_pipeline import ImagePipeline
 from flask import Response
 import requests
-from services.cache_service import default_cache
+from urllib.parse import urlparse
+from werkzeug.http import http_date, parse_date
+from services.cache_backends import photo_cache
+from config import Config
+from utils.helper import stable_hash
 
 maps_bp = Blueprint("maps", __name__, url_prefix="/api/maps")
 
+# Photo proxy: responses are immutable per photo_reference + width
+PHOTO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Untranscoded fallbacks (pipeline timeout/failure) may be replaced by a variant later
+PHOTO_FALLBACK_CACHE_CONTROL = "public, max-age=300"
+PHOTO_CHUNK_BYTES = 64 * 1024
+PHOTO_MAX_WIDTH = 1600
+
 @maps_bp.route("/nearby-attractions", methods=["GET"])
 def get_nearby_attractions():
     """Get nearby attractions for a location using OpenStreetMap"""
     try:
         location = request.args.get("location")
         radius = request.args.get("radius", 5000, type=int)
+        limit = request.args.get("limit", type=int)
 
         if not location:
             return jsonify({"error": "Location required"}), 400
 
         # Use OpenStreetMap to get nearby attractions
         maps_service = MapsService()
-        attractions = maps_service.get_nearby_places(location, radius)
+        attractions = maps_service.get_nearby_places(location, radius, limit)
 
         return jsonify({
             "location": location,
+            "radius": radius,
             "source": "openstreetmap",
             "attractions": attractions
         }), 200
@@ -49,46 +66,144 @@ def place_details():
 
 @maps_bp.route("/photo", methods=["GET"])
 def photo_proxy():
-    """Proxy a Google Place Photo request by photo_reference to hide API key.
-
-    Query params: photo_reference (required), maxwidth (optional)
+    """Proxy a place photo by photo_reference (hides the API key) or an image URL.
+
+    Query params: photo_reference or url (one required), maxwidth (optional)
+
+    `url` must point at one of Config.PHOTO_PROXY_HOSTS (the Pexels / Picsum
+    URLs returned by ImageService). Images are scaled down to `maxwidth`
+    and re-encoded as AVIF/WebP when the Accept header lists them
+    (services/image_pipeline.py); every variant is cached separately and
+    responses carry `Vary: Accept`.
+
+    A source + width + format always maps to the same image, so responses
+    carry a variant-derived ETag and a year-long immutable Cache-Control:
+    browsers and CDNs revalidate with If-None-Match and get a 304 without
+    the upstream being touched. Without the pipeline, misses are streamed
+    to the client in chunks while the bytes are collected for the cache;
+    they pass on the upstream Last-Modified, which is the only date
+    If-Modified-Since is compared against.
     """
     try:
         photo_ref = request.args.get("photo_reference")
-        maxwidth = request.args.get("maxwidth", 800)
-        if not photo_ref:
-            return jsonify({"error": "photo_reference required"}), 400
-
-        maps_service = MapsService()
-        # Cache key based on photo reference and requested width
-        cache_key = f"photo::{photo_ref}::w{maxwidth}"
-
-        cached = default_cache.get(cache_key)
+        source_url = request.args.get("url")
+        maxwidth = request.args.get("maxwidth", 800, type=int)
+        if not photo_ref and not source_url:
+            return jsonify({"error": "photo_reference or url required"}), 400
+        if source_url and not _allowed_photo_url(source_url):
+            return jsonify({"error": "url host not allowed"}), 400
+        maxwidth = min(max(maxwidth, 16), PHOTO_MAX_WIDTH)
+
+        # Cache key of the upstream image (Google-style references are fetched at the requested width)
+        source_key = f"photo::url::{source_url}" if source_url else f"photo::{photo_ref}::w{maxwidth}"
+        pipeline = ImagePipeline.available()
+        fmt = ImagePipeline.negotiate(request.headers.get("Accept", ""))
+        cache_key = f"{source_key}::{fmt or 'source'}::w{maxwidth}" if pipeline else source_key
+        etag = stable_hash(cache_key)
+        headers = {"ETag": f'"{etag}"', "Cache-Control": PHOTO_CACHE_CONTROL}
+        if pipeline:
+            headers["Vary"] = "Accept"
+
+        # The content behind a key never changes, so a matching ETag is always current
+        if request.if_none_match.contains_weak(etag):
+            return Response(status=304, headers=headers)
+
+        cached = photo_cache.get(cache_key)
         if cached:
             content_type, data = cached
-            return Response(data, content_type=content_type)
+            return Response(data, content_type=content_type, headers=dict(headers, **{"Content-Length": str(len(data))}))
 
-        photo_url = maps_service.get_photo_url(photo_ref, maxwidth=int(maxwidth))
+        photo_url = source_url or MapsService().get_photo_url(photo_ref, maxwidth=maxwidth)
+        if pipeline:
+            return _photo_variant(photo_url, source_key, cache_key, maxwidth, fmt, headers)
 
         # Stream the image bytes back to the client
         r = requests.get(photo_url, stream=True, timeout=10)
         if r.status_code != 200:
+            r.close()
             # If proxy fetch fails, return the photo URL as a fallback so the client can retrieve it directly.
             return jsonify({"photo_url": photo_url}), 200
 
-        data = r.content
         content_type = r.headers.get("Content-Type", "image/jpeg")
-        # Cache image bytes (default TTL configured in cache_service)
-        try:
-            default_cache.set(cache_key, content_type, data)
-        except Exception:
-            # On any cache failure, continue silently and return the image
-            pass
-
-        return Response(data, content_type=content_type)
+        if r.headers.get("Content-Length") and not r.headers.get("Content-Encoding"):
+            headers["Content-Length"] = r.headers["Content-Length"]
+        last_modified = parse_date(r.headers.get("Last-Modified"))
+        if last_modified:
+            headers["Last-Modified"] = http_date(last_modified)
+            # If-Modified-Since only counts without If-None-Match, and only against the date we send
+            if not request.if_none_match and request.if_modified_since and last_modified <= request.if_modified_since:
+                r.close()
+                headers.pop("Content-Length", None)
+                return Response(status=304, headers=headers)
+
+        def stream():
+            chunks = []
+            size = 0
+            complete = False
+            try:
+                for chunk in r.iter_content(chunk_size=PHOTO_CHUNK_BYTES):
+                    if size <= Config.PHOTO_CACHE_MAX_BYTES:
+                        chunks.append(chunk)
+                    size += len(chunk)
+                    yield chunk
+                complete = True
+            finally:
+                r.close()
+            # Cache image bytes (default TTL configured in cache_service) once fully received
+            if complete and size <= Config.PHOTO_CACHE_MAX_BYTES:
+                try:
+                    photo_cache.set(cache_key, content_type, b"".join(chunks))
+                except Exception:
+                    # On any cache failure, continue silently
+                    pass
+
+        return Response(stream(), content_type=content_type, headers=headers, direct_passthrough=True)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+
+def _allowed_photo_url(url: str) -> bool:
+    parsed = urlparse(url)
+    return parsed.scheme == "https" and (parsed.hostname or "").lower() in Config.PHOTO_PROXY_HOSTS
+
+
+def _photo_variant(photo_url: str, source_key: str, cache_key: str, maxwidth: int, fmt, headers: dict):
+    """Resized / re-encoded photo response; the upstream image is cached too, for other variants"""
+    source = photo_cache.get(source_key)
+    if not source:
+        source = _download_photo(photo_url)
+        if source is None:
+            return jsonify({"photo_url": photo_url}), 200
+        if len(source[1]) <= Config.PHOTO_CACHE_MAX_BYTES:
+            photo_cache.set(source_key, *source)
+
+    variant = ImagePipeline.resize(source[1], maxwidth, fmt)
+    if variant is None:
+        # Served as fetched; not cached under the variant key so a later request can still transcode
+        content_type, data = source
+        headers = {"Cache-Control": PHOTO_FALLBACK_CACHE_CONTROL, "Vary": "Accept"}
+    else:
+        content_type, data = variant
+        if len(data) <= Config.PHOTO_CACHE_MAX_BYTES:
+            photo_cache.set(cache_key, content_type, data)
+    return Response(data, content_type=content_type, headers=dict(headers, **{"Content-Length": str(len(data))}))
+
+
+def _download_photo(photo_url: str):
+    """(content_type, bytes) of an upstream image, or None (error status, over IMAGE_SOURCE_MAX_BYTES)"""
+    with requests.get(photo_url, stream=True, timeout=10) as r:
+        if r.status_code != 200:
+            return None
+        chunks = []
+        size = 0
+        for chunk in r.iter_content(chunk_size=PHOTO_CHUNK_BYTES):
+            size += len(chunk)
+            if size > Config.IMAGE_SOURCE_MAX_BYTES:
+                print(f"[PhotoProxy] Source over {Config.IMAGE_SOURCE_MAX_BYTES} bytes: {photo_url}")
+                return None
+            chunks.append(chunk)
+        return r.headers.get("Content-Type", "image/jpeg"), b"".join(chunks)
+
 @maps_bp.route("/geocode", methods=["GET"])
 def geocode_location():
     """Geocode a location name to coordinates"""
@@ -133,3 +248,121 @@ def get_distance():
         return jsonify({"error": str(e)}), 500
 
 
+
+@maps_bp.route("/optimize-day", methods=["POST"])
+def optimize_day():
+    """Order a day's stops for the shortest route.
+
+    Expected JSON payload:
+    {
+        "stops": [{"name": "Louvre", "lat": 48.86, "lng": 2.33}, "Eiffel Tower", ...],
+        "start_index": 0,            (optional, default: best start)
+        "metric": "duration"         (optional, "duration" or "distance")
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        stops = data.get("stops")
+        metric = data.get("metric", "duration")
+        start_index = data.get("start_index")
+
+        if not isinstance(stops, list) or len(stops) < 2:
+            return jsonify({"error": "At least two stops required"}), 400
+        if len(stops) > MapsService.OSRM_MAX_TABLE_POINTS:
+            return jsonify({"error": f"At most {MapsService.OSRM_MAX_TABLE_POINTS} stops supported"}), 400
+        if metric not in ("duration", "distance"):
+            return jsonify({"error": "metric must be 'duration' or 'distance'"}), 400
+        if start_index is not None:
+            # JSON true/false are ints in Python
+            if isinstance(start_index, bool) or not isinstance(start_index, int):
+                return jsonify({"error": "start_index must be an integer"}), 400
+            if not 0 <= start_index < len(stops):
+                return jsonify({"error": "start_index out of range"}), 400
+
+        maps_service = MapsService()
+        try:
+            result = maps_service.optimize_day(stops, start_index=start_index, metric=metric)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        print(f"Route optimization error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@maps_bp.route("/distance-matrix", methods=["GET", "POST"])
+def get_distance_matrix():
+    """Distances and durations from many origins to many destinations.
+
+    POST JSON: {"origins": ["Paris", {"lat": 48.86, "lng": 2.33}, ...],
+                "destinations": [...]}   (destinations optional: origins x origins)
+    GET: ?origins=Paris|Lyon&destinations=Nice|48.85,2.35
+    """
+    try:
+        if request.method == "POST":
+            data = request.get_json() or {}
+            origins = data.get("origins")
+            destinations = data.get("destinations")
+        else:
+            origins = [item for item in request.args.get("origins", "").split("|") if item.strip()]
+            destinations = [item for item in request.args.get("destinations", "").split("|") if item.strip()] or None
+
+        if not isinstance(origins, list) or not origins:
+            return jsonify({"error": "Origins required"}), 400
+        if destinations is not None and (not isinstance(destinations, list) or not destinations):
+            return jsonify({"error": "Destinations must be a non-empty list"}), 400
+        count = len(origins) + len(destinations or [])
+        if count > MapsService.OSRM_MAX_TABLE_POINTS:
+            return jsonify({"error": f"At most {MapsService.OSRM_MAX_TABLE_POINTS} origins + destinations supported"}), 400
+
+        maps_service = MapsService()
+        return jsonify(maps_service.distance_matrix(origins, destinations)), 200
+
+    except Exception as e:
+        print(f"Distance matrix error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@maps_bp.route("/clusters", methods=["GET"])
+def get_clusters():
+    """Attraction marker clusters for a map viewport
+
+    Query params: bbox=west,south,east,north (degrees), zoom=0-20
+    """
+    try:
+        try:
+            west, south, east, north = (float(value) for value in request.args.get("bbox", "").split(","))
+        except ValueError:
+            return jsonify({"error": "bbox=west,south,east,north required"}), 400
+        zoom = request.args.get("zoom", type=int)
+        if zoom is None:
+            return jsonify({"error": "zoom required"}), 400
+
+        try:
+            result = MapClusters.clusters(west, south, east, north, zoom)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        print(f"Clustering error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@maps_bp.route("/metrics", methods=["GET"])
+def get_maps_metrics():
+    """Expose geocoding counters (gazetteer hit ratio, caches, Nominatim rate limiting), POI index/store sizes, photo cache and image pipeline stats"""
+    try:
+        store = PoiStore.get()
+        return jsonify({
+            "geocode": MapsService.geocode_stats(),
+            "poi_index": PoiIndex.get().stats(),
+            "poi_store": store.stats() if store else None,
+            "photo_cache": photo_cache.stats(),
+            "image_pipeline": ImagePipeline.stats()
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
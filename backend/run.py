@@ -19,6 +19,10 @@ try:
         'gunicorn',
         '--bind', '0.0.0.0:8000',
         '--workers', '1',
+        # Threaded workers keep heart-beating while a request is streaming
+        # (e.g. /api/itinerary/generate-stream), so long SSE responses aren't killed
+        '--worker-class', 'gthread',
+        '--threads', '4',
         '--timeout', '60',
         '--access-logfile', '-',
         '--error-logfile', '-',
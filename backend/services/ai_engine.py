@@ -1,20 +1,52 @@
 # backend/services/ai_engine.py
-from openai import OpenAI
 from config import Config
+from .destination_catalog import DestinationCatalog
 from .image_service import ImageService
+from .openai_client import OpenAIClient
+from .trip_planner import TripPlanner
+from .single_flight import generation_flight
+from utils.helper import fold_text
+from utils.json_stream import JsonArrayStream
+from utils.name_index import NameIndex
+from utils.schemas import ITINERARY_SCHEMA, validate_day
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 from bs4 import BeautifulSoup
 
 class AIEngine:
     """AI-powered itinerary generation using OpenAI"""
 
+    # Process-wide LLM counters (see metrics())
+    _metrics = {"completions": 0, "completion_errors": 0, "parse_failures": 0, "salvaged": 0, "invalid_days": 0}
+    _metrics_lock = threading.Lock()
+
+    SYSTEM_PROMPT = "You are a travel planning expert. You MUST ONLY use the real tourist attractions provided in the user's message. Never invent or hallucinate attraction names. Always use the exact names provided."
+
     def __init__(self):
-        # Initialize OpenAI client with API key only
+        # Process-wide pooled client (None without an API key), so connections stay warm
+        self.client = OpenAIClient.get()
+
+    @classmethod
+    def generate(cls, destination, budget, days, travel_style):
+        """
+        Generate an itinerary (AI when an OpenAI key is set, sample otherwise)
+        
+        Identical requests arriving while one is already being generated wait
+        for it and share its result instead of repeating the attraction
+        lookups, image searches and LLM call.
+        """
+        key = ("itinerary", fold_text(destination), float(budget), int(days), travel_style)
+        return generation_flight.do(key, cls._generate_uncoalesced, destination, budget, days, travel_style)
+
+    @classmethod
+    def _generate_uncoalesced(cls, destination, budget, days, travel_style):
+        ai_engine = cls()
+        # Check if OpenAI key is set, otherwise use sample
         if Config.OPENAI_API_KEY:
-            self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
-        else:
-            self.client = None
+            return ai_engine.generate_itinerary(destination, budget, days, travel_style)
+        return ai_engine.get_sample_itinerary(destination, budget, days, travel_style)
 
     def generate_itinerary(self, destination, budget, days, travel_style):
         """
@@ -33,18 +65,334 @@ class AIEngine:
         real_attractions = self.fetch_attractions_from_internet(destination)
         print(f"Fetched {len(real_attractions)} real attractions for {destination}")
         
+        # If no API key (or the local planner is selected), plan without the LLM
+        if not self.client or Config.ITINERARY_PLANNER == "local":
+            return self.get_sample_itinerary(destination, budget, days, travel_style, real_attractions)
+        
+        plan = self._pre_plan(real_attractions, days)
+        
+        # Long trips: generate day chunks concurrently and stitch them together
+        if days >= Config.ITINERARY_CHUNK_MIN_DAYS:
+            for event, value in self._iter_chunked(destination, budget, days, travel_style, real_attractions, plan):
+                if event == "itinerary":
+                    return value
+        
+        prompt = self._build_prompt(destination, budget, days, travel_style, real_attractions, plan)
+        streamed_days = []
+        content = ""
+        try:
+            for event, value in self._iter_completion(prompt):
+                if event == "day":
+                    streamed_days.append(value)
+                else:
+                    content = value
+        except Exception as e:
+            # Days validated before the failure are still salvaged below
+            print(f"Error generating itinerary: {str(e)}")
+            self._count("completion_errors")
+        
+        return self._assemble_itinerary(
+            content, streamed_days, real_attractions, destination, budget, days, travel_style
+        )
+
+    def stream_itinerary(self, destination, budget, days, travel_style):
+        """
+        Generate an itinerary incrementally for Server-Sent Events
+        
+        Yields (event, payload) tuples: "attractions" as soon as the real
+        attractions are known, one "day" per day object as soon as the model
+        has finished writing it, then "tips", "cost" and finally "done" with
+        the complete (validated) itinerary.
+        """
+        real_attractions = self.fetch_attractions_from_internet(destination)
+        yield "attractions", {"destination": destination, "tourist_spots": real_attractions}
+        
+        streamed_days = []
+        use_llm = self.client is not None and Config.ITINERARY_PLANNER != "local"
+        plan = self._pre_plan(real_attractions, days) if use_llm else None
+        if use_llm and days >= Config.ITINERARY_CHUNK_MIN_DAYS:
+            itinerary = None
+            for event, value in self._iter_chunked(destination, budget, days, travel_style, real_attractions, plan):
+                if event == "day":
+                    streamed_days.append(value)
+                    yield "day", value
+                else:
+                    itinerary = value
+        elif use_llm:
+            prompt = self._build_prompt(destination, budget, days, travel_style, real_attractions, plan)
+            content = ""
+            try:
+                for event, value in self._iter_completion(prompt):
+                    if event == "day":
+                        streamed_days.append(value)
+                        yield "day", value
+                    else:
+                        content = value
+            except Exception as e:
+                print(f"Error streaming itinerary: {str(e)}")
+                self._count("completion_errors")
+            itinerary = self._assemble_itinerary(
+                content, streamed_days, real_attractions, destination, budget, days, travel_style
+            )
+        else:
+            itinerary = self.get_sample_itinerary(destination, budget, days, travel_style, real_attractions)
+        
+        # Send whatever wasn't streamed (sample/fill-in days)
+        sent_days = {day["day"] for day in streamed_days}
+        for day in itinerary.get("days", []):
+            if day.get("day") not in sent_days:
+                yield "day", day
+        
+        yield "tips", {"tips": itinerary.get("tips", [])}
+        yield "cost", {"estimated_total_cost": itinerary.get("estimated_total_cost")}
+        yield "done", {"itinerary": itinerary}
+
+    @staticmethod
+    def _pre_plan(real_attractions, days):
+        """Local geographic day plan for the prompt, or None when disabled/no coordinates"""
+        if Config.ITINERARY_PLANNER != "preplan" or not TripPlanner.has_coordinates(real_attractions):
+            return None
+        return TripPlanner.plan_days(real_attractions, days)
+
+    def _iter_chunked(self, destination, budget, days, travel_style, real_attractions, plan=None):
+        """
+        Generate a long trip as concurrent day chunks
+        
+        Days are split into chunks of ITINERARY_CHUNK_DAYS and the real
+        attractions are dealt out round-robin across chunks, so every chunk
+        plans different spots. Chunks run in parallel (one completion each),
+        so wall-clock time follows the chunk size rather than the trip length.
+        With a local pre-plan, each chunk gets the attractions of its planned
+        days instead.
+        Yields ("day", day) as each chunk finishes and finally
+        ("itinerary", itinerary) with the stitched result; days from failed
+        or truncated chunks are filled from the sample plan.
+        """
+        chunk_size = max(Config.ITINERARY_CHUNK_DAYS, 1)
+        chunks = [(start, min(start + chunk_size - 1, days)) for start in range(1, days + 1, chunk_size)]
+        if plan:
+            allocations = [
+                [stop for day in plan if first_day <= day["day"] <= last_day for stop in day["stops"]]
+                for first_day, last_day in chunks
+            ]
+        else:
+            allocations = [real_attractions[i::len(chunks)] for i in range(len(chunks))]
+        self._count("chunked_generations")
+        self._count("chunks", len(chunks))
+        
+        executor = ThreadPoolExecutor(
+            max_workers=min(Config.ITINERARY_CHUNK_WORKERS, len(chunks)),
+            thread_name_prefix="itinerary-chunk"
+        )
+        futures = {}
+        for index, (first_day, last_day) in enumerate(chunks):
+            prompt = self._build_chunk_prompt(
+                destination, budget, days, travel_style, real_attractions,
+                allocations[index], first_day, last_day, overview=(index == 0)
+            )
+            futures[executor.submit(self._run_chunk, prompt, first_day, last_day)] = index
+        
+        header = None
+        chunk_days = []
+        try:
+            for future in as_completed(futures):
+                try:
+                    valid_days, content = future.result()
+                except Exception as e:
+                    print(f"Error generating itinerary chunk {futures[future] + 1}/{len(chunks)}: {str(e)}")
+                    self._count("completion_errors")
+                    continue
+                if futures[future] == 0 and content:
+                    try:
+                        header = self._parse_itinerary_json(content)
+                    except ValueError as e:
+                        print(f"JSON parsing error in itinerary overview: {e}")
+                for day in valid_days:
+                    chunk_days.append(day)
+                    yield "day", day
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if not chunk_days:
+            yield "itinerary", self.get_sample_itinerary(destination, budget, days, travel_style, real_attractions)
+            return
+        
+        itinerary = {key: value for key, value in (header or {}).items() if key != "days"}
+        itinerary.setdefault("title", f"{days} Days in {destination}")
+        itinerary.setdefault("estimated_total_cost", f"${budget}")
+        itinerary["days"] = sorted(chunk_days, key=lambda day: day["day"])
+        itinerary = self._finalize_itinerary(itinerary, real_attractions)
+        
+        present = {day["day"] for day in itinerary["days"]}
+        missing = [number for number in range(1, days + 1) if number not in present]
+        if missing:
+            itinerary["days"].extend(self._sample_day(number, destination, budget, days) for number in missing)
+            itinerary["days"].sort(key=lambda day: day["day"])
+        yield "itinerary", itinerary
+
+    def _run_chunk(self, prompt, first_day, last_day):
+        """Run one chunk completion; returns (days numbered first_day..last_day, raw content)"""
+        content = ""
+        streamed_days = []
+        for event, value in self._iter_completion(prompt, max_tokens=Config.ITINERARY_CHUNK_MAX_TOKENS):
+            if event == "day":
+                streamed_days.append(value)
+            else:
+                content = value
+        
+        if content:
+            try:
+                parsed = self._parse_itinerary_json(content)
+            except ValueError:
+                parsed = None
+            if parsed is not None:
+                streamed_days = [day for day in map(validate_day, parsed.get("days") or []) if day]
+            else:
+                self._count("parse_failures")
+        
+        # Models sometimes restart numbering at 1 in later chunks: renumber by position
+        wanted = range(first_day, last_day + 1)
+        if any(day["day"] not in wanted for day in streamed_days):
+            for offset, day in enumerate(streamed_days):
+                day["day"] = first_day + offset
+        return [day for day in streamed_days if day["day"] in wanted], content
+
+    def _iter_completion(self, prompt, max_tokens=3000):
+        """
+        Stream the itinerary completion from OpenAI
+        
+        Yields ("day", day) for every day object that passes schema validation,
+        as soon as its closing brace arrives, and finally ("content", text)
+        with the full response. With OPENAI_STRUCTURED_OUTPUT set to "json" or
+        "function" the model is constrained to JSON / the itinerary schema.
+        """
+        options = {}
+        mode = Config.OPENAI_STRUCTURED_OUTPUT
+        if mode == "json":
+            options["response_format"] = {"type": "json_object"}
+        elif mode == "function":
+            options["tools"] = [{
+                "type": "function",
+                "function": {
+                    "name": "create_itinerary",
+                    "description": "Return the complete travel itinerary",
+                    "parameters": ITINERARY_SCHEMA
+                }
+            }]
+            options["tool_choice"] = {"type": "function", "function": {"name": "create_itinerary"}}
+        
+        self._count("completions")
+        stream = self.client.chat.completions.create(
+            model=Config.OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=max_tokens,
+            stream=True,
+            **options
+        )
+        
+        day_parser = JsonArrayStream("days")
+        content_parts = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            text = delta.content or ""
+            # Function-calling mode streams the JSON as tool call arguments
+            for tool_call in delta.tool_calls or []:
+                if tool_call.function and tool_call.function.arguments:
+                    text += tool_call.function.arguments
+            if not text:
+                continue
+            
+            content_parts.append(text)
+            for day in day_parser.feed(text):
+                valid_day = validate_day(day)
+                if valid_day is None:
+                    print(f"Discarding day that failed schema validation: {str(day)[:200]}")
+                    self._count("invalid_days")
+                    continue
+                yield "day", valid_day
+        
+        yield "content", "".join(content_parts)
+
+    def _assemble_itinerary(self, content, valid_days, real_attractions, destination, budget, days, travel_style):
+        """
+        Build the final itinerary from a (possibly broken) model response
+        
+        A response that parses is validated day by day. One that doesn't
+        (truncated at max_tokens, malformed JSON, dropped connection) keeps the
+        days that validated while streaming. Either way, missing days are
+        filled from the sample plan instead of discarding the paid completion.
+        """
+        itinerary = None
+        if content:
+            try:
+                itinerary = self._parse_itinerary_json(content)
+            except ValueError as e:
+                print(f"JSON parsing error: {e}")
+            if itinerary is None:
+                self._count("parse_failures")
+        
+        if itinerary is not None:
+            itinerary["days"] = [day for day in map(validate_day, itinerary.get("days") or []) if day]
+            itinerary = self._finalize_itinerary(itinerary, real_attractions)
+        elif valid_days:
+            print(f"Salvaged {len(valid_days)} valid day(s) from incomplete response")
+            self._count("salvaged")
+            itinerary = self.get_sample_itinerary(destination, budget, days, travel_style, real_attractions)
+            itinerary["days"] = list(valid_days)
+        else:
+            # Fallback to sample itinerary if nothing usable came back
+            return self.get_sample_itinerary(destination, budget, days, travel_style, real_attractions)
+        
+        present = {day["day"] for day in itinerary["days"]}
+        missing = [number for number in range(1, days + 1) if number not in present]
+        if missing:
+            itinerary["days"].extend(self._sample_day(number, destination, budget, days) for number in missing)
+            itinerary["days"].sort(key=lambda day: day["day"])
+        
+        return itinerary
+
+    @classmethod
+    def _count(cls, metric, amount=1):
+        with cls._metrics_lock:
+            cls._metrics[metric] = cls._metrics.get(metric, 0) + amount
+
+    @classmethod
+    def metrics(cls):
+        """LLM completion/parse counters for this process"""
+        with cls._metrics_lock:
+            return dict(cls._metrics)
+
+    @staticmethod
+    def _build_prompt(destination, budget, days, travel_style, real_attractions, plan=None):
+        """Build the user prompt constraining the model to the real attractions"""
         # Format attractions for AI prompt
         attractions_list = "\n".join([
             f"- {attr.get('name', 'Unknown')}: {attr.get('description', 'Tourist attraction')}"
             for attr in real_attractions[:8]
         ])
         
-        prompt = f"""Generate a {days}-day travel itinerary for {destination} with a budget of ${budget} USD. 
+        # Geographic pre-plan: nearby attractions grouped per day, in walking order
+        if plan:
+            plan_text = f"""
+        Suggested day plan (attractions grouped by location, in visiting order with distances) - follow it:
+{TripPlanner.describe(plan)}
+"""
+        else:
+            plan_text = ""
+        
+        return f"""Generate a {days}-day travel itinerary for {destination} with a budget of ${budget} USD. 
         Travel style: {travel_style}.
         
         IMPORTANT: You MUST ONLY use the following REAL tourist attractions from {destination}:
 {attractions_list}
 
+{plan_text}
         Create an itinerary that includes visits to these REAL attractions. Do NOT invent or hallucinate attraction names.
         Use ONLY the attraction names listed above.
         
@@ -86,149 +434,194 @@ class AIEngine:
         
         CRITICAL: tourist_spots array MUST contain REAL attractions from the list above. Do NOT invent attractions.
         Make sure the itinerary fits within the given budget. Include 5-7 real tourist spots from the provided list."""
-        
-        try:
-            # If no API key, return sample itinerary
-            if not self.client:
-                return self.get_sample_itinerary(destination, budget, days, travel_style)
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a travel planning expert. You MUST ONLY use the real tourist attractions provided in the user's message. Never invent or hallucinate attraction names. Always use the exact names provided."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=3000
+
+    @staticmethod
+    def _build_chunk_prompt(destination, budget, days, travel_style, real_attractions,
+                            allocated, first_day, last_day, overview=False):
+        """Build the prompt for days first_day..last_day of a chunked trip"""
+        chunk_days = last_day - first_day + 1
+        chunk_budget = round(budget * chunk_days / days)
+        if allocated:
+            attractions_list = "\n".join(
+                f"- {attr.get('name', 'Unknown')}: {attr.get('description', 'Tourist attraction')}"
+                for attr in allocated
             )
+            spots_text = f"""Visit ONLY these REAL tourist attractions from {destination} in these days:
+{attractions_list}"""
+        else:
+            spots_text = f"""All major attractions of {destination} are covered on other days. Plan neighbourhood walks,
+        markets, food experiences and day trips instead. Do NOT revisit the named attractions."""
+        other_names = ", ".join(
+            attr.get("name", "") for attr in real_attractions if attr not in allocated
+        )
+        if other_names:
+            spots_text += f"\n        These are visited on other days, do NOT include them: {other_names}"
+        
+        if overview:
+            all_names = ", ".join(attr.get("name", "") for attr in real_attractions[:8])
+            extra_fields = f""",
+            "title": "itinerary title for the whole {days}-day trip",
+            "tourist_spots": [
+                {{
+                    "name": "EXACT name from: {all_names}",
+                    "description": "Brief description of the attraction",
+                    "ticket_price": "Price in USD",
+                    "opening_hours": "Opening hours"
+                }}
+            ],
+            "tips": ["travel tip 1", "travel tip 2"],
+            "estimated_total_cost": "total cost estimate for the whole trip (budget: ${budget} USD)\""""
+        else:
+            extra_fields = ""
+        
+        return f"""You are planning days {first_day} to {last_day} of a {days}-day travel itinerary for {destination}.
+        Budget for these {chunk_days} days: ${chunk_budget} USD. Travel style: {travel_style}.
+        
+        {spots_text}
+        
+        Provide the response in JSON format with the following structure:
+        {{
+            "days": [
+                {{
+                    "day": {first_day},
+                    "title": "day title",
+                    "activities": [
+                        {{
+                            "time": "09:00 AM",
+                            "activity": "activity description (include actual attraction names when visiting places)",
+                            "cost": "estimated cost",
+                            "duration": "duration in hours"
+                        }}
+                    ],
+                    "meals": {{
+                        "breakfast": "recommendation",
+                        "lunch": "recommendation",
+                        "dinner": "recommendation"
+                    }},
+                    "total_cost": "estimated daily cost"
+                }}
+            ]{extra_fields}
+        }}
+        
+        Number the days {first_day} to {last_day}. Make sure these days fit within ${chunk_budget} USD."""
+
+    @staticmethod
+    def _parse_itinerary_json(content):
+        """
+        Extract the itinerary JSON object from a model response
+        
+        Returns None when the response contains no JSON object; raises
+        json.JSONDecodeError when it does but the JSON is malformed.
+        """
+        # Find JSON in response
+        start_idx = content.find('{')
+        end_idx = content.rfind('}') + 1
+        if start_idx == -1 or end_idx <= start_idx:
+            return None
+        
+        itinerary = json.loads(content[start_idx:end_idx])
+        
+        # Validate itinerary structure
+        if not isinstance(itinerary, dict):
+            raise ValueError("Invalid itinerary format")
+        return itinerary
+
+    @staticmethod
+    def _finalize_itinerary(itinerary, real_attractions):
+        """Fill in missing fields and pin tourist spots to the real attractions"""
+        # Ensure required fields exist
+        if "days" not in itinerary:
+            itinerary["days"] = []
+        if "tourist_spots" not in itinerary:
+            itinerary["tourist_spots"] = real_attractions[:6]  # Use real attractions as fallback
+        if "tips" not in itinerary:
+            itinerary["tips"] = []
+        
+        # Validate tourist spots are from real attractions
+        if "tourist_spots" in itinerary and itinerary["tourist_spots"]:
+            attraction_index = NameIndex(real_attractions)
+            used_names = set()
+            validated_spots = []
             
-            # Extract JSON from response
-            content = response.choices[0].message.content
-            # Find JSON in response
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = content[start_idx:end_idx]
-                try:
-                    itinerary = json.loads(json_str)
-                    
-                    # Validate itinerary structure
-                    if not isinstance(itinerary, dict):
-                        raise ValueError("Invalid itinerary format")
-                    
-                    # Ensure required fields exist
-                    if "days" not in itinerary:
-                        itinerary["days"] = []
-                    if "tourist_spots" not in itinerary:
-                        itinerary["tourist_spots"] = real_attractions[:6]  # Use real attractions as fallback
-                    if "tips" not in itinerary:
-                        itinerary["tips"] = []
-                    
-                    # Validate tourist spots are from real attractions
-                    if "tourist_spots" in itinerary and itinerary["tourist_spots"]:
-                        real_spot_names = {attr.get("name", "").lower() for attr in real_attractions}
-                        validated_spots = []
-                        
-                        for spot in itinerary["tourist_spots"]:
-                            if not isinstance(spot, dict):
-                                continue
-                            
-                            spot_name = spot.get("name", "").strip()
-                            
-                            # Try exact match first
-                            matched_attraction = None
-                            for real_attr in real_attractions:
-                                if real_attr.get("name", "").lower() == spot_name.lower():
-                                    matched_attraction = real_attr
-                                    break
-                            
-                            # If matched, use real data
-                            if matched_attraction:
-                                spot["name"] = matched_attraction.get("name", spot_name)
-                                spot["description"] = matched_attraction.get("description", spot.get("description", ""))
-                                spot["image_url"] = matched_attraction.get("image_url", spot.get("image_url", "placeholder"))
-                                if not spot.get("ticket_price"):
-                                    spot["ticket_price"] = matched_attraction.get("ticket_price", "$15-25")
-                                if not spot.get("opening_hours"):
-                                    spot["opening_hours"] = matched_attraction.get("opening_hours", "9:00 AM - 6:00 PM")
-                                validated_spots.append(spot)
-                            else:
-                                # If spot name doesn't match real attractions, try to find similar one
-                                if len(real_attractions) > 0:
-                                    # Use a real attraction instead
-                                    similar_attr = real_attractions[len(validated_spots) % len(real_attractions)]
-                                    spot["name"] = similar_attr.get("name", spot_name)
-                                    spot["description"] = similar_attr.get("description", "")
-                                    spot["image_url"] = similar_attr.get("image_url", "placeholder")
-                                    spot["ticket_price"] = similar_attr.get("ticket_price", "$15-25")
-                                    spot["opening_hours"] = similar_attr.get("opening_hours", "9:00 AM - 6:00 PM")
-                                    validated_spots.append(spot)
-                        
-                        # Ensure we have enough spots
-                        if len(validated_spots) < len(real_attractions):
-                            for i in range(len(validated_spots), min(6, len(real_attractions))):
-                                validated_spots.append(real_attractions[i])
-                        
-                        itinerary["tourist_spots"] = validated_spots[:8]
-                    else:
-                        itinerary["tourist_spots"] = real_attractions[:6]
-                    
-                    return itinerary
-                except json.JSONDecodeError as e:
-                    print(f"JSON parsing error: {e}")
-                    return self.get_sample_itinerary(destination, budget, days, travel_style)
-            else:
-                # Fallback to sample itinerary if parsing fails
-                return self.get_sample_itinerary(destination, budget, days, travel_style)
+            for spot in itinerary["tourist_spots"]:
+                if not isinstance(spot, dict):
+                    continue
                 
-        except Exception as e:
-            print(f"Error generating itinerary: {str(e)}")
-            # Fallback to sample itinerary on error
-            return self.get_sample_itinerary(destination, budget, days, travel_style)
+                spot_name = spot.get("name", "").strip()
+                
+                # Exact (accent/case-insensitive) or fuzzy match against the real list
+                matched_attraction = attraction_index.match(spot_name)
+                if matched_attraction and matched_attraction.get("name") in used_names:
+                    continue  # Same place listed twice under different spellings
+                
+                # If matched, use real data
+                if matched_attraction:
+                    spot["name"] = matched_attraction.get("name", spot_name)
+                    spot["description"] = matched_attraction.get("description", spot.get("description", ""))
+                    spot["image_url"] = matched_attraction.get("image_url", spot.get("image_url", "placeholder"))
+                    if not spot.get("ticket_price"):
+                        spot["ticket_price"] = matched_attraction.get("ticket_price", "$15-25")
+                    if not spot.get("opening_hours"):
+                        spot["opening_hours"] = matched_attraction.get("opening_hours", "9:00 AM - 6:00 PM")
+                    used_names.add(spot["name"])
+                    validated_spots.append(spot)
+                else:
+                    # Unknown (hallucinated) spot: replace it with a real attraction not listed yet
+                    similar_attr = next(
+                        (attr for attr in real_attractions if attr.get("name") not in used_names),
+                        None
+                    )
+                    if similar_attr:
+                        spot["name"] = similar_attr.get("name", spot_name)
+                        spot["description"] = similar_attr.get("description", "")
+                        spot["image_url"] = similar_attr.get("image_url", "placeholder")
+                        spot["ticket_price"] = similar_attr.get("ticket_price", "$15-25")
+                        spot["opening_hours"] = similar_attr.get("opening_hours", "9:00 AM - 6:00 PM")
+                        used_names.add(spot["name"])
+                        validated_spots.append(spot)
+            
+            # Ensure we have enough spots
+            if len(validated_spots) < len(real_attractions):
+                for attr in real_attractions:
+                    if len(validated_spots) >= 6:
+                        break
+                    if attr.get("name") not in used_names:
+                        used_names.add(attr.get("name"))
+                        validated_spots.append(attr)
+            
+            itinerary["tourist_spots"] = validated_spots[:8]
+        else:
+            itinerary["tourist_spots"] = real_attractions[:6]
+        
+        return itinerary
 
     @staticmethod
     def fetch_attractions_from_internet(destination):
         """
         Fetch real tourist attractions for a destination
-        Uses hardcoded database of famous landmarks as primary source
+        Uses the destination catalog of famous landmarks as primary source
         """
         real_attractions = []
         
-        # HARDCODED DATABASE OF FAMOUS LANDMARKS - PRIMARY SOURCE
-        popular_destinations = {
-            "paris": ["Eiffel Tower", "Louvre Museum", "Notre-Dame", "Arc de Triomphe", "Sacré-Cœur", "Champs-Élysées", "Versailles"],
-            "london": ["Big Ben", "Tower of London", "Buckingham Palace", "British Museum", "Tower Bridge", "Westminster Abbey", "London Eye"],
-            "tokyo": ["Senso-ji Temple", "Tokyo Tower", "Shibuya Crossing", "Meiji Shrine", "Tsukiji Market", "Tokyo Skytree", "Shinjuku Gyoen"],
-            "new york": ["Statue of Liberty", "Empire State Building", "Central Park", "Times Square", "Brooklyn Bridge", "One World Trade Center", "Museum of Natural History"],
-            "hyderabad": ["Charminar", "Golconda Fort", "Hussain Sagar Lake", "Mecca Masjid", "Salar Jung Museum", "Birla Mandir", "Nizam's Museum"],
-            "delhi": ["Taj Mahal", "Red Fort", "India Gate", "Jama Masjid", "Qutub Minar", "Rashtrapati Bhavan", "Lal Qila"],
-            "barcelona": ["Sagrada Familia", "Park Güell", "Gothic Quarter", "Las Ramblas", "Casa Batlló", "Montjuïc", "Arc de Triomf"],
-            "rome": ["Colosseum", "Roman Forum", "Pantheon", "Vatican Museums", "Trevi Fountain", "Sistine Chapel", "Spanish Steps"],
-            "dubai": ["Burj Khalifa", "Dubai Mall", "Palm Jumeirah", "Gold Souk", "Sheikh Mohammed Centre", "Dubai Marina", "Jumeirah Beach"],
-            "mumbai": ["Gateway of India", "Marine Drive", "Taj Mahal Palace", "Elephanta Caves", "Haji Ali", "CST Station", "Siddhivinayak Temple"],
-        }
-        
-        # Try to match destination with hardcoded list
-        dest_lower = destination.lower().strip()
-        matched_attractions = None
-        
-        for known_dest, attractions in popular_destinations.items():
-            if known_dest in dest_lower or dest_lower in known_dest or dest_lower.startswith(known_dest[:3]):
-                matched_attractions = attractions
-                print(f"Using hardcoded attractions for {destination}")
-                break
+        # Known destinations come from the shared catalog (alias/prefix index)
+        catalog = DestinationCatalog.get()
+        city_id = catalog.resolve(destination)
+        matched_attractions = catalog.attractions(city_id) if city_id is not None else None
+        if matched_attractions:
+            print(f"Using catalog attractions for {destination}")
         
         # If we found a match, use it
         if matched_attractions:
-            for attraction_name in matched_attractions[:8]:
+            for attraction in matched_attractions[:8]:
                 real_attractions.append({
-                    "name": attraction_name,
+                    "name": attraction["name"],
                     "description": f"Famous tourist attraction in {destination}",
                     "ticket_price": "$15-25",
                     "opening_hours": "9:00 AM - 6:00 PM",
-                    "image_url": ImageService.get_landmark_image(attraction_name, destination)
+                    "location": {"lat": attraction["lat"], "lng": attraction["lng"]}
                 })
-            print(f"Fetched {len(real_attractions)} hardcoded attractions for {destination}")
+            AIEngine._attach_images(real_attractions, destination)
+            print(f"Fetched {len(real_attractions)} catalog attractions for {destination}")
             return real_attractions
         
         # FALLBACK: Try OpenStreetMap API for unknown destinations
@@ -239,14 +632,15 @@ class AIEngine:
             
             if nearby_places and len(nearby_places) > 0:
                 # Filter and deduplicate results
+                seen_names = NameIndex()
                 for place in nearby_places:
                     place_name = place.get("name", "").strip()
                     
-                    # Skip duplicates and generic names
-                    if place_name.lower() in [attr["name"].lower() for attr in real_attractions]:
-                        continue
+                    # Skip generic names and duplicates (case/accent-insensitive)
                     if not place_name or len(place_name) < 3:
                         continue
+                    if not seen_names.add(place_name):
+                        continue
                     
                     real_attractions.append({
                         "name": place_name,
@@ -254,13 +648,14 @@ class AIEngine:
                         "ticket_price": "$15-25",
                         "opening_hours": "9:00 AM - 6:00 PM",
                         "rating": str(place.get("rating", "4.5")),
-                        "image_url": ImageService.get_landmark_image(place_name, destination)
+                        "location": place.get("location")
                     })
                     
                     if len(real_attractions) >= 8:
                         break
                 
                 if len(real_attractions) >= 5:
+                    AIEngine._attach_images(real_attractions, destination)
                     print(f"Fetched {len(real_attractions)} attractions from OpenStreetMap for {destination}")
                     return real_attractions
         
@@ -269,76 +664,51 @@ class AIEngine:
         
         # If still no attractions found, return generic fallback
         print(f"No attractions found for {destination}, returning generic fallback")
+        # Any OpenStreetMap results that fell short of the minimum still need images
+        AIEngine._attach_images(real_attractions, destination)
+        landmark_image = ImageService.get_landmark_image("landmark", destination)
         for i in range(5):
             real_attractions.append({
                 "name": f"Popular Attraction {i+1}",
                 "description": f"Tourist spot in {destination}",
                 "ticket_price": "$15-25",
                 "opening_hours": "9:00 AM - 6:00 PM",
-                "image_url": ImageService.get_landmark_image(f"landmark", destination)
+                "image_url": landmark_image
             })
         
         return real_attractions
 
     @staticmethod
-    def get_sample_itinerary(destination, budget, days, travel_style):
+    def _attach_images(attractions, destination):
+        """Resolve landmark images for all attractions concurrently (in place)"""
+        image_urls = ImageService.get_landmark_images(
+            [attr["name"] for attr in attractions],
+            destination
+        )
+        for attr, image_url in zip(attractions, image_urls):
+            attr["image_url"] = image_url
+        return attractions
+
+    @staticmethod
+    def get_sample_itinerary(destination, budget, days, travel_style, real_attractions=None):
         """
-        Return a sample itinerary for demo purposes (when API key is not set)
-        Fetches real attractions from the internet
+        Return an itinerary without the LLM (no API key, local planner mode or fallback)
+        Fetches real attractions from the internet unless they are passed in
         """
         # Fetch real attractions from internet sources
-        real_attractions = AIEngine.fetch_attractions_from_internet(destination)
+        if real_attractions is None:
+            real_attractions = AIEngine.fetch_attractions_from_internet(destination)
+        
+        # With coordinates, plan real days locally (clustered + route-ordered)
+        if TripPlanner.has_coordinates(real_attractions):
+            return TripPlanner.build_itinerary(destination, budget, days, travel_style, real_attractions)
         
         return {
             "title": f"{days} Days in {destination}",
             "destination": destination,
             "budget": budget,
             "currency": "USD",
-            "days": [
-                {
-                    "day": i + 1,
-                    "title": f"Day {i + 1}: Exploring {destination}",
-                    "activities": [
-                        {
-                            "time": "08:00 AM",
-                            "activity": f"Breakfast at local cafe",
-                            "cost": f"${budget // days // 4}",
-                            "duration": "1 hour"
-                        },
-                        {
-                            "time": "10:00 AM",
-                            "activity": f"Visit major attraction in {destination}",
-                            "cost": f"${budget // days // 3}",
-                            "duration": "3 hours"
-                        },
-                        {
-                            "time": "01:00 PM",
-                            "activity": "Lunch at restaurant",
-                            "cost": f"${budget // days // 4}",
-                            "duration": "1.5 hours"
-                        },
-                        {
-                            "time": "03:00 PM",
-                            "activity": f"Local exploration & shopping",
-                            "cost": f"${budget // days // 5}",
-                            "duration": "2 hours"
-                        },
-                        {
-                            "time": "07:00 PM",
-                            "activity": "Dinner & evening entertainment",
-                            "cost": f"${budget // days // 3}",
-                            "duration": "2 hours"
-                        }
-                    ],
-                    "meals": {
-                        "breakfast": "Local cafe specialties",
-                        "lunch": "Traditional restaurant",
-                        "dinner": "Fine dining experience"
-                    },
-                    "total_cost": f"${budget // days}"
-                }
-                for i in range(days)
-            ],
+            "days": [AIEngine._sample_day(i + 1, destination, budget, days) for i in range(days)],
             "tips": [
                 f"Best time to visit {destination} is during shoulder seasons",
                 "Use public transportation to save on costs",
@@ -350,4 +720,48 @@ class AIEngine:
             "estimated_total_cost": f"${budget}"
         }
 
-
+    @staticmethod
+    def _sample_day(day_number, destination, budget, days):
+        """One generic day of the sample itinerary"""
+        return {
+            "day": day_number,
+            "title": f"Day {day_number}: Exploring {destination}",
+            "activities": [
+                {
+                    "time": "08:00 AM",
+                    "activity": f"Breakfast at local cafe",
+                    "cost": f"${budget // days // 4}",
+                    "duration": "1 hour"
+                },
+                {
+                    "time": "10:00 AM",
+                    "activity": f"Visit major attraction in {destination}",
+                    "cost": f"${budget // days // 3}",
+                    "duration": "3 hours"
+                },
+                {
+                    "time": "01:00 PM",
+                    "activity": "Lunch at restaurant",
+                    "cost": f"${budget // days // 4}",
+                    "duration": "1.5 hours"
+                },
+                {
+                    "time": "03:00 PM",
+                    "activity": f"Local exploration & shopping",
+                    "cost": f"${budget // days // 5}",
+                    "duration": "2 hours"
+                },
+                {
+                    "time": "07:00 PM",
+                    "activity": "Dinner & evening entertainment",
+                    "cost": f"${budget // days // 3}",
+                    "duration": "2 hours"
+                }
+            ],
+            "meals": {
+                "breakfast": "Local cafe specialties",
+                "lunch": "Traditional restaurant",
+                "dinner": "Fine dining experience"
+            },
+            "total_cost": f"${budget // days}"
+        }
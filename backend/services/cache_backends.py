@@ -0,0 +1,274 @@
+# backend/services/cache_backends.py
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from .cache_service import CacheService
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class CacheBackend(ABC):
+    """Binary cache interface: (content_type, bytes) values with a TTL.
+
+    Same get/set/clear/stats API as CacheService. "memory" keeps a private
+    cache per process; "sqlite" and "redis" are shared by every worker on
+    the host / in the cluster, so a value fetched once is a hit everywhere.
+    """
+
+    # Backend name reported in stats(); set by each implementation
+    backend = None
+
+    def __init__(self, name: str, default_ttl: int):
+        self.name = name
+        self._ttl = default_ttl
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "errors": 0}
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """(content_type, bytes) for a key, or None on a miss"""
+
+    @abstractmethod
+    def set(self, key: str, content_type: str, data: bytes, ttl: Optional[int] = None):
+        """Store a value for `ttl` seconds (default TTL when None)"""
+
+    @abstractmethod
+    def clear(self):
+        """Drop every entry of this cache"""
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["backend"] = self.backend
+        return stats
+
+    def _count(self, metric: str):
+        with self._stats_lock:
+            self._stats[metric] += 1
+
+    def _lookup(self, result: Optional[Tuple[str, bytes]]) -> Optional[Tuple[str, bytes]]:
+        self._count("hits" if result else "misses")
+        return result
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process bounded cache (CacheService)"""
+
+    backend = "memory"
+
+    def __init__(self, name: str, default_ttl: int):
+        super().__init__(name, default_ttl)
+        disk_dir = os.path.join(Config.CACHE_DISK_DIR, name) if Config.CACHE_DISK_DIR else None
+        self._cache = CacheService(default_ttl=default_ttl, disk_dir=disk_dir, name=name)
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        return self._cache.get(key)
+
+    def set(self, key: str, content_type: str, data: bytes, ttl: Optional[int] = None):
+        self._cache.set(key, content_type, data, ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict:
+        return dict(self._cache.stats(), backend=self.backend)
+
+
+class RedisBackend(CacheBackend):
+    """Values in Redis (or any Redis-protocol server) under "<prefix>:<name>:<key>".
+
+    Stored as content type, NUL, bytes with a server-side expiry; memory
+    limits and eviction are left to the server (maxmemory-policy allkeys-lfu).
+    Connection errors count as misses, so a Redis outage degrades to
+    uncached behaviour instead of failing requests.
+    """
+
+    backend = "redis"
+
+    def __init__(self, name: str, default_ttl: int, client=None, url: str = None):
+        super().__init__(name, default_ttl)
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis package not installed (pip install redis)")
+            client = redis.Redis.from_url(url or Config.REDIS_URL, socket_timeout=Config.REDIS_TIMEOUT,
+                                          socket_connect_timeout=Config.REDIS_TIMEOUT)
+        self._client = client
+        self._prefix = f"{Config.CACHE_KEY_PREFIX}:{name}:"
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        try:
+            value = self._client.get(self._prefix + key)
+        except Exception as e:
+            self._count("errors")
+            print(f"[Cache:{self.name}] Redis get failed: {e}")
+            value = None
+        if not value:
+            return self._lookup(None)
+        content_type, _, data = bytes(value).partition(b"\0")
+        return self._lookup((content_type.decode("utf-8"), data))
+
+    def set(self, key: str, content_type: str, data: bytes, ttl: Optional[int] = None):
+        ttl = ttl if ttl is not None else self._ttl
+        try:
+            self._client.set(self._prefix + key, content_type.encode("utf-8") + b"\0" + data,
+                             ex=max(int(ttl), 1))
+        except Exception as e:
+            self._count("errors")
+            print(f"[Cache:{self.name}] Redis set failed: {e}")
+
+    def clear(self):
+        try:
+            keys = list(self._client.scan_iter(match=self._prefix + "*", count=500))
+            for start in range(0, len(keys), 500):
+                self._client.delete(*keys[start:start + 500])
+        except Exception as e:
+            self._count("errors")
+            print(f"[Cache:{self.name}] Redis clear failed: {e}")
+
+
+class SqliteBackend(CacheBackend):
+    """Values in a SQLite file shared by the workers on one host.
+
+    WAL mode lets readers run concurrently with a writer; by default the
+    file lives in /dev/shm (shared memory) when available. Total size is
+    kept under `max_bytes` by pruning expired, then least recently read,
+    entries every PRUNE_EVERY writes.
+    """
+
+    backend = "sqlite"
+    PRUNE_EVERY = 100
+    # Reads refresh accessed_at (an extra write) at most this often per entry
+    TOUCH_INTERVAL = 60
+
+    def __init__(self, name: str, default_ttl: int, path: str = None, max_bytes: int = None):
+        super().__init__(name, default_ttl)
+        directory = Config.CACHE_SQLITE_DIR or ("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+        self.path = path or os.path.join(directory, f"travelbuddy-{name}.sqlite3")
+        self.max_bytes = Config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                content_type TEXT NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)")
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT content_type, data, expires_at, accessed_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[2] < now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row and now - row[3] > self.TOUCH_INTERVAL:
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            self._count("errors")
+            print(f"[Cache:{self.name}] SQLite get failed: {e}")
+            row = None
+        return self._lookup((row[0], bytes(row[1])) if row else None)
+
+    def set(self, key: str, content_type: str, data: bytes, ttl: Optional[int] = None):
+        now = time.time()
+        ttl = ttl if ttl is not None else self._ttl
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, content_type, data, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, content_type, sqlite3.Binary(data), len(data) + len(key), now + ttl, now)
+            )
+            with self._stats_lock:
+                self._writes += 1
+                prune = self._writes % self.PRUNE_EVERY == 0
+            if prune:
+                self.prune()
+        except sqlite3.Error as e:
+            self._count("errors")
+            print(f"[Cache:{self.name}] SQLite set failed: {e}")
+
+    def prune(self):
+        """Delete expired entries, then the least recently read ones beyond max_bytes"""
+        conn = self._conn()
+        conn.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+        conn.execute("""
+            DELETE FROM entries WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS running FROM entries
+                ) WHERE running > ?
+            )
+        """, (self.max_bytes,))
+
+    def clear(self):
+        try:
+            self._conn().execute("DELETE FROM entries")
+        except sqlite3.Error as e:
+            self._count("errors")
+            print(f"[Cache:{self.name}] SQLite clear failed: {e}")
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        try:
+            entries, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            stats.update({"entries": entries, "bytes": size, "max_bytes": self.max_bytes, "path": self.path})
+        except sqlite3.Error as e:
+            stats["error"] = str(e)
+        return stats
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread and process (connections must not cross a fork)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+
+def create_cache(name: str, default_ttl: int = 24 * 3600, backend: str = None) -> CacheBackend:
+    """
+    Cache for `name` on the configured backend (Config.CACHE_BACKEND)
+
+    Falls back to the per-process memory backend when the shared one can't
+    be set up (redis package missing, unwritable SQLite directory).
+    """
+    backend = (backend or Config.CACHE_BACKEND).lower()
+    try:
+        if backend == "redis":
+            return RedisBackend(name, default_ttl)
+        if backend == "sqlite":
+            return SqliteBackend(name, default_ttl)
+    except (RuntimeError, sqlite3.Error, OSError) as e:
+        print(f"Warning: {backend} cache backend unavailable for {name}, using memory: {e}")
+    return MemoryBackend(name, default_ttl)
+
+
+# Photo bytes served by /api/maps/photo
+photo_cache = create_cache("photos", default_ttl=Config.PHOTO_CACHE_TTL)
+# Landmark / destination image URLs resolved through Pexels
+landmark_cache = create_cache("landmarks", default_ttl=Config.LANDMARK_CACHE_TTL)
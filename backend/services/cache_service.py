@@ -1,39 +1,296 @@
 # backend/services/cache_service.py
-import time
+import os
+import struct
 import threading
-from typing import Optional, Tuple
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from utils.helper import stable_hash
+
+# Disk entry header: expires_at, content type length
+_DISK_HEADER = struct.Struct("<dH")
+# Rough per-entry bookkeeping overhead counted against the byte budget
+_ENTRY_OVERHEAD = 128
+
+
+class _FrequencySketch:
+    """Count-min sketch of recent access counts (TinyLFU admission).
+
+    4-bit-style saturating counters in 4 rows; all counters are halved after
+    every `sample_size` recorded accesses so old popularity fades out.
+    """
+
+    ROWS = 4
+    MAX_COUNT = 15
+
+    def __init__(self, width: int = 4096):
+        self.width = width
+        self.sample_size = width * 10
+        self._counters = array("B", bytes(self.ROWS * width))
+        self._additions = 0
+
+    def record(self, key: str):
+        for index in self._indexes(key):
+            if self._counters[index] < self.MAX_COUNT:
+                self._counters[index] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._counters = array("B", (count >> 1 for count in self._counters))
+            self._additions //= 2
+
+    def frequency(self, key: str) -> int:
+        return min(self._counters[index] for index in self._indexes(key))
+
+    def _indexes(self, key: str):
+        return [row * self.width + hash((row, key)) % self.width for row in range(self.ROWS)]
+
 
 class CacheService:
-    """Simple thread-safe in-memory TTL cache for small binary objects.
+    """Thread-safe TTL cache for small binary objects, bounded by bytes.
 
-    Note: Suitable for development. For production use Redis or similar.
+    Entries live in an LRU-ordered dict whose total size stays under
+    `max_bytes`. With the "tinylfu" policy a new entry only displaces the
+    least recently used one if it has been requested more often recently
+    (count-min frequency sketch), so one-off images can't flush popular
+    ones. Evicted or rejected entries go to an optional disk tier
+    (`disk_dir`, bounded by `disk_max_bytes`) and are promoted back on the
+    next hit. A background sweeper drops expired entries from both tiers.
     """
-    def __init__(self, default_ttl: int = 24 * 3600):
-        self._store = {}  # key -> (expires_at, content_type, bytes)
+
+    def __init__(self, default_ttl: int = 24 * 3600, max_bytes: Optional[int] = None,
+                 disk_dir: Optional[str] = None, disk_max_bytes: Optional[int] = None,
+                 policy: Optional[str] = None, sweep_interval: Optional[float] = None, name: str = "cache"):
+        self._store = OrderedDict()  # key -> (expires_at, content_type, bytes)
         self._lock = threading.Lock()
         self._ttl = default_ttl
+        self.name = name
+        self.max_bytes = Config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.policy = (policy or Config.CACHE_POLICY).lower()
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = Config.CACHE_DISK_MAX_BYTES if disk_max_bytes is None else disk_max_bytes
+        self.sweep_interval = Config.CACHE_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
+        self._bytes = 0
+        self._sketch = _FrequencySketch() if self.policy == "tinylfu" else None
+        self._stats = {
+            "hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0,
+            "rejections": 0, "expirations": 0, "disk_writes": 0
+        }
+        self._sweeper_pid = None
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
 
     def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        self._ensure_sweeper()
         now = time.time()
         with self._lock:
+            if self._sketch:
+                self._sketch.record(key)
             val = self._store.get(key)
-            if not val:
-                return None
-            expires_at, content_type, data = val
-            if expires_at < now:
+            if val:
+                expires_at, content_type, data = val
+                if expires_at >= now:
+                    self._store.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return (content_type, data)
                 # expired
-                del self._store[key]
-                return None
-            return (content_type, data)
+                self._remove(key)
+                self._stats["expirations"] += 1
+
+        entry = self._disk_read(key) if self.disk_dir else None
+        if entry is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        expires_at, content_type, data = entry
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._stats["hits"] += 1
+        # Promote back to memory (admission rules apply; it stays on disk either way)
+        self._put(key, expires_at, content_type, data, spill=False)
+        return (content_type, data)
 
     def set(self, key: str, content_type: str, data: bytes, ttl: Optional[int] = None):
+        self._ensure_sweeper()
         expires = time.time() + (ttl if ttl is not None else self._ttl)
         with self._lock:
-            self._store[key] = (expires, content_type, data)
+            if self._sketch:
+                self._sketch.record(key)
+        self._put(key, expires, content_type, data, spill=True)
 
     def clear(self):
         with self._lock:
             self._store.clear()
+            self._bytes = 0
+        if self.disk_dir:
+            for path in self._disk_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({"entries": len(self._store), "bytes": self._bytes})
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "max_bytes": self.max_bytes,
+            "policy": self.policy,
+            "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else 0.0
+        })
+        if self.disk_dir:
+            files = [self._file_info(path) for path in self._disk_files()]
+            stats["disk"] = {
+                "entries": sum(1 for info in files if info),
+                "bytes": sum(info[0] for info in files if info),
+                "max_bytes": self.disk_max_bytes
+            }
+        return stats
+
+    def sweep(self):
+        """Drop expired entries from memory and disk; trim the disk tier to its budget"""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expires_at, _, _) in self._store.items() if expires_at < now]
+            for key in expired:
+                self._remove(key)
+            self._stats["expirations"] += len(expired)
+        if self.disk_dir:
+            self._disk_prune(now)
+
+    def _put(self, key: str, expires_at: float, content_type: str, data: bytes, spill: bool):
+        size = len(data) + len(key) + _ENTRY_OVERHEAD
+        spilled = []
+        with self._lock:
+            if key in self._store:
+                self._remove(key)
+            if size > self.max_bytes:
+                admitted = False
+            else:
+                admitted = self._make_room(key, size, spilled)
+            if admitted:
+                self._store[key] = (expires_at, content_type, data)
+                self._bytes += size
+            else:
+                self._stats["rejections"] += 1
+        if self.disk_dir:
+            # Disk writes happen outside the lock
+            for victim_key, (victim_expires, victim_type, victim_data) in spilled:
+                self._disk_write(victim_key, victim_expires, victim_type, victim_data)
+            if spill and not admitted:
+                self._disk_write(key, expires_at, content_type, data)
+
+    def _make_room(self, key: str, size: int, spilled: list) -> bool:
+        """Evict LRU entries until `size` fits; False when TinyLFU rejects the newcomer"""
+        if self._bytes + size <= self.max_bytes:
+            return True
+        if self._sketch and self._store:
+            victim = next(iter(self._store))
+            if self._sketch.frequency(key) < self._sketch.frequency(victim):
+                return False
+        while self._store and self._bytes + size > self.max_bytes:
+            victim, entry = self._store.popitem(last=False)
+            self._bytes -= len(entry[2]) + len(victim) + _ENTRY_OVERHEAD
+            self._stats["evictions"] += 1
+            if entry[0] >= time.time():
+                spilled.append((victim, entry))
+        return True
+
+    def _remove(self, key: str):
+        expires_at, content_type, data = self._store.pop(key)
+        self._bytes -= len(data) + len(key) + _ENTRY_OVERHEAD
+
+    def _ensure_sweeper(self):
+        """Start the expiry sweeper (once per process: threads don't survive a fork)"""
+        if not self.sweep_interval or self._sweeper_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sweeper_pid == os.getpid():
+                return
+            self._sweeper_pid = os.getpid()
+        threading.Thread(target=self._sweep_loop, name=f"{self.name}-sweeper", daemon=True).start()
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"[CacheService] Sweep of {self.name} failed: {e}")
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{stable_hash(key)}.cache")
+
+    def _disk_files(self):
+        try:
+            return [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir) if name.endswith(".cache")]
+        except OSError:
+            return []
+
+    def _disk_write(self, key: str, expires_at: float, content_type: str, data: bytes):
+        path = self._disk_path(key)
+        type_bytes = content_type.encode("utf-8")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_DISK_HEADER.pack(expires_at, len(type_bytes)))
+                f.write(type_bytes)
+                f.write(data)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._stats["disk_writes"] += 1
+        except OSError as e:
+            print(f"[CacheService] Disk write failed: {e}")
+
+    def _disk_read(self, key: str) -> Optional[Tuple[float, str, bytes]]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                header = f.read(_DISK_HEADER.size)
+                if len(header) < _DISK_HEADER.size:
+                    return None
+                expires_at, type_length = _DISK_HEADER.unpack(header)
+                if expires_at < time.time():
+                    os.remove(path)
+                    return None
+                content_type = f.read(type_length).decode("utf-8")
+                data = f.read()
+            os.utime(path)  # recency for disk pruning
+            return expires_at, content_type, data
+        except (OSError, ValueError):
+            return None
+
+    def _file_info(self, path: str):
+        try:
+            stat = os.stat(path)
+            return stat.st_size, stat.st_mtime
+        except OSError:
+            return None
 
-# Provide a module-level default cache instance for convenience
-default_cache = CacheService()
+    def _disk_prune(self, now: float):
+        files = []
+        for path in self._disk_files():
+            try:
+                with open(path, "rb") as f:
+                    header = f.read(_DISK_HEADER.size)
+                expires_at = _DISK_HEADER.unpack(header)[0] if len(header) == _DISK_HEADER.size else 0.0
+                if expires_at < now:
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in files)
+        # Least recently used files go first
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
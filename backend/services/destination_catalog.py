@@ -0,0 +1,185 @@
+# backend/services/destination_catalog.py
+import bisect
+import json
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from config import Config
+from utils.helper import fold_text
+
+
+class DestinationCatalog:
+    """Known destinations and their landmark attractions.
+
+    Loaded once from a JSON data file (Config.DESTINATIONS_PATH) into flat,
+    array-backed columns: city i owns attractions
+    [attr_start[i], attr_start[i + 1]). Destinations are resolved through an
+    alias index (official name, multilingual names, "City, Country" forms)
+    plus a sorted prefix list for partially typed names. Lookups are
+    dictionary hits and need no per-request tables.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    # Shortest partial input we try to complete ("barc" -> Barcelona)
+    MIN_PREFIX = 4
+
+    def __init__(self, data: Dict):
+        self.city_names = []
+        self.city_country = []
+        self.city_lat = array("d")
+        self.city_lng = array("d")
+        self.attr_start = array("I", [0])
+        self.attr_names = []
+        self.attr_lat = array("d")
+        self.attr_lng = array("d")
+        self.attr_rating = array("f")
+        self.attr_type = array("H")
+        self.types = []
+
+        self._alias_index = {}      # folded alias -> city id
+        self._country_index = {}    # folded country name/code -> country code
+        self._prefixes = []         # sorted folded aliases for prefix completion
+
+        for code, names in (data.get("countries") or {}).items():
+            for name in [code] + list(names):
+                self._country_index[fold_text(name)] = code
+
+        type_ids = {}
+        for destination in data.get("destinations") or []:
+            city_id = len(self.city_names)
+            self.city_names.append(destination["name"])
+            self.city_country.append(destination.get("country_code", ""))
+            self.city_lat.append(float(destination.get("lat", 0.0)))
+            self.city_lng.append(float(destination.get("lng", 0.0)))
+
+            for attraction in destination.get("attractions") or []:
+                attraction_type = attraction.get("type", "attraction")
+                if attraction_type not in type_ids:
+                    type_ids[attraction_type] = len(self.types)
+                    self.types.append(attraction_type)
+                self.attr_names.append(attraction["name"])
+                self.attr_lat.append(float(attraction["lat"]))
+                self.attr_lng.append(float(attraction["lng"]))
+                self.attr_rating.append(float(attraction.get("rating", 4.5)))
+                self.attr_type.append(type_ids[attraction_type])
+            self.attr_start.append(len(self.attr_names))
+
+            for alias in [destination["name"]] + list(destination.get("aliases") or []):
+                folded = fold_text(alias)
+                if folded:
+                    self._alias_index.setdefault(folded, city_id)
+
+        self._prefixes = sorted(self._alias_index)
+
+    @classmethod
+    def get(cls) -> "DestinationCatalog":
+        """Process-wide catalog, loaded on first use"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls.load(Config.DESTINATIONS_PATH)
+        return cls._instance
+
+    @classmethod
+    def load(cls, path: str) -> "DestinationCatalog":
+        try:
+            with open(path, encoding="utf-8") as f:
+                catalog = cls(json.load(f))
+            print(f"Loaded {len(catalog)} destinations ({len(catalog.attr_names)} attractions) from {path}")
+            return catalog
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load destination catalog {path}: {e}")
+            return cls({})
+
+    def __len__(self):
+        return len(self.city_names)
+
+    def resolve(self, query: str) -> Optional[int]:
+        """
+        Resolve a free-text destination to a city id, or None if unknown
+
+        Accepts "Paris", "paris, france", "Parigi", "New York City, NY",
+        "barcel". A country suffix that names a different country
+        ("Paris, Texas, USA") does not match.
+        """
+        folded = fold_text(query)
+        if not folded:
+            return None
+
+        city_id = self._alias_index.get(folded)
+        if city_id is not None:
+            return city_id
+
+        parts = [part.strip() for part in folded.split(",") if part.strip()]
+        if not parts:
+            return None
+        place = parts[0]
+        qualifiers = parts[1:]
+
+        # Every qualifier naming a country must agree with the city's country
+        countries = {self._country_index[q] for q in qualifiers if q in self._country_index}
+        unknown_qualifiers = [q for q in qualifiers if q not in self._country_index]
+
+        city_id = self._alias_index.get(place)
+        if city_id is None:
+            city_id = self._match_tokens(place)
+        if city_id is None and not qualifiers:
+            city_id = self._match_prefix(place)
+        if city_id is None:
+            return None
+
+        if countries and self.city_country[city_id] not in countries:
+            return None
+        if unknown_qualifiers and not countries:
+            # e.g. "Paris, Texas" - some other place sharing the name
+            return None
+        return city_id
+
+    def city_name(self, city_id: int) -> str:
+        return self.city_names[city_id]
+
+    def city_location(self, city_id: int) -> Dict:
+        return {"lat": self.city_lat[city_id], "lng": self.city_lng[city_id]}
+
+    def attraction_names(self, city_id: int) -> List[str]:
+        return self.attr_names[self.attr_start[city_id]:self.attr_start[city_id + 1]]
+
+    def attractions(self, city_id: int) -> List[Dict]:
+        """Attractions of a city as dicts (name, lat, lng, type, rating)"""
+        return [
+            {
+                "name": self.attr_names[i],
+                "lat": self.attr_lat[i],
+                "lng": self.attr_lng[i],
+                "type": self.types[self.attr_type[i]],
+                "rating": round(self.attr_rating[i], 1)
+            }
+            for i in range(self.attr_start[city_id], self.attr_start[city_id + 1])
+        ]
+
+    def _match_tokens(self, place: str) -> Optional[int]:
+        """Longest run of whole words that is a known alias ("rome italy trip" -> Rome)"""
+        tokens = place.split()
+        for length in range(len(tokens), 0, -1):
+            for start in range(len(tokens) - length + 1):
+                city_id = self._alias_index.get(" ".join(tokens[start:start + length]))
+                if city_id is not None:
+                    return city_id
+        return None
+
+    def _match_prefix(self, place: str) -> Optional[int]:
+        """Complete a partially typed name if it identifies exactly one city"""
+        if len(place) < self.MIN_PREFIX:
+            return None
+        start = bisect.bisect_left(self._prefixes, place)
+        matches = set()
+        for alias in self._prefixes[start:]:
+            if not alias.startswith(place):
+                break
+            matches.add(self._alias_index[alias])
+            if len(matches) > 1:
+                return None
+        return matches.pop() if matches else None
@@ -0,0 +1,201 @@
+# backend/services/gazetteer.py
+import csv
+import os
+import re
+import threading
+from array import array
+from typing import Dict, Optional
+
+from config import Config
+from utils.helper import fold_text
+
+# Bundled fixture (~100 cities), used when the GeoNames files aren't installed
+SAMPLE_CITIES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cities_sample.tsv")
+SAMPLE_COUNTRIES_PATH = os.path.join(os.path.dirname(SAMPLE_CITIES_PATH), "countryInfo_sample.txt")
+
+# Common ways of writing a country that aren't in countryInfo.txt
+COUNTRY_ALIASES = {
+    "uk": "GB", "england": "GB", "scotland": "GB", "wales": "GB", "great britain": "GB", "britain": "GB",
+    "usa": "US", "united states of america": "US", "america": "US", "u s a": "US",
+    "uae": "AE", "emirates": "AE", "holland": "NL", "the netherlands": "NL",
+    "czech republic": "CZ", "korea": "KR", "republic of korea": "KR", "turkiye": "TR",
+    "russian federation": "RU", "viet nam": "VN", "bharat": "IN",
+    # Native names (folded)
+    "italia": "IT", "espana": "ES", "deutschland": "DE", "nederland": "NL", "osterreich": "AT",
+    "schweiz": "CH", "suisse": "CH", "brasil": "BR", "nippon": "JP", "polska": "PL", "hellas": "GR",
+}
+
+
+class Gazetteer:
+    """Offline city-level geocoder built from GeoNames dumps.
+
+    Reads a cities file in the GeoNames "cities" format (e.g. cities15000.txt)
+    and countryInfo.txt into flat arrays (coordinates, population, country
+    index) plus a folded name/alternate-name index, so "Paris" or
+    "Hyderabad, India" resolve with a couple of dict lookups. Anything with
+    house numbers, streets or unknown qualifiers ("Paris, Texas") is left to
+    Nominatim.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    # GeoNames cities columns
+    NAME, ASCII_NAME, ALTERNATE_NAMES, LATITUDE, LONGITUDE, COUNTRY_CODE, POPULATION = 1, 2, 3, 4, 5, 8, 14
+    # More comma-separated parts than "city, region, country" is a street address
+    MAX_PARTS = 3
+
+    def __init__(self):
+        self.names = []
+        self.lat = array("d")
+        self.lng = array("d")
+        self.population = array("q")
+        self.country = array("H")        # index into self.country_codes
+        self.country_codes = []
+        self.country_names = []
+        self._country_ids = {}           # ISO code -> index
+        self._country_index = {}         # folded code / ISO3 / name -> index
+        self._name_index = {}            # folded name -> city id, or tuple of ids
+        self._stats_lock = threading.Lock()
+        self._stats = {"lookups": 0, "hits": 0}
+
+    @classmethod
+    def get(cls) -> "Gazetteer":
+        """Process-wide gazetteer, loaded on first use"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cities_path, countries_path = Config.GAZETTEER_CITIES_PATH, Config.GAZETTEER_COUNTRIES_PATH
+                    if not os.path.exists(cities_path):
+                        print(f"[Gazetteer] {cities_path} not found, using the bundled sample "
+                              f"(download cities15000.txt and countryInfo.txt from GeoNames for full coverage)")
+                        cities_path, countries_path = SAMPLE_CITIES_PATH, SAMPLE_COUNTRIES_PATH
+                    cls._instance = cls.load(cities_path, countries_path)
+        return cls._instance
+
+    @classmethod
+    def load(cls, cities_path: str, countries_path: str, min_population: int = None) -> "Gazetteer":
+        gazetteer = cls()
+        min_population = Config.GAZETTEER_MIN_POPULATION if min_population is None else min_population
+        try:
+            with open(countries_path, encoding="utf-8") as f:
+                for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                    if len(row) >= 5 and row[0] and not row[0].startswith("#"):
+                        gazetteer._add_country(row[0], row[1], row[4])
+            for alias, code in COUNTRY_ALIASES.items():
+                if code in gazetteer._country_ids:
+                    gazetteer._country_index.setdefault(alias, gazetteer._country_ids[code])
+
+            with open(cities_path, encoding="utf-8") as f:
+                for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                    if len(row) <= cls.POPULATION:
+                        continue
+                    population = int(row[cls.POPULATION] or 0)
+                    if population >= min_population:
+                        gazetteer._add_city(row, population)
+            print(f"[Gazetteer] Loaded {len(gazetteer)} cities, {len(gazetteer.country_codes)} countries")
+        except (OSError, ValueError) as e:
+            print(f"[Gazetteer] Could not load {cities_path}: {e}")
+        return gazetteer
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, query: str) -> Optional[Dict]:
+        """
+        Geocode a city-level query ("Paris", "Hyderabad, India", "roma italia")
+
+        Returns {"address", "lat", "lng"} like MapsService.geocode, or None
+        when the query isn't a known city (street addresses, unknown places,
+        unknown qualifiers). Ambiguous names resolve to the most populous city.
+        """
+        result = self._lookup(query)
+        with self._stats_lock:
+            self._stats["lookups"] += 1
+            if result:
+                self._stats["hits"] += 1
+        return result
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["fallbacks"] = stats["lookups"] - stats["hits"]
+        stats["hit_ratio"] = round(stats["hits"] / stats["lookups"], 4) if stats["lookups"] else 0.0
+        stats["cities"] = len(self)
+        return stats
+
+    def _lookup(self, query: str) -> Optional[Dict]:
+        # House numbers / postcodes mean a street-level address
+        if not query or re.search(r"\d", query):
+            return None
+        folded = fold_text(query)
+        parts = [part.strip() for part in folded.split(",") if part.strip()]
+        if not parts or len(parts) > self.MAX_PARTS:
+            return None
+
+        place, qualifiers = parts[0], parts[1:]
+        if not qualifiers and place not in self._name_index:
+            # "roma italia": trailing words may name the country
+            tokens = place.split()
+            for size in range(1, min(3, len(tokens) - 1) + 1):
+                head, tail = " ".join(tokens[:-size]), " ".join(tokens[-size:])
+                if tail in self._country_index and head in self._name_index:
+                    place, qualifiers = head, [tail]
+                    break
+
+        countries = set()
+        for qualifier in qualifiers:
+            if qualifier not in self._country_index:
+                return None  # region or other qualifier we can't check: let Nominatim decide
+            countries.add(self._country_index[qualifier])
+
+        ids = self._name_index.get(place)
+        if ids is None:
+            return None
+        ids = ids if isinstance(ids, tuple) else (ids,)
+        if countries:
+            ids = tuple(i for i in ids if self.country[i] in countries)
+            if not ids:
+                return None
+
+        best = max(ids, key=lambda i: self.population[i])
+        return {
+            "address": f"{self.names[best]}, {self.country_names[self.country[best]]}",
+            "lat": self.lat[best],
+            "lng": self.lng[best]
+        }
+
+    def _add_country(self, code: str, iso3: str, name: str):
+        country_id = len(self.country_codes)
+        self.country_codes.append(code)
+        self.country_names.append(name)
+        self._country_ids[code] = country_id
+        for alias in (code, iso3, name):
+            folded = fold_text(alias)
+            if folded:
+                self._country_index.setdefault(folded, country_id)
+
+    def _add_city(self, row, population: int):
+        country_id = self._country_ids.get(row[self.COUNTRY_CODE])
+        if country_id is None:
+            return
+        city_id = len(self.names)
+        self.names.append(row[self.NAME])
+        self.lat.append(float(row[self.LATITUDE]))
+        self.lng.append(float(row[self.LONGITUDE]))
+        self.population.append(population)
+        self.country.append(country_id)
+
+        aliases = {fold_text(row[self.NAME]), fold_text(row[self.ASCII_NAME])}
+        aliases.update(fold_text(alias) for alias in row[self.ALTERNATE_NAMES].split(",") if alias)
+        for alias in aliases:
+            # Skip codes and abbreviations (GeoNames alternates include IATA codes etc.)
+            if len(alias) < 2 or "," in alias:
+                continue
+            existing = self._name_index.get(alias)
+            if existing is None:
+                self._name_index[alias] = city_id
+            elif isinstance(existing, tuple):
+                self._name_index[alias] = existing + (city_id,)
+            else:
+                self._name_index[alias] = (existing, city_id)
@@ -0,0 +1,47 @@
+# backend/services/geocode_cache.py
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from database import MongoDatabase
+
+
+class GeocodeCache:
+    """Persistent geocoding results (`geocode_cache` collection).
+
+    Documents are keyed on the normalized query. Misses ("no such place")
+    are cached too, for a shorter time, so repeated bad input doesn't go
+    back upstream. A TTL index on expires_at removes stale entries. If Mongo
+    is unreachable every lookup is a cache miss; geocoding keeps working.
+    """
+
+    @staticmethod
+    def get(key: str) -> Tuple[bool, Optional[Dict]]:
+        """Return (found, result); result is None for a cached miss"""
+        try:
+            doc = MongoDatabase.get_db().geocode_cache.find_one({"_id": key})
+        except Exception as e:
+            print(f"[GeocodeCache] Lookup failed: {e}")
+            return False, None
+        if not doc or doc.get("expires_at", datetime.min) < datetime.utcnow():
+            return False, None
+        return True, doc.get("result")
+
+    @staticmethod
+    def set(key: str, query: str, result: Optional[Dict]):
+        ttl = Config.GEOCODE_CACHE_TTL if result else Config.GEOCODE_NEGATIVE_TTL
+        now = datetime.utcnow()
+        try:
+            MongoDatabase.get_db().geocode_cache.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "query": query,
+                    "result": result,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=ttl)
+                },
+                upsert=True
+            )
+        except Exception as e:
+            print(f"[GeocodeCache] Store failed: {e}")
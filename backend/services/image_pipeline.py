@@ -0,0 +1,207 @@
+# backend/services/image_pipeline.py
+import io
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from config import Config
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    print("Warning: Pillow not installed (pip install -r requirements.txt) - photo proxy serves images unresized")
+
+# Output format -> (Pillow format name, mimetype)
+FORMATS = {
+    "avif": ("AVIF", "image/avif"),
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "png": ("PNG", "image/png"),
+}
+# EXIF orientations that swap width and height
+_ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def transcode(data: bytes, width: int, fmt: Optional[str]) -> Optional[Tuple[str, bytes]]:
+    """
+    Scale an image down to `width` px and encode it (runs in a pool process)
+
+    Args:
+        data: source image bytes
+        width: maximum output width in px
+        fmt: "avif", "webp", or None to keep a JPEG/PNG-style format
+
+    Returns:
+        (content_type, bytes), the source itself when re-encoding doesn't make
+        it smaller, or None for images that are passed through (animations)
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        if getattr(image, "is_animated", False):
+            return None
+        source_type = Image.MIME.get(image.format, "application/octet-stream")
+        rotated = image.getexif().get(0x0112) in _ROTATED_ORIENTATIONS
+        display_width = image.height if rotated else image.width
+        scale = min(width / display_width, 1.0)
+        # JPEG: decode straight to a 1/2..1/8 scale instead of full size
+        image.draft("RGB", (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))),
+                                 Image.LANCZOS, reducing_gap=3.0)
+
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        if fmt is None:
+            fmt = "png" if has_alpha else "jpeg"
+        pillow_format, content_type = FORMATS[fmt]
+        if fmt == "jpeg" or not has_alpha:
+            image = image.convert("RGB")
+        elif image.mode != "RGBA":
+            image = image.convert("RGBA")
+
+        options = {"icc_profile": image.info.get("icc_profile")}
+        if fmt == "avif":
+            options.update(quality=Config.IMAGE_AVIF_QUALITY, speed=8)
+        elif fmt == "webp":
+            options.update(quality=Config.IMAGE_WEBP_QUALITY, method=4)
+        elif fmt == "jpeg":
+            options.update(quality=Config.IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+        else:
+            options.update(optimize=True)
+        out = io.BytesIO()
+        image.save(out, pillow_format, **options)
+
+    if scale >= 1.0 and out.tell() >= len(data):
+        return source_type, data
+    return content_type, out.getvalue()
+
+
+class ImagePipeline:
+    """Resizes and re-encodes proxied photos in a process pool.
+
+    Decoding and encoding are CPU-bound and hold the GIL, so they run in a
+    small ProcessPoolExecutor (one per worker process) instead of on the
+    request threads. Pillow is in requirements.txt; if it is missing the
+    pipeline is unavailable and photos are proxied unchanged.
+    """
+
+    _executor = None
+    _executor_pid = None
+    _lock = threading.Lock()
+    _stats = {"transcodes": 0, "failures": 0, "timeouts": 0, "bytes_in": 0, "bytes_out": 0}
+
+    @staticmethod
+    def available() -> bool:
+        return PIL_AVAILABLE and Config.IMAGE_PIPELINE_ENABLED
+
+    @staticmethod
+    def negotiate(accept: str) -> Optional[str]:
+        """
+        Preferred output format the client accepts (Config.IMAGE_FORMATS order)
+
+        Only formats listed explicitly count: "*/*" doesn't mean a browser
+        can decode AVIF.
+
+        Returns:
+            "avif", "webp", or None to keep the source format
+        """
+        if not ImagePipeline.available():
+            return None
+        accepted = {value.lower() for value, quality in parse_accept_header(accept or "", MIMEAccept) if quality > 0}
+        for fmt in Config.IMAGE_FORMATS:
+            if fmt in ("avif", "webp") and FORMATS[fmt][1] in accepted and ImagePipeline.can_encode(fmt):
+                return fmt
+        return None
+
+    @staticmethod
+    def can_encode(fmt: str) -> bool:
+        if not PIL_AVAILABLE:
+            return False
+        Image.init()
+        return FORMATS[fmt][0] in Image.SAVE
+
+    @classmethod
+    def resize(cls, data: bytes, width: int, fmt: Optional[str] = None) -> Optional[Tuple[str, bytes]]:
+        """
+        Variant of an image scaled to `width` px in format `fmt`
+
+        Args:
+            data: source image bytes
+            width: maximum width in px
+            fmt: "avif", "webp" or None (see negotiate)
+
+        Returns:
+            (content_type, bytes), or None when the image should be served as is
+            (pipeline unavailable, undecodable or animated image, timeout)
+        """
+        if not cls.available():
+            return None
+        try:
+            future = cls._pool().submit(transcode, data, width, fmt)
+        except (BrokenProcessPool, RuntimeError) as e:
+            cls._reset_pool()
+            cls._count("failures")
+            print(f"[ImagePipeline] Process pool unavailable: {e}")
+            return None
+        try:
+            result = future.result(timeout=Config.IMAGE_TRANSCODE_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            cls._count("timeouts")
+            print(f"[ImagePipeline] Transcode timed out after {Config.IMAGE_TRANSCODE_TIMEOUT}s")
+            return None
+        except BrokenProcessPool as e:
+            cls._reset_pool()
+            cls._count("failures")
+            print(f"[ImagePipeline] Process pool broken: {e}")
+            return None
+        except Exception as e:
+            cls._count("failures")
+            print(f"[ImagePipeline] Transcode failed: {e}")
+            return None
+
+        if result:
+            with cls._lock:
+                cls._stats["transcodes"] += 1
+                cls._stats["bytes_in"] += len(data)
+                cls._stats["bytes_out"] += len(result[1])
+        return result
+
+    @classmethod
+    def stats(cls) -> Dict:
+        with cls._lock:
+            stats = dict(cls._stats)
+        stats.update({
+            "available": cls.available(),
+            "formats": [fmt for fmt in ("avif", "webp") if cls.can_encode(fmt)],
+            "size_ratio": round(stats["bytes_out"] / stats["bytes_in"], 4) if stats["bytes_in"] else None
+        })
+        return stats
+
+    @classmethod
+    def _count(cls, metric: str):
+        with cls._lock:
+            cls._stats[metric] += 1
+
+    @classmethod
+    def _pool(cls) -> ProcessPoolExecutor:
+        """The process pool of this worker (pools don't survive a fork)"""
+        with cls._lock:
+            if cls._executor is None or cls._executor_pid != os.getpid():
+                cls._executor = ProcessPoolExecutor(max_workers=Config.IMAGE_TRANSCODE_WORKERS)
+                cls._executor_pid = os.getpid()
+            return cls._executor
+
+    @classmethod
+    def _reset_pool(cls):
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None and cls._executor_pid == os.getpid():
+            executor.shutdown(wait=False, cancel_futures=True)
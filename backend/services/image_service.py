@@ -1,24 +1,155 @@
 # backend/services/image_service.py
+import os
+import threading
+import time
 import requests
-from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
 from config import Config
+from utils.helper import stable_seed
+from .cache_backends import landmark_cache
 from functools import lru_cache
 
+
+class PexelsQuota:
+    """Process-wide view of the Pexels API quota.
+
+    Every response's X-Ratelimit-Limit / -Remaining / -Reset headers update
+    the known remaining request count. A 429 blocks all searches until its
+    Retry-After, the quota reset time, or an exponential backoff has passed;
+    so does a Remaining of 0 before the reset. Searches check `allow()`
+    first, so a throttled key costs no requests or timeouts.
+    """
+    
+    _lock = threading.Lock()
+    _limit = None
+    _remaining = None
+    _reset_at = None
+    _blocked_until = 0.0
+    _consecutive_throttles = 0
+    _stats = {"requests": 0, "throttled": 0, "skipped": 0}
+    
+    @classmethod
+    def allow(cls) -> bool:
+        """Reserve one request; False while backing off or out of quota"""
+        now = time.time()
+        with cls._lock:
+            exhausted = cls._remaining is not None and cls._remaining <= 0 and (cls._reset_at or 0) > now
+            if now < cls._blocked_until or exhausted:
+                cls._stats["skipped"] += 1
+                return False
+            cls._stats["requests"] += 1
+            if cls._remaining is not None:
+                # Corrected by the headers of the response
+                cls._remaining -= 1
+            return True
+    
+    @classmethod
+    def blocked(cls) -> bool:
+        """True while backing off after a 429"""
+        with cls._lock:
+            return time.time() < cls._blocked_until
+    
+    @classmethod
+    def record(cls, response) -> Optional[float]:
+        """
+        Update the quota from a Pexels response
+        
+        Returns:
+            float: seconds searches are blocked for, when the response is a 429
+        """
+        now = time.time()
+        limit = PexelsQuota._number(response.headers.get("X-Ratelimit-Limit"))
+        remaining = PexelsQuota._number(response.headers.get("X-Ratelimit-Remaining"))
+        reset = PexelsQuota._number(response.headers.get("X-Ratelimit-Reset"))
+        with cls._lock:
+            if limit is not None:
+                cls._limit = int(limit)
+            if remaining is not None:
+                cls._remaining = int(remaining)
+            if reset is not None:
+                # Pexels sends a UNIX timestamp; accept delta-seconds too
+                cls._reset_at = reset if reset > 1e9 else now + reset
+            if response.status_code != 429:
+                cls._consecutive_throttles = 0
+                return None
+            
+            cls._stats["throttled"] += 1
+            cls._consecutive_throttles += 1
+            delay = PexelsQuota._number(response.headers.get("Retry-After"))
+            if delay is None and cls._reset_at and cls._reset_at > now:
+                delay = cls._reset_at - now
+            if delay is None:
+                delay = Config.PEXELS_BACKOFF_SECONDS * 2 ** (cls._consecutive_throttles - 1)
+            delay = min(delay, Config.PEXELS_MAX_BACKOFF_SECONDS)
+            cls._blocked_until = max(cls._blocked_until, now + delay)
+            return delay
+    
+    @classmethod
+    def concurrency(cls, wanted: int) -> int:
+        """Searches to run at once: one at a time when the remaining quota is low"""
+        with cls._lock:
+            if cls._remaining is not None and cls._remaining < Config.PEXELS_QUOTA_RESERVE:
+                return 1
+        return max(1, wanted)
+    
+    @classmethod
+    def stats(cls) -> Dict:
+        now = time.time()
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats.update({
+                "limit": cls._limit,
+                "remaining": cls._remaining,
+                "reset_in": round(cls._reset_at - now) if cls._reset_at and cls._reset_at > now else None,
+                "blocked_for": round(cls._blocked_until - now, 1) if cls._blocked_until > now else 0
+            })
+        return stats
+    
+    @staticmethod
+    def _number(value) -> Optional[float]:
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+
 class ImageService:
     """Service for fetching landmark images from Pexels API"""
     
     PEXELS_API_URL = "https://api.pexels.com/v1/search"
     
-    # Cache for landmark images to avoid repeated API calls
-    _landmark_cache = {}
+    # Generic landmark types tried with names that don't contain one (first three)
+    LANDMARK_KEYWORDS = [
+        'temple', 'fort', 'palace', 'mosque', 'church', 'monument',
+        'museum', 'park', 'garden', 'lake', 'tower', 'bridge'
+    ]
+    
+    # Pool for concurrent search strategies (shared by all requests of a process)
+    _search_executor = None
+    _search_executor_pid = None
+    _searches_in_flight = 0
+    _search_lock = threading.Lock()
+    
+    # Cache for landmark images to avoid repeated API calls (shared across workers)
+    _landmark_cache = landmark_cache
     
+    @staticmethod
+    def _cached_url(cache_key: str) -> Optional[str]:
+        cached = ImageService._landmark_cache.get(cache_key)
+        return cached[1].decode("utf-8") if cached else None
+
+    @staticmethod
+    def _cache_url(cache_key: str, url: str, ttl: int = None):
+        ImageService._landmark_cache.set(cache_key, "text/uri-list", url.encode("utf-8"), ttl)
+
     @staticmethod
     def _get_fallback_image(query: str, width: int = 400, height: int = 300) -> str:
         """Get a fallback image using Picsum Photos (no API key required)"""
         # Use Picsum Photos as a reliable fallback
         # Create deterministic seed based on query for consistency
-        seed = hash(query.replace(" ", "")) % 10000
-        return f"https://picsum.photos/seed/{abs(seed)}/{width}/{height}"
+        seed = stable_seed(query.replace(" ", ""))
+        return f"https://picsum.photos/seed/{seed}/{width}/{height}"
     
     @staticmethod
     def get_landmark_image(landmark_name: str, destination: str = None) -> str:
@@ -34,13 +165,14 @@ class ImageService:
         """
         # Check cache first
         cache_key = f"{landmark_name}_{destination}".lower()
-        if cache_key in ImageService._landmark_cache:
-            return ImageService._landmark_cache[cache_key]
+        cached_url = ImageService._cached_url(cache_key)
+        if cached_url:
+            return cached_url
         
         # If no Pexels API key, use fallback immediately
         if not Config.PEXELS_API_KEY:
             fallback_url = ImageService._get_fallback_image(landmark_name)
-            ImageService._landmark_cache[cache_key] = fallback_url
+            ImageService._cache_url(cache_key, fallback_url, Config.LANDMARK_FALLBACK_TTL)
             return fallback_url
         
         try:
@@ -65,49 +197,11 @@ class ImageService:
             for pattern in generic_patterns:
                 search_query = search_query.replace(pattern, "").strip()
             
-            # Strategy 1: Try exact landmark name with destination
-            if destination:
-                final_query = f"{search_query} {destination}".strip()
-                print(f"[Pexels] Strategy 1 - Searching for: '{final_query}'")
-                image_url = ImageService._search_pexels(final_query)
-                if image_url:
-                    ImageService._landmark_cache[cache_key] = image_url
-                    return image_url
-            
-            # Strategy 2: Try just the landmark name
-            print(f"[Pexels] Strategy 2 - Searching for: '{search_query}'")
-            image_url = ImageService._search_pexels(search_query)
+            queries = ImageService._strategy_queries(search_query, destination)
+            image_url = ImageService._search_ranked(queries)
             if image_url:
-                ImageService._landmark_cache[cache_key] = image_url
+                ImageService._cache_url(cache_key, image_url)
                 return image_url
-            
-            # Strategy 3: Try with common landmark keywords
-            landmark_keywords = [
-                'temple', 'fort', 'palace', 'mosque', 'church', 'monument',
-                'museum', 'park', 'garden', 'lake', 'tower', 'bridge'
-            ]
-            
-            for keyword in landmark_keywords:
-                if keyword in search_query.lower():
-                    # Already has a landmark keyword, don't add more
-                    break
-            else:
-                # No landmark keyword found, try with common ones
-                for keyword in landmark_keywords[:3]:  # Try first 3 keywords
-                    trial_query = f"{search_query} {keyword}".strip()
-                    print(f"[Pexels] Strategy 3 - Trying: '{trial_query}'")
-                    image_url = ImageService._search_pexels(trial_query)
-                    if image_url:
-                        ImageService._landmark_cache[cache_key] = image_url
-                        return image_url
-            
-            # Strategy 4: Try destination only
-            if destination:
-                print(f"[Pexels] Strategy 4 - Fallback to destination: '{destination}'")
-                image_url = ImageService._search_pexels(destination)
-                if image_url:
-                    ImageService._landmark_cache[cache_key] = image_url
-                    return image_url
         
         except Exception as e:
             print(f"[Pexels] Error fetching image for '{landmark_name}': {str(e)}")
@@ -115,20 +209,209 @@ class ImageService:
         # Fallback to Picsum Photos if all strategies fail
         print(f"[Pexels] All strategies failed, using fallback for '{landmark_name}'")
         fallback_url = ImageService._get_fallback_image(landmark_name)
-        ImageService._landmark_cache[cache_key] = fallback_url
+        ImageService._cache_url(cache_key, fallback_url, Config.LANDMARK_FALLBACK_TTL)
         return fallback_url
     
     @staticmethod
-    def _search_pexels(query: str) -> Optional[str]:
+    def _strategy_queries(search_query: str, destination: str = None) -> List[str]:
+        """Pexels queries for a landmark, best first"""
+        queries = []
+        # Strategy 1: exact landmark name with destination
+        if destination:
+            queries.append(f"{search_query} {destination}".strip())
+        # Strategy 2: just the landmark name
+        queries.append(search_query)
+        # Strategy 3: name plus common landmark keywords, unless it already has one
+        if not any(keyword in search_query.lower() for keyword in ImageService.LANDMARK_KEYWORDS):
+            queries.extend(f"{search_query} {keyword}".strip() for keyword in ImageService.LANDMARK_KEYWORDS[:3])
+        # Strategy 4: destination only
+        if destination:
+            queries.append(destination)
+        return list(dict.fromkeys(query for query in queries if query))
+    
+    @staticmethod
+    def _search_ranked(queries: List[str]) -> Optional[str]:
+        """
+        Run the Pexels searches for ranked queries, hedged
+        
+        The best query starts at once. The next one starts as soon as a
+        better one comes back empty, or as a hedge after
+        PEXELS_HEDGE_DELAY_SECONDS without an answer, with at most
+        PEXELS_STRATEGY_CONCURRENCY in flight per landmark (one when the
+        quota runs low). Hedges only start while the shared search pool has
+        idle workers, so they never queue ahead of other landmarks' first
+        queries. A result is accepted once every better-ranked query has
+        come back empty, so the answer is the same as trying them in order;
+        unstarted searches are then cancelled.
+        
+        Args:
+            queries (list): Search queries, best first
+        
+        Returns:
+            str: Image URL of the best-ranked query that found one, or None
+        """
+        if not queries:
+            return None
+        concurrency = PexelsQuota.concurrency(Config.PEXELS_STRATEGY_CONCURRENCY)
+        cancelled = threading.Event()
+        results = {}
+        pending = {}
+        deadline = time.monotonic() + Config.PEXELS_SEARCH_BUDGET_SECONDS
+        next_launch = time.monotonic()
+        submitted = 0
+        print(f"[Pexels] Searching {len(queries)} strategies (up to {concurrency} at a time) for: '{queries[0]}'")
+        
+        try:
+            while submitted < len(queries) or pending:
+                if PexelsQuota.blocked():
+                    # Throttled: the remaining strategies would only be skipped
+                    submitted = len(queries)
+                now = time.monotonic()
+                if (submitted < len(queries) and len(pending) < concurrency and now >= next_launch
+                        and (not pending or ImageService._search_pool_idle())):
+                    future = ImageService._submit_search(queries[submitted], cancelled)
+                    pending[future] = submitted
+                    submitted += 1
+                    next_launch = now + Config.PEXELS_HEDGE_DELAY_SECONDS
+                if not pending:
+                    break
+                
+                timeout = deadline - now
+                if submitted < len(queries) and len(pending) < concurrency:
+                    # Wake up for the next hedge
+                    timeout = min(timeout, max(next_launch - now, 0.05))
+                done, _ = wait(pending, timeout=max(timeout, 0), return_when=FIRST_COMPLETED)
+                if not done and time.monotonic() >= deadline:
+                    print(f"[Pexels] Search budget ({Config.PEXELS_SEARCH_BUDGET_SECONDS}s) exceeded, "
+                          f"{len(pending)} search(es) cancelled")
+                    break
+                for future in done:
+                    rank = pending.pop(future)
+                    results[rank] = future.result() if future.exception() is None else None
+                    if not results[rank]:
+                        # A miss frees its slot for the next strategy right away
+                        next_launch = time.monotonic()
+                
+                for rank in range(len(queries)):
+                    if rank not in results:
+                        break
+                    if results[rank]:
+                        print(f"[Pexels] Strategy '{queries[rank]}' won (rank {rank + 1})")
+                        return results[rank]
+        finally:
+            cancelled.set()
+            for future in pending:
+                future.cancel()
+        
+        # Out of time: best of what came back
+        for rank in sorted(results):
+            if results[rank]:
+                return results[rank]
+        return None
+    
+    @classmethod
+    def _submit_search(cls, query: str, cancelled: threading.Event):
+        """Queue a search on the shared pool, tracking how many are queued or running"""
+        with cls._search_lock:
+            cls._searches_in_flight += 1
+        future = cls._search_pool().submit(ImageService._search_pexels, query, cancelled)
+        future.add_done_callback(cls._search_done)
+        return future
+    
+    @classmethod
+    def _search_done(cls, future):
+        with cls._search_lock:
+            cls._searches_in_flight -= 1
+    
+    @classmethod
+    def _search_pool_idle(cls) -> bool:
+        """Whether a new search would start right away instead of queueing"""
+        with cls._search_lock:
+            return cls._searches_in_flight < Config.PEXELS_SEARCH_WORKERS
+    
+    @classmethod
+    def _search_pool(cls) -> ThreadPoolExecutor:
+        """Search thread pool of this process (threads don't survive a fork)"""
+        with cls._search_lock:
+            if cls._search_executor is None or cls._search_executor_pid != os.getpid():
+                cls._searches_in_flight = 0
+                cls._search_executor = ThreadPoolExecutor(
+                    max_workers=Config.PEXELS_SEARCH_WORKERS,
+                    thread_name_prefix="pexels-search"
+                )
+                cls._search_executor_pid = os.getpid()
+            return cls._search_executor
+    
+    @staticmethod
+    def get_landmark_images(landmark_names: List[str], destination: str = None,
+                            max_workers: int = None, time_budget: float = None) -> List[str]:
+        """
+        Fetch image URLs for several landmarks concurrently
+        
+        Lookups run on a bounded thread pool and share one overall time budget.
+        Landmarks still unresolved when the budget runs out get the
+        deterministic fallback image, so the caller waits at most `time_budget`
+        seconds instead of the sum of every lookup.
+        
+        Args:
+            landmark_names (list): Landmark names, in the order results are wanted
+            destination (str, optional): Destination/city name for more specific search
+            max_workers (int, optional): Pool size (defaults to Config.IMAGE_LOOKUP_WORKERS)
+            time_budget (float, optional): Seconds to wait in total
+                (defaults to Config.IMAGE_LOOKUP_BUDGET_SECONDS)
+        
+        Returns:
+            list: Image URLs aligned with `landmark_names`
+        """
+        if not landmark_names:
+            return []
+        
+        max_workers = max_workers or Config.IMAGE_LOOKUP_WORKERS
+        time_budget = time_budget if time_budget is not None else Config.IMAGE_LOOKUP_BUDGET_SECONDS
+        
+        # Identical names (e.g. generic fallbacks) only need one lookup
+        unique_names = list(dict.fromkeys(landmark_names))
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(unique_names))),
+            thread_name_prefix="landmark-image"
+        )
+        futures = {
+            name: executor.submit(ImageService.get_landmark_image, name, destination)
+            for name in unique_names
+        }
+        done, not_done = wait(futures.values(), timeout=time_budget)
+        # Don't block on stragglers; they finish in the background and still fill the cache
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        if not_done:
+            print(f"[Pexels] Image time budget ({time_budget}s) exceeded, {len(not_done)} lookup(s) using fallback")
+        
+        resolved = {}
+        for name, future in futures.items():
+            image_url = None
+            if future in done and future.exception() is None:
+                image_url = future.result()
+            resolved[name] = image_url or ImageService._get_fallback_image(name)
+        
+        return [resolved[name] for name in landmark_names]
+    
+    @staticmethod
+    def _search_pexels(query: str, cancelled: threading.Event = None) -> Optional[str]:
         """
         Internal method to search Pexels API with a given query
         
         Args:
             query (str): Search query
+            cancelled (Event, optional): Skip the request once set (another strategy won)
         
         Returns:
             str: Image URL if found, None otherwise
         """
+        if cancelled is not None and cancelled.is_set():
+            return None
+        if not PexelsQuota.allow():
+            print(f"[Pexels] Quota exhausted or backing off, skipping: '{query}'")
+            return None
         try:
             headers = {
                 "Authorization": Config.PEXELS_API_KEY
@@ -143,8 +426,9 @@ class ImageService:
                 ImageService.PEXELS_API_URL,
                 headers=headers,
                 params=params,
-                timeout=8
+                timeout=Config.PEXELS_TIMEOUT
             )
+            throttled_for = PexelsQuota.record(response)
             
             if response.status_code == 200:
                 data = response.json()
@@ -162,7 +446,7 @@ class ImageService:
                         return image_url
             
             elif response.status_code == 429:
-                print(f"[Pexels] Rate limited - too many requests")
+                print(f"[Pexels] Rate limited - backing off for {throttled_for:.0f}s")
                 return None
             else:
                 print(f"[Pexels] API error {response.status_code}: {response.text}")
@@ -188,13 +472,14 @@ class ImageService:
         """
         # Check cache first
         cache_key = f"dest_{destination}".lower()
-        if cache_key in ImageService._landmark_cache:
-            return ImageService._landmark_cache[cache_key]
+        cached_url = ImageService._cached_url(cache_key)
+        if cached_url:
+            return cached_url
         
         # If no Pexels API key, use fallback immediately
         if not Config.PEXELS_API_KEY:
             fallback_url = ImageService._get_fallback_image(destination)
-            ImageService._landmark_cache[cache_key] = fallback_url
+            ImageService._cache_url(cache_key, fallback_url, Config.LANDMARK_FALLBACK_TTL)
             return fallback_url
         
         try:
@@ -203,7 +488,7 @@ class ImageService:
             image_url = ImageService._search_pexels(destination)
             
             if image_url:
-                ImageService._landmark_cache[cache_key] = image_url
+                ImageService._cache_url(cache_key, image_url)
                 return image_url
         
         except Exception as e:
@@ -212,5 +497,5 @@ class ImageService:
         # Fallback to Picsum Photos if API fails or no results
         print(f"[Pexels] Destination image not found, using fallback for '{destination}'")
         fallback_url = ImageService._get_fallback_image(destination)
-        ImageService._landmark_cache[cache_key] = fallback_url
+        ImageService._cache_url(cache_key, fallback_url, Config.LANDMARK_FALLBACK_TTL)
         return fallback_url
@@ -0,0 +1,209 @@
+# backend/services/itinerary_cache.py
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from config import Config
+from utils.helper import fold_text
+from .single_flight import generation_flight
+
+# "$1,234" / "$85.50" style amounts inside cost strings
+_AMOUNT_RE = re.compile(r"\$\s?(\d[\d,]*(?:\.\d+)?)")
+
+
+class ItineraryCache:
+    """Parameter-keyed cache of generated itineraries.
+
+    Keys are (normalized destination, days, travel style, budget bucket), so
+    requests with nearby budgets share one generation. Cost fields are
+    rescaled to the exact requested budget on the way out. Entries are fresh
+    for `ttl` seconds, then served stale for up to `stale_ttl` more seconds
+    while a background refresh runs. Total size is bounded by `max_bytes`
+    (serialized JSON), evicting least recently used entries first.
+    """
+
+    def __init__(self, ttl: int = 6 * 3600, stale_ttl: int = 24 * 3600,
+                 max_bytes: int = 32 * 1024 * 1024, budget_step: float = 0.25):
+        self._entries = OrderedDict()  # key -> (created_at, budget, payload bytes)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._bytes = 0
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._max_bytes = max_bytes
+        self._budget_base = 1 + budget_step
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def budget_bucket(self, budget: float) -> int:
+        """Geometric bucket so each bucket spans the same relative budget range"""
+        return int(round(math.log(max(float(budget), 1.0), self._budget_base)))
+
+    def make_key(self, destination: str, budget: float, days: int, travel_style: str) -> Tuple:
+        return (
+            fold_text(destination),
+            int(days),
+            (travel_style or "").lower(),
+            self.budget_bucket(budget)
+        )
+
+    def get_or_generate(self, destination: str, budget: float, days: int, travel_style: str,
+                        generate: Callable[[], Dict]) -> Tuple[Dict, str]:
+        """
+        Return (itinerary, status) for the request parameters
+
+        status is "hit", "stale" or "miss". On a miss `generate()` is called
+        and its result cached; stale hits trigger a background refresh.
+        """
+        key = self.make_key(destination, budget, days, travel_style)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                created_at, cached_budget, payload = entry
+                age = now - created_at
+                if age > self._ttl + self._stale_ttl:
+                    self._remove(key)
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+                    if age <= self._ttl:
+                        self.hits += 1
+                        status = "hit"
+                    else:
+                        self.stale_hits += 1
+                        status = "stale"
+            if not entry:
+                self.misses += 1
+
+        if entry:
+            if status == "stale":
+                self._refresh_async(key, budget, generate)
+            itinerary = json.loads(payload)
+            return self._rescale(itinerary, cached_budget, budget), status
+
+        # Concurrent misses for the same key share one generation; it ran at
+        # the first caller's budget, so followers get it rescaled to theirs
+        generated_budget, itinerary = generation_flight.do(
+            ("itinerary_cache",) + key, self._generate_and_store, key, budget, generate
+        )
+        return self._rescale(itinerary, generated_budget, budget), "miss"
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _generate_and_store(self, key: Tuple, budget: float, generate: Callable[[], Dict]) -> Tuple[float, Dict]:
+        itinerary = generate()
+        self._store(key, budget, itinerary)
+        return float(budget), itinerary
+
+    def _store(self, key: Tuple, budget: float, itinerary: Dict):
+        try:
+            payload = json.dumps(itinerary, default=str).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            print(f"[ItineraryCache] Could not serialize itinerary: {e}")
+            return
+        if len(payload) > self._max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.time(), float(budget), payload)
+            self._bytes += len(payload)
+            # Evict least recently used entries until we're back under budget
+            while self._bytes > self._max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key: Tuple):
+        """Drop an entry; caller must hold the lock"""
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= len(entry[2])
+
+    def _refresh_async(self, key: Tuple, budget: float, generate: Callable[[], Dict]):
+        """Regenerate a stale entry in the background (at most one refresh per key)"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._store(key, budget, generate())
+            except Exception as e:
+                print(f"[ItineraryCache] Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="itinerary-cache-refresh", daemon=True).start()
+
+    @staticmethod
+    def _rescale(itinerary: Dict, cached_budget: float, budget: float) -> Dict:
+        """Scale cost fields generated for `cached_budget` to the requested `budget`"""
+        if not cached_budget or cached_budget == budget:
+            return itinerary
+        ratio = float(budget) / cached_budget
+
+        def scale_text(value):
+            if not isinstance(value, str):
+                return value
+
+            def repl(match):
+                raw = match.group(1)
+                amount = float(raw.replace(",", "")) * ratio
+                # Keep the original formatting (thousands separators, decimals)
+                decimals = len(raw.split(".", 1)[1]) if "." in raw else 0
+                separator = "," if "," in raw else ""
+                return f"${amount:{separator}.{decimals}f}"
+
+            return _AMOUNT_RE.sub(repl, value)
+
+        for day in itinerary.get("days") or []:
+            if not isinstance(day, dict):
+                continue
+            for activity in day.get("activities") or []:
+                if isinstance(activity, dict):
+                    activity["cost"] = scale_text(activity.get("cost"))
+            day["total_cost"] = scale_text(day.get("total_cost"))
+
+        if "estimated_total_cost" in itinerary:
+            itinerary["estimated_total_cost"] = scale_text(itinerary["estimated_total_cost"])
+        if isinstance(itinerary.get("budget"), (int, float)):
+            itinerary["budget"] = budget
+
+        return itinerary
+
+
+# Module-level cache used by the public generation endpoint
+itinerary_cache = ItineraryCache(
+    ttl=Config.ITINERARY_CACHE_TTL,
+    stale_ttl=Config.ITINERARY_CACHE_STALE_TTL,
+    max_bytes=Config.ITINERARY_CACHE_MAX_BYTES,
+    budget_step=Config.ITINERARY_CACHE_BUDGET_STEP
+)
@@ -0,0 +1,54 @@
+# backend/services/itinerary_store.py
+from database import MongoDatabase
+from models.itinerary_model import Itinerary
+from services.bigquery_service import BigQueryService
+
+
+class ItineraryStore:
+    """Persist generated itineraries to MongoDB and log them to BigQuery.
+
+    Shared by the HTTP routes and the background job workers so both write
+    through the same Itinerary.create path.
+    """
+
+    def __init__(self, bigquery_service=None):
+        self.bigquery_service = bigquery_service or BigQueryService()
+
+    def save_generated(self, user_id, destination, budget, days, travel_style, itinerary_data):
+        """Save a generated itinerary; returns the stored document (with _id)"""
+        # Create itinerary document
+        itinerary_doc = Itinerary.create(
+            user_id,
+            destination,
+            budget,
+            days,
+            travel_style,
+            itinerary_data
+        )
+
+        # Save to database
+        db = MongoDatabase.get_db()
+        result = db.itineraries.insert_one(itinerary_doc)
+
+        # Log to BigQuery
+        try:
+            total_cost = itinerary_data.get("estimated_cost", budget) if itinerary_data else budget
+            self.bigquery_service.log_itinerary(
+                itinerary_id=str(result.inserted_id),
+                user_id=str(user_id),
+                destination=destination,
+                budget=budget,
+                days=days,
+                travel_style=travel_style,
+                total_cost=total_cost
+            )
+            self.bigquery_service.log_event(
+                user_id=str(user_id),
+                event_type="itinerary_created",
+                destination=destination,
+                metadata={"days": days, "travel_style": travel_style}
+            )
+        except Exception as bq_error:
+            print(f"⚠ BigQuery logging failed: {str(bq_error)}")
+
+        return {**itinerary_doc, "_id": result.inserted_id}
@@ -0,0 +1,170 @@
+# backend/services/job_queue.py
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from pymongo import ReturnDocument
+from bson.objectid import ObjectId
+
+from config import Config
+from database import MongoDatabase
+from models.job_model import Job
+
+
+class LeaseLostError(Exception):
+    """The worker's lease on a job expired and another worker (or the reaper) took it over"""
+
+
+class JobQueue:
+    """MongoDB-backed work queue for itinerary generation (`jobs` collection).
+
+    Workers claim jobs with a single atomic find_one_and_update, so each job
+    runs on exactly one worker. A claim is a lease, renewed by a
+    LeaseHeartbeat while the job runs: if a worker dies, the job becomes
+    claimable again once the lease expires, up to JOB_MAX_ATTEMPTS; after
+    that it is marked failed.
+    """
+
+    @staticmethod
+    def enqueue(user_id, destination, budget, days, travel_style) -> Dict:
+        """Queue a generation job and return its document"""
+        job = Job.create(user_id, destination, budget, days, travel_style)
+        MongoDatabase.get_db().jobs.insert_one(job)
+        return job
+
+    @staticmethod
+    def get(job_id) -> Optional[Dict]:
+        return MongoDatabase.get_db().jobs.find_one({"_id": ObjectId(job_id)})
+
+    @staticmethod
+    def claim(worker_id: str) -> Optional[Dict]:
+        """Atomically claim the oldest runnable job, or return None"""
+        now = datetime.utcnow()
+        JobQueue.expire_abandoned(now)
+        return MongoDatabase.get_db().jobs.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued"},
+                    # Job whose worker died mid-run
+                    {"status": "running", "lease_expires_at": {"$lt": now}}
+                ],
+                "attempts": {"$lt": Config.JOB_MAX_ATTEMPTS}
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=Config.JOB_LEASE_SECONDS),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    def expire_abandoned(now: datetime = None) -> int:
+        """Fail running jobs whose lease expired on their last attempt (nobody may reclaim them)"""
+        now = now or datetime.utcnow()
+        result = MongoDatabase.get_db().jobs.update_many(
+            {
+                "status": "running",
+                "lease_expires_at": {"$lt": now},
+                "attempts": {"$gte": Config.JOB_MAX_ATTEMPTS}
+            },
+            {"$set": {"status": "failed", "error": "lease expired", "updated_at": now, "finished_at": now}}
+        )
+        return result.modified_count
+
+    @staticmethod
+    def extend_lease(job_id, worker_id: str) -> bool:
+        """Renew a claimed job's lease; False when the worker no longer holds it"""
+        now = datetime.utcnow()
+        result = MongoDatabase.get_db().jobs.update_one(
+            {"_id": job_id, "worker_id": worker_id, "status": "running"},
+            {"$set": {
+                "lease_expires_at": now + timedelta(seconds=Config.JOB_LEASE_SECONDS),
+                "updated_at": now
+            }}
+        )
+        return result.matched_count == 1
+
+    @staticmethod
+    def complete(job_id, worker_id: str, itinerary_id):
+        """
+        Mark a claimed job as done
+
+        Raises:
+            LeaseLostError: the job is no longer held by this worker
+        """
+        now = datetime.utcnow()
+        result = MongoDatabase.get_db().jobs.update_one(
+            {"_id": job_id, "worker_id": worker_id, "status": "running"},
+            {"$set": {
+                "status": "done",
+                "itinerary_id": itinerary_id,
+                "error": None,
+                "updated_at": now,
+                "finished_at": now
+            }}
+        )
+        if result.matched_count == 0:
+            raise LeaseLostError(f"Lease on job {job_id} lost before completion")
+
+    @staticmethod
+    def fail(job_id, worker_id: str, error: str, attempts: int):
+        """
+        Record a failure; the job is re-queued until it runs out of attempts
+
+        Raises:
+            LeaseLostError: the job is no longer held by this worker
+        """
+        now = datetime.utcnow()
+        update = {"status": "queued", "error": error, "updated_at": now}
+        if attempts >= Config.JOB_MAX_ATTEMPTS:
+            update.update({"status": "failed", "finished_at": now})
+        result = MongoDatabase.get_db().jobs.update_one(
+            {"_id": job_id, "worker_id": worker_id, "status": "running"},
+            {"$set": update}
+        )
+        if result.matched_count == 0:
+            raise LeaseLostError(f"Lease on job {job_id} lost before recording failure")
+
+
+class LeaseHeartbeat:
+    """Renews a job's lease every JOB_LEASE_SECONDS / 3 while the job runs.
+
+    Use as a context manager around the work. `lost` is set as soon as a
+    renewal finds the lease taken over, so the worker can drop its result
+    instead of saving a duplicate.
+    """
+
+    def __init__(self, job_id, worker_id: str, interval: float = None):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval if interval is not None else Config.JOB_LEASE_SECONDS / 3
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name=f"lease-{self.job_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not JobQueue.extend_lease(self.job_id, self.worker_id):
+                    print(f"[JobQueue] Lease on job {self.job_id} lost by {self.worker_id}")
+                    self.lost.set()
+                    return
+            except Exception as e:
+                # Transient database error: retry on the next beat, the lease still has time left
+                print(f"[JobQueue] Lease renewal for job {self.job_id} failed: {e}")
@@ -0,0 +1,165 @@
+# backend/services/map_clusters.py
+import json
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from config import Config
+from .cache_service import CacheService
+from .poi_index import PoiIndex
+from .poi_store import PoiStore
+
+# Clustered tiles: "z/x/y:<data version>" -> JSON list of clusters
+cluster_cache = CacheService(default_ttl=Config.CLUSTER_CACHE_TTL)
+
+
+class MapClusters:
+    """Marker clusters for a map viewport, computed per web-mercator tile.
+
+    Each z/x/y tile is split into a GRID x GRID cell grid (32 px cells on a
+    256 px tile). POIs from the POI index and the offline POI store are
+    binned into cells with NumPy (index POIs inside the store's coverage are
+    left out, the store has them); each non-empty cell becomes one cluster
+    with its centroid, count and best-rated attraction. Tiles are cached per
+    zoom level and POI index version of their area, so panning only computes
+    the tiles that came into view and loading a tile elsewhere keeps them.
+    """
+
+    GRID = 8
+    MAX_ZOOM = 20
+    # Viewports needing more tiles than this are rejected (zoom in instead)
+    MAX_TILES = 64
+
+    @staticmethod
+    def clusters(west: float, south: float, east: float, north: float, zoom: int) -> Dict:
+        """
+        Clusters for the tiles covering a bounding box
+
+        Args:
+            west, south, east, north: viewport in degrees
+            zoom: map zoom level (0-20)
+
+        Returns:
+            {"zoom", "tiles", "clusters": [{"lat", "lng", "count", "attraction"}]}
+
+        Raises:
+            ValueError: invalid bbox, or more than MAX_TILES tiles
+        """
+        if not (-90 <= south < north <= 90 and -180 <= west < east <= 180):
+            raise ValueError("bbox must be west,south,east,north with west < east and south < north")
+        zoom = min(max(int(zoom), 0), MapClusters.MAX_ZOOM)
+        x_min, y_min = MapClusters._tile(north, west, zoom)
+        x_max, y_max = MapClusters._tile(south, east, zoom)
+        tile_count = (x_max - x_min + 1) * (y_max - y_min + 1)
+        if tile_count > MapClusters.MAX_TILES:
+            raise ValueError(f"bbox covers {tile_count} tiles at zoom {zoom} (max {MapClusters.MAX_TILES})")
+
+        clusters = []
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                clusters.extend(MapClusters.tile_clusters(zoom, x, y))
+        return {"zoom": zoom, "tiles": tile_count, "clusters": clusters}
+
+    @staticmethod
+    def tile_clusters(zoom: int, x: int, y: int) -> List[Dict]:
+        """Clusters of one z/x/y tile (cached until the underlying POI data changes)"""
+        index = PoiIndex.get()
+        store = PoiStore.get()
+        south, west, north, east = MapClusters._tile_bounds(zoom, x, y)
+        # Edge rows also own the points beyond the mercator clip latitude (see _mercator)
+        last = 2 ** zoom - 1
+        if y == 0:
+            north = 90.0
+        if y == last:
+            south = -90.0
+
+        # Only index changes inside this tile change the answer (the store is read-only)
+        key = f"{zoom}/{x}/{y}:{index.version(south, west, north, east)}:{len(store) if store else 0}"
+        cached = cluster_cache.get(key)
+        if cached:
+            return json.loads(cached[1])
+
+        clusters = []
+        ids, lat, lng, rating = index.in_bbox(south, west, north, east)
+        if store and len(ids):
+            # The store is authoritative where it has coverage: the index holds the same
+            # landmarks there (catalog entries, earlier Overpass tiles) under other ids
+            keep = ~store.covers(lat, lng)
+            ids, lat, lng, rating = ids[keep], lat[keep], lng[keep], rating[keep]
+        clusters.extend(MapClusters._bin(index, ids, lat, lng, rating, zoom, x, y))
+        if store:
+            ids, lat, lng, rating = store.in_bbox(south, west, north, east)
+            clusters.extend(MapClusters._bin(store, ids, lat, lng, rating, zoom, x, y))
+
+        cluster_cache.set(key, "application/json", json.dumps(clusters).encode("utf-8"))
+        return clusters
+
+    @staticmethod
+    def _bin(source, ids: np.ndarray, lat: np.ndarray, lng: np.ndarray, rating: np.ndarray,
+             zoom: int, x: int, y: int) -> List[Dict]:
+        if not len(ids):
+            return []
+        grid = MapClusters.GRID
+        px, py = MapClusters._mercator(lat, lng, zoom)
+        # Points on a shared edge belong to one tile only; the antimeridian and the
+        # mercator clip edges belong to the first / last tile, as in _tile()
+        last = 2 ** zoom - 1
+        inside = (np.clip(np.floor(px), 0, last) == x) & (np.clip(np.floor(py), 0, last) == y)
+        if not inside.any():
+            return []
+        ids, lat, lng, rating, px, py = ids[inside], lat[inside], lng[inside], rating[inside], px[inside], py[inside]
+        col = np.clip(((px - x) * grid).astype(np.int64), 0, grid - 1)
+        row = np.clip(((py - y) * grid).astype(np.int64), 0, grid - 1)
+        cells, labels = np.unique(row * grid + col, return_inverse=True)
+
+        counts = np.bincount(labels)
+        centroid_lat = np.bincount(labels, weights=lat) / counts
+        centroid_lng = np.bincount(labels, weights=lng) / counts
+        # Best-rated member of each cluster: sort by (cluster, -rating), take each cluster's first
+        order = np.lexsort((-rating, labels))
+        first = order[np.searchsorted(labels[order], np.arange(len(cells)))]
+
+        clusters = []
+        for cluster in range(len(cells)):
+            place = source.place(int(ids[first[cluster]]))
+            if place is None:
+                continue  # evicted from the POI index meanwhile; the tile's version has changed
+            clusters.append({
+                "lat": round(float(centroid_lat[cluster]), 6),
+                "lng": round(float(centroid_lng[cluster]), 6),
+                "count": int(counts[cluster]),
+                "attraction": {
+                    "place_id": place.get("place_id"),
+                    "name": place.get("name"),
+                    "type": place.get("type"),
+                    "rating": place.get("rating"),
+                    "location": {"lat": place["lat"], "lng": place["lng"]}
+                }
+            })
+        return clusters
+
+    @staticmethod
+    def _mercator(lat, lng, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Fractional web-mercator tile coordinates"""
+        scale = 2 ** zoom
+        lat = np.radians(np.clip(lat, -85.05112878, 85.05112878))
+        px = (np.asarray(lng, dtype=float) + 180.0) / 360.0 * scale
+        py = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / math.pi) / 2.0 * scale
+        return px, py
+
+    @staticmethod
+    def _tile(lat: float, lng: float, zoom: int) -> Tuple[int, int]:
+        px, py = MapClusters._mercator(np.array([lat]), np.array([lng]), zoom)
+        last = 2 ** zoom - 1
+        return min(max(int(math.floor(px[0])), 0), last), min(max(int(math.floor(py[0])), 0), last)
+
+    @staticmethod
+    def _tile_bounds(zoom: int, x: int, y: int) -> Tuple[float, float, float, float]:
+        """(south, west, north, east) of a tile"""
+        scale = 2 ** zoom
+
+        def latitude(tile_y):
+            return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / scale))))
+
+        return latitude(y + 1), x / scale * 360.0 - 180.0, latitude(y), (x + 1) / scale * 360.0 - 180.0
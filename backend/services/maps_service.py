@@ -1,7 +1,26 @@
 # backend/services/maps_service.py
 import requests
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config import Config
+from utils.geo import haversine_matrix, place_coordinates, travel_minutes
+from utils import geohash, osm_tags
+from utils.helper import fold_text, stable_seed
+from utils.json_stream import JsonArrayStream
+from .destination_catalog import DestinationCatalog
+from .gazetteer import Gazetteer
+from .geocode_cache import GeocodeCache
+from .poi_index import PoiIndex
+from .poi_store import PoiStore
+from .rate_limiter import nominatim_limiter
+from .route_optimizer import RouteOptimizer
+from .tile_cache import TileCache
 
 class MapsService:
     """
@@ -15,6 +34,25 @@ class MapsService:
     NOMINATIM_URL = "https://nominatim.openstreetmap.org"
     # Overpass API endpoint
     OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+    # OSRM routing server (route + table services)
+    OSRM_URL = Config.OSRM_URL
+    # Largest matrix requested from OSRM in one table call
+    OSRM_MAX_TABLE_POINTS = 100
+    # Bump when the Overpass attraction query changes so cached tiles are refetched
+    OVERPASS_TILE_VERSION = 4
+    # Server-side element limit per tile, as a multiple of OVERPASS_TILE_MAX_PLACES
+    # (some elements are dropped as duplicates or outside the tile)
+    OVERPASS_LIMIT_FACTOR = 2
+    # nearby-attractions search radius bounds (metres) and result count
+    MIN_NEARBY_RADIUS = 100
+    MAX_NEARBY_RADIUS = 50000
+    MAX_NEARBY_RESULTS = 8
+
+    # Process-wide LRU in front of the persistent geocode cache:
+    # normalized query -> (expires_at, result or None for "not found")
+    _geocode_cache = OrderedDict()
+    _geocode_cache_lock = threading.Lock()
+    _geocode_stats = {"memory_hits": 0, "cache_hits": 0, "negative_hits": 0, "upstream": 0, "rate_limited": 0}
     
     def __init__(self):
         self.session = requests.Session()
@@ -22,105 +60,39 @@ class MapsService:
             'User-Agent': 'AI-Travel-Buddy/1.0'  # Nominatim requires User-Agent
         })
 
-    def get_nearby_places(self, location: str, radius: int = 5000) -> List[Dict]:
+    def get_nearby_places(self, location: str, radius: int = 5000, limit: Optional[int] = None) -> List[Dict]:
         """
-        Get nearby attractions using Overpass API with fallback to hardcoded database
-        Returns real attractions from OpenStreetMap or hardcoded list
+        Attractions within `radius` metres of a location, nearest first
+
+        Catalog destinations are answered from the in-memory POI index
+        without upstream calls; other places are geocoded and their
+        OpenStreetMap tiles loaded into the index first. Falls back to
+        sample places when nothing is found.
         """
+        limit = limit or self.MAX_NEARBY_RESULTS
+        radius_km = min(max(radius, self.MIN_NEARBY_RADIUS), self.MAX_NEARBY_RADIUS) / 1000
         try:
-            # First, try hardcoded attractions for known cities (faster, more reliable)
-            hardcoded = self._get_hardcoded_attractions(location)
-            if hardcoded:
-                print(f"Using hardcoded attractions for {location}")
-                return hardcoded
-            
-            # If not in hardcoded list, try Overpass API
-            coords = self.geocode(location)
+            # Known destinations: landmarks are already indexed
+            catalog = DestinationCatalog.get()
+            city_id = catalog.resolve(location)
+            if city_id is not None:
+                coords = catalog.city_location(city_id)
+                places = PoiIndex.get().within(coords['lat'], coords['lng'], radius_km, limit)
+                if places:
+                    print(f"Using indexed attractions for {location}")
+                    return [self._format_place(place, location) for place in places]
+            else:
+                coords = self.geocode(location)
             if not coords:
                 print(f"Could not geocode {location}, returning sample places")
                 return self._get_sample_places(location)
 
             lat, lng = coords['lat'], coords['lng']
             print(f"Fetching attractions for {location} at coordinates ({lat}, {lng})")
-            
-            # Try with expanding bbox sizes if first attempt returns no results
-            bbox_sizes = [0.1, 0.15, 0.2, 0.3]  # Progressively larger search areas
-            
-            for bbox_size in bbox_sizes:
-                try:
-                    # Query Overpass API for nearby attractions with expanded search area
-                    overpass_query = f"""
-                    [bbox:{lat-bbox_size},{lng-bbox_size},{lat+bbox_size},{lng+bbox_size}];
-                    (
-                      node["tourism"~"attraction|museum|monument|viewpoint|zoo|landmark"];
-                      node["leisure"="park"];
-                      node["historic"~"monument|castle|ruins"];
-                      node["amenity"~"theatre|cinema|library"];
-                      way["tourism"~"attraction|museum|monument"];
-                      way["leisure"="park"];
-                      way["historic"~"monument|castle|ruins"];
-                    );
-                    out center;
-                    """
-
-                    print(f"Trying Overpass with bbox_size: {bbox_size}")
-                    response = self.session.get(
-                        self.OVERPASS_URL,
-                        params={'data': overpass_query},
-                        timeout=20
-                    )
-
-                    if response.status_code != 200:
-                        print(f"Overpass API error: {response.status_code}")
-                        continue
-
-                    data = response.json()
-                    attractions = []
-
-                    for element in data.get('elements', []):
-                        # Get coordinates
-                        if 'center' in element:
-                            lat_attr = element['center']['lat']
-                            lng_attr = element['center']['lon']
-                        elif 'lat' in element and 'lon' in element:
-                            lat_attr = element['lat']
-                            lng_attr = element['lon']
-                        else:
-                            continue
-
-                        # Get name and tags
-                        tags = element.get('tags', {})
-                        name = tags.get('name', 'Unnamed Attraction')
-                        
-                        # Skip if no proper name or generic names
-                        if not name or name.startswith('Node') or name.startswith('Way'):
-                            continue
-
-                        # Get additional info
-                        attraction_type = tags.get('tourism', tags.get('leisure', tags.get('historic', 'attraction')))
-                        
-                        attractions.append({
-                            'name': name,
-                            'location': {'lat': lat_attr, 'lng': lng_attr},
-                            'rating': float(tags.get('rating', 4.3)),
-                            'address': tags.get('addr:full', f"{name}, {location}"),
-                            'type': attraction_type,
-                            'website': tags.get('website', ''),
-                            'opening_hours': tags.get('opening_hours', '9:00 AM - 6:00 PM'),
-                            'place_id': f"osm_{element.get('id', 'unknown')}"
-                        })
-
-                        if len(attractions) >= 20:  # Get enough results
-                            break
-
-                    # If we got results, return them
-                    if attractions:
-                        print(f"Fetched {len(attractions)} attractions from OpenStreetMap for {location}")
-                        return attractions[:8]  # Return top 8
-
-                except Exception as e:
-                    print(f"Error with bbox_size {bbox_size}: {str(e)}")
-                    continue
+            places = self.places_within(lat, lng, radius, limit)
+            if places:
+                print(f"Found {len(places)} OpenStreetMap attractions near {location}")
+                return [self._format_place(place, location) for place in places]
 
             # If Overpass didn't work, try sample places
             print(f"No Overpass results for {location}, using sample places")
@@ -130,10 +102,263 @@ class MapsService:
             print(f"Error getting nearby places: {str(e)}")
             return self._get_sample_places(location)
 
+    def places_within(self, lat: float, lng: float, radius: int = 5000, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Known attractions within `radius` metres, nearest first
+
+        Places inside the offline POI store's coverage (import_osm.py) are
+        answered from it directly when it has any match. Otherwise the search
+        box is covered with geohash tiles. Tiles not yet in the
+        POI index are read from the tile cache, and only tiles missing there
+        are queried from Overpass, in parallel (OVERPASS_TILE_WORKERS). Tiles
+        that fail to load are skipped. The answer comes from the index, so
+        it also includes catalog landmarks.
+
+        Returns:
+            Place dicts ({"place_id", "name", "lat", "lng", "type", ...})
+            with "distance_km" from the search point
+        """
+        radius_km = min(max(radius, self.MIN_NEARBY_RADIUS), self.MAX_NEARBY_RADIUS) / 1000
+        # Imported OSM extract covering this point: no network needed
+        store = PoiStore.get()
+        if store and store.contains(lat, lng):
+            places = store.within(lat, lng, radius_km, limit)
+            if places:
+                return places
+
+        lat_delta = radius_km / 111.32
+        lng_delta = radius_km / (111.32 * max(np.cos(np.radians(lat)), 0.01))
+        tiles = geohash.covering(lat - lat_delta, lng - lng_delta, lat + lat_delta, lng + lng_delta,
+                                 Config.OVERPASS_TILE_PRECISION)
+
+        index = PoiIndex.get()
+        keys = {tile: f"v{self.OVERPASS_TILE_VERSION}:{tile}" for tile in tiles}
+        unindexed = [tile for tile in tiles if not index.has_tile(keys[tile])]
+        cached = TileCache.get_many([keys[tile] for tile in unindexed])
+        for key, places in cached.items():
+            index.add_tile(key, places)
+        missing = [tile for tile in unindexed if keys[tile] not in cached]
+        print(f"[Overpass] {len(tiles)} tiles: {len(tiles) - len(unindexed)} indexed, "
+              f"{len(cached)} cached, fetching {len(missing)}")
+
+        if missing:
+            workers = max(1, min(Config.OVERPASS_TILE_WORKERS, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for tile, fetched in zip(missing, pool.map(self._fetch_tile, missing)):
+                    if fetched is None:
+                        continue
+                    TileCache.set(keys[tile], fetched)
+                    index.add_tile(keys[tile], fetched)
+
+        return index.within(lat, lng, radius_km, limit)
+
+    def _fetch_tile(self, tile: str) -> Optional[List[Dict]]:
+        """
+        Named attractions inside one geohash tile, or None if Overpass failed
+
+        The query only matches named features and carries a server-side
+        limit; the response is streamed through JsonArrayStream and reading
+        stops once OVERPASS_TILE_MAX_PLACES distinct places are collected, so
+        memory and parse time don't depend on how dense the city is.
+        """
+        south, west, north, east = geohash.bounds(tile)
+        max_places = Config.OVERPASS_TILE_MAX_PLACES
+        overpass_query = f"""
+        [out:json][timeout:{Config.OVERPASS_TIMEOUT}][bbox:{south},{west},{north},{east}];
+        (
+        {osm_tags.overpass_selectors()}
+        );
+        out center {max_places * self.OVERPASS_LIMIT_FACTOR};
+        """
+        places = []
+        seen = set()
+        parser = JsonArrayStream("elements")
+        try:
+            with self.session.get(
+                self.OVERPASS_URL,
+                params={'data': overpass_query},
+                timeout=Config.OVERPASS_TIMEOUT + 5,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    print(f"[Overpass] Tile {tile} failed: HTTP {response.status_code}")
+                    return None
+                response.encoding = response.encoding or "utf-8"
+                for chunk in response.iter_content(chunk_size=16384, decode_unicode=True):
+                    for element in parser.feed(chunk):
+                        place = osm_tags.element_place(element)
+                        # Ways can stick out of the tile; keep each place in the tile holding its center
+                        if not place or not (south <= place["lat"] < north and west <= place["lng"] < east):
+                            continue
+                        # The same landmark is often mapped as both a node and a way
+                        identity = (fold_text(place["name"]), round(place["lat"], 3), round(place["lng"], 3))
+                        if place["place_id"] in seen or identity in seen:
+                            continue
+                        seen.update((place["place_id"], identity))
+                        places.append(place)
+                    if parser.done or len(places) >= max_places:
+                        break
+        except requests.RequestException as e:
+            print(f"[Overpass] Tile {tile} failed: {e}")
+            return None
+        return places[:max_places]
+
+    @staticmethod
+    def _format_place(place: Dict, location: str) -> Dict:
+        """nearby-attractions response format for a cached place"""
+        return {
+            'name': place['name'],
+            'location': {'lat': place['lat'], 'lng': place['lng']},
+            'rating': place['rating'],
+            'address': place['address'] or f"{place['name']}, {location}",
+            'type': place['type'],
+            'website': place['website'],
+            'opening_hours': place['opening_hours'],
+            'place_id': place['place_id'],
+            'distance_km': place['distance_km']
+        }
+
     def geocode(self, address: str) -> Optional[Dict]:
         """
         Geocode an address to coordinates using Nominatim (OpenStreetMap)
+        
+        City-level queries ("Paris", "Hyderabad, India") are answered by the
+        offline gazetteer. Other lookups go through an in-process LRU, then the persistent geocode
+        cache (which also remembers misses). Only the rest reach Nominatim,
+        paced by the host-wide nominatim_limiter; when the limiter can't grant
+        a request within NOMINATIM_MAX_WAIT seconds the lookup fails fast.
+        """
+        key = self._geocode_key(address)
+        if not key:
+            return None
+
+        result = Gazetteer.get().lookup(address)
+        if result:
+            return result
+
+        found, result = self._memo_get(key)
+        if found:
+            self._count_geocode("memory_hits" if result else "negative_hits")
+            return dict(result) if result else None
+
+        found, result = GeocodeCache.get(key)
+        if found:
+            self._count_geocode("cache_hits" if result else "negative_hits")
+            self._memo_set(key, result)
+            return dict(result) if result else None
+
+        if not nominatim_limiter.acquire(timeout=Config.NOMINATIM_MAX_WAIT):
+            print(f"[Nominatim] Rate limit reached, not geocoding {address}")
+            self._count_geocode("rate_limited")
+            return None
+
+        self._count_geocode("upstream")
+        result, definitive = self._geocode_nominatim(address)
+        # Transient failures (HTTP errors, timeouts) are not cached
+        if definitive:
+            GeocodeCache.set(key, address, result)
+            self._memo_set(key, result)
+        return dict(result) if result else None
+
+    @staticmethod
+    def _geocode_key(address: str) -> str:
+        """Normalized query: "Lyon, France" and "lyon  france" share a cache entry"""
+        return " ".join(fold_text(address or "").replace(",", " ").split())
+
+    @classmethod
+    def geocode_stats(cls) -> Dict:
+        with cls._geocode_cache_lock:
+            stats = dict(cls._geocode_stats)
+            stats["memory_entries"] = len(cls._geocode_cache)
+        stats["nominatim_limiter"] = nominatim_limiter.stats()
+        stats["gazetteer"] = Gazetteer.get().stats()
+        return stats
+
+    @classmethod
+    def _memo_get(cls, key: str) -> Tuple[bool, Optional[Dict]]:
+        with cls._geocode_cache_lock:
+            entry = cls._geocode_cache.get(key)
+            if not entry:
+                return False, None
+            expires_at, result = entry
+            if expires_at < time.time():
+                del cls._geocode_cache[key]
+                return False, None
+            cls._geocode_cache.move_to_end(key)
+            return True, result
+
+    @classmethod
+    def _memo_set(cls, key: str, result: Optional[Dict]):
+        ttl = Config.GEOCODE_CACHE_TTL if result else Config.GEOCODE_NEGATIVE_TTL
+        with cls._geocode_cache_lock:
+            cls._geocode_cache[key] = (time.time() + ttl, dict(result) if result else None)
+            cls._geocode_cache.move_to_end(key)
+            while len(cls._geocode_cache) > Config.GEOCODE_CACHE_SIZE:
+                cls._geocode_cache.popitem(last=False)
+
+    @classmethod
+    def _count_geocode(cls, metric: str):
+        with cls._geocode_cache_lock:
+            cls._geocode_stats[metric] += 1
+
+    def geocode_many(self, addresses: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Geocode several addresses concurrently
+
+        Duplicates (after normalization) are looked up once; cached addresses
+        cost nothing. Returns {address: geocode result or None}.
         """
+        unique = {}
+        for address in addresses:
+            unique.setdefault(self._geocode_key(address), address)
+
+        if len(unique) <= 1:
+            results = {key: self.geocode(address) for key, address in unique.items()}
+        else:
+            with ThreadPoolExecutor(max_workers=min(Config.GEOCODE_WORKERS, len(unique))) as executor:
+                futures = {key: executor.submit(self.geocode, address) for key, address in unique.items()}
+                results = {key: future.result() for key, future in futures.items()}
+        return {address: results[self._geocode_key(address)] for address in addresses}
+
+    def resolve_points(self, items: List) -> List[Optional[Dict]]:
+        """
+        Resolve mixed inputs to {"name", "lat", "lng"} (None when not found)
+
+        Items may be dicts with lat/lng (or location {lat, lng}), "lat,lng"
+        strings, or place names / addresses (geocoded concurrently).
+        """
+        places = []
+        queries = []
+        for item in items:
+            place = item if isinstance(item, dict) else {"name": str(item)}
+            coords = place_coordinates(place)
+            if coords is None and not isinstance(item, dict):
+                coords = self._parse_lat_lng(str(item))
+            query = None
+            if coords is None:
+                query = place.get("address") or place.get("name")
+                if query:
+                    queries.append(query)
+            places.append((place, coords, query))
+
+        geocoded = self.geocode_many(queries) if queries else {}
+        resolved = []
+        for index, (place, coords, query) in enumerate(places):
+            if coords is None:
+                result = geocoded.get(query) if query else None
+                if not result:
+                    resolved.append(None)
+                    continue
+                coords = (result["lat"], result["lng"])
+            resolved.append({
+                "name": place.get("name") or place.get("address") or f"{coords[0]:.5f},{coords[1]:.5f}",
+                "lat": coords[0],
+                "lng": coords[1]
+            })
+        return resolved
+
+    def _geocode_nominatim(self, address: str) -> Tuple[Optional[Dict], bool]:
+        """Query Nominatim; returns (result, definitive) - definitive is False on errors"""
         try:
             response = self.session.get(
                 f"{self.NOMINATIM_URL}/search",
@@ -146,22 +371,22 @@ class MapsService:
             )
 
             if response.status_code != 200:
-                return None
+                return None, False
 
             data = response.json()
             if not data:
-                return None
+                return None, True
 
             result = data[0]
             return {
                 'address': result.get('display_name', address),
                 'lat': float(result.get('lat')),
                 'lng': float(result.get('lon'))
-            }
+            }, True
 
         except Exception as e:
             print(f"Error geocoding address: {str(e)}")
-            return None
+            return None, False
 
     def get_distance(self, origin: str, destination: str) -> Optional[Dict]:
         """
@@ -177,8 +402,7 @@ class MapsService:
                 return self._get_sample_distance(origin, destination)
 
             # Use OSRM (Open Source Routing Machine) for routing
-            osrm_url = "https://router.project-osrm.org/route/v1/driving"
-            url = f"{osrm_url}/{origin_coords['lng']},{origin_coords['lat']};{dest_coords['lng']},{dest_coords['lat']}"
+            url = f"{self.OSRM_URL}/route/v1/driving/{origin_coords['lng']},{origin_coords['lat']};{dest_coords['lng']},{dest_coords['lat']}"
 
             response = self.session.get(url, timeout=10)
             if response.status_code != 200:
@@ -190,24 +414,7 @@ class MapsService:
                 distance_m = route.get('distance', 0)
                 duration_s = route.get('duration', 0)
 
-                # Convert to readable format
-                distance_km = distance_m / 1000
-                distance_text = f"{distance_km:.1f} km"
-                
-                minutes = duration_s / 60
-                if minutes > 60:
-                    hours = int(minutes // 60)
-                    mins = int(minutes % 60)
-                    duration_text = f"{hours}h {mins}m"
-                else:
-                    duration_text = f"{int(minutes)} mins"
-
-                return {
-                    'distance': distance_text,
-                    'distance_value': int(distance_m),
-                    'duration': duration_text,
-                    'duration_value': int(duration_s)
-                }
+                return self._format_leg(distance_m, duration_s)
 
             return self._get_sample_distance(origin, destination)
 
@@ -215,6 +422,190 @@ class MapsService:
             print(f"Error calculating distance: {str(e)}")
             return self._get_sample_distance(origin, destination)
 
+    def travel_matrix(self, origins: List[Tuple[float, float]],
+                      destinations: Optional[List[Tuple[float, float]]] = None) -> Dict:
+        """
+        Distance/duration matrix between (lat, lng) points
+
+        One OSRM table request for the whole matrix; if OSRM is unavailable,
+        a vectorized haversine estimate (walking / city transit speeds).
+
+        Returns:
+            {"distances": (n, m) metres, "durations": (n, m) seconds,
+             "source": "osrm" | "haversine"}
+        """
+        table = self._osrm_table(origins, destinations)
+        if table is not None:
+            distances, durations = table
+            return {"distances": distances, "durations": durations, "source": "osrm"}
+
+        distances_km = haversine_matrix(
+            np.array(origins, dtype=float),
+            None if destinations is None else np.array(destinations, dtype=float)
+        )
+        return {
+            "distances": distances_km * 1000,
+            "durations": travel_minutes(distances_km) * 60,
+            "source": "haversine"
+        }
+
+    def optimize_day(self, stops: List, start_index: Optional[int] = None, metric: str = "duration") -> Dict:
+        """
+        Best visiting order for a day's stops
+
+        Args:
+            stops: dicts with lat/lng (or location {lat, lng}) and optional
+                name, or place names / addresses to geocode
+            start_index: stop the day must start at (None = any)
+            metric: "duration" or "distance" to minimise
+
+        Returns:
+            dict with order (input indexes), ordered stops, legs, totals,
+            matrix source and whether the order is provably optimal
+        """
+        resolved = self.resolve_points(stops)
+        for index, (stop, place) in enumerate(zip(stops, resolved)):
+            if place is None:
+                raise ValueError(f"Could not locate stop {index}: {stop}")
+            place["index"] = index
+        points = [(place["lat"], place["lng"]) for place in resolved]
+
+        matrix = self.travel_matrix(points)
+        cost = matrix["distances"] if metric == "distance" else matrix["durations"]
+        order, exact = RouteOptimizer.optimal(cost, start_index)
+
+        legs = []
+        for a, b in zip(order, order[1:]):
+            leg = self._format_leg(matrix["distances"][a, b], matrix["durations"][a, b])
+            leg.update({"from": resolved[a]["name"], "to": resolved[b]["name"]})
+            legs.append(leg)
+        totals = self._format_leg(
+            sum(leg["distance_value"] for leg in legs),
+            sum(leg["duration_value"] for leg in legs)
+        )
+
+        return {
+            "order": order,
+            "stops": [resolved[i] for i in order],
+            "legs": legs,
+            "total_distance": totals["distance"],
+            "total_distance_value": totals["distance_value"],
+            "total_duration": totals["duration"],
+            "total_duration_value": totals["duration_value"],
+            "source": matrix["source"],
+            "optimal": exact
+        }
+
+    def distance_matrix(self, origins: List, destinations: Optional[List] = None) -> Dict:
+        """
+        Distances and durations from every origin to every destination
+
+        All inputs are resolved up front (one concurrent, cached geocoding
+        pass over the unique addresses), then the whole matrix comes from
+        one OSRM table request, or a haversine estimate if OSRM fails.
+        Without destinations the matrix is origins x origins.
+
+        Returns:
+            {"origins", "destinations" (resolved places or None), "rows":
+             [{"elements": [{"status", "distance", "distance_value",
+             "duration", "duration_value"}]}], "source"}
+        """
+        square = destinations is None
+        resolved = self.resolve_points(list(origins) + ([] if square else list(destinations)))
+        resolved_origins = resolved[:len(origins)]
+        resolved_destinations = resolved_origins if square else resolved[len(origins):]
+
+        origin_ids = [i for i, place in enumerate(resolved_origins) if place]
+        destination_ids = [j for j, place in enumerate(resolved_destinations) if place]
+        matrix = None
+        if origin_ids and destination_ids:
+            origin_points = [(resolved_origins[i]["lat"], resolved_origins[i]["lng"]) for i in origin_ids]
+            destination_points = [(resolved_destinations[j]["lat"], resolved_destinations[j]["lng"]) for j in destination_ids]
+            matrix = self.travel_matrix(origin_points, None if square else destination_points)
+
+        origin_row = {i: row for row, i in enumerate(origin_ids)}
+        destination_col = {j: col for col, j in enumerate(destination_ids)}
+        rows = []
+        for i in range(len(resolved_origins)):
+            elements = []
+            for j in range(len(resolved_destinations)):
+                if i not in origin_row or j not in destination_col:
+                    elements.append({"status": "NOT_FOUND"})
+                    continue
+                r, c = origin_row[i], destination_col[j]
+                element = self._format_leg(matrix["distances"][r, c], matrix["durations"][r, c])
+                element["status"] = "OK"
+                elements.append(element)
+            rows.append({"elements": elements})
+
+        return {
+            "origins": resolved_origins,
+            "destinations": resolved_destinations,
+            "rows": rows,
+            "source": matrix["source"] if matrix else None
+        }
+
+    @staticmethod
+    def _parse_lat_lng(text: str) -> Optional[Tuple[float, float]]:
+        """Parse "48.8584,2.2945" style input"""
+        parts = text.split(",")
+        if len(parts) != 2:
+            return None
+        try:
+            return place_coordinates({"lat": parts[0].strip(), "lng": parts[1].strip()})
+        except ValueError:
+            return None
+
+    def _osrm_table(self, origins: List[Tuple[float, float]],
+                    destinations: Optional[List[Tuple[float, float]]] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """One OSRM table call: (distances m, durations s) arrays, or None on any failure"""
+        points = list(origins) + list(destinations or [])
+        if not points or len(points) > self.OSRM_MAX_TABLE_POINTS:
+            return None
+
+        coords = ";".join(f"{lng},{lat}" for lat, lng in points)
+        params = {"annotations": "distance,duration"}
+        if destinations is not None:
+            params["sources"] = ";".join(str(i) for i in range(len(origins)))
+            params["destinations"] = ";".join(str(i) for i in range(len(origins), len(points)))
+        try:
+            response = self.session.get(f"{self.OSRM_URL}/table/v1/driving/{coords}", params=params, timeout=10)
+            if response.status_code != 200:
+                return None
+            data = response.json()
+            if data.get("code") != "Ok":
+                return None
+            # Unreachable pairs come back as null
+            distances = np.array(data["distances"], dtype=float)
+            durations = np.array(data["durations"], dtype=float)
+            if np.isnan(distances).any() or np.isnan(durations).any():
+                return None
+            return distances, durations
+        except Exception as e:
+            print(f"Error fetching OSRM table: {str(e)}")
+            return None
+
+    @staticmethod
+    def _format_leg(distance_m: float, duration_s: float) -> Dict:
+        """Readable distance/duration plus raw values (metres, seconds)"""
+        distance_km = distance_m / 1000
+        distance_text = f"{distance_km:.1f} km"
+        
+        minutes = duration_s / 60
+        if minutes > 60:
+            hours = int(minutes // 60)
+            mins = int(minutes % 60)
+            duration_text = f"{hours}h {mins}m"
+        else:
+            duration_text = f"{int(minutes)} mins"
+
+        return {
+            'distance': distance_text,
+            'distance_value': int(distance_m),
+            'duration': duration_text,
+            'duration_value': int(duration_s)
+        }
+
     def get_place_details(self, place_id: str, fields: Optional[List] = None) -> Dict:
         """
         Get detailed place information
@@ -242,112 +633,8 @@ class MapsService:
         Return a fallback photo URL since OSM doesn't provide photos directly
         Uses Picsum Photos or Wikimedia Commons
         """
-        seed = hash(photo_reference) % 10000 if photo_reference else 1
-        return f"https://picsum.photos/seed/{abs(seed)}/{maxwidth}/{int(maxwidth*0.75)}"
-
-    @staticmethod
-    def _get_hardcoded_attractions(location: str) -> Optional[List[Dict]]:
-        """
-        Return real attractions for known cities
-        Ensures Place Lookup demo shows real places instead of samples
-        """
-        # Map of city names to their famous attractions with coordinates
-        hardcoded_places = {
-            "paris": [
-                {"name": "Eiffel Tower", "lat": 48.8584, "lng": 2.2945, "type": "monument", "rating": 4.7},
-                {"name": "Louvre Museum", "lat": 48.8606, "lng": 2.3352, "type": "museum", "rating": 4.6},
-                {"name": "Notre-Dame", "lat": 48.8530, "lng": 2.3499, "type": "monument", "rating": 4.7},
-                {"name": "Arc de Triomphe", "lat": 48.8738, "lng": 2.2950, "type": "monument", "rating": 4.6},
-                {"name": "Sacré-Cœur", "lat": 48.8867, "lng": 2.3431, "type": "monument", "rating": 4.6},
-                {"name": "Champs-Élysées", "lat": 48.8699, "lng": 2.3073, "type": "landmark", "rating": 4.5},
-                {"name": "Versailles Palace", "lat": 48.8047, "lng": 2.1200, "type": "palace", "rating": 4.7},
-            ],
-            "london": [
-                {"name": "Big Ben", "lat": 51.4975, "lng": -0.1246, "type": "monument", "rating": 4.6},
-                {"name": "Tower of London", "lat": 51.5055, "lng": -0.0754, "type": "attraction", "rating": 4.5},
-                {"name": "Buckingham Palace", "lat": 51.5007, "lng": -0.1415, "type": "palace", "rating": 4.5},
-                {"name": "British Museum", "lat": 51.5194, "lng": -0.1270, "type": "museum", "rating": 4.6},
-                {"name": "Tower Bridge", "lat": 51.5055, "lng": -0.0754, "type": "monument", "rating": 4.6},
-                {"name": "Westminster Abbey", "lat": 51.4954, "lng": -0.1266, "type": "monument", "rating": 4.6},
-                {"name": "London Eye", "lat": 51.5033, "lng": -0.1195, "type": "attraction", "rating": 4.4},
-            ],
-            "tokyo": [
-                {"name": "Senso-ji Temple", "lat": 35.7148, "lng": 139.7967, "type": "temple", "rating": 4.5},
-                {"name": "Tokyo Tower", "lat": 35.6762, "lng": 139.7394, "type": "attraction", "rating": 4.5},
-                {"name": "Shibuya Crossing", "lat": 35.6595, "lng": 139.7004, "type": "landmark", "rating": 4.6},
-                {"name": "Meiji Shrine", "lat": 35.6763, "lng": 139.7000, "type": "shrine", "rating": 4.6},
-                {"name": "Tokyo Skytree", "lat": 35.7100, "lng": 139.8107, "type": "tower", "rating": 4.4},
-                {"name": "Tsukiji Market", "lat": 35.6657, "lng": 139.7726, "type": "market", "rating": 4.5},
-                {"name": "Shinjuku Gyoen", "lat": 35.6857, "lng": 139.7107, "type": "park", "rating": 4.5},
-            ],
-            "new york": [
-                {"name": "Statue of Liberty", "lat": 40.6892, "lng": -74.0445, "type": "monument", "rating": 4.5},
-                {"name": "Empire State Building", "lat": 40.7484, "lng": -73.9857, "type": "building", "rating": 4.5},
-                {"name": "Central Park", "lat": 40.7829, "lng": -73.9654, "type": "park", "rating": 4.5},
-                {"name": "Times Square", "lat": 40.7580, "lng": -73.9855, "type": "landmark", "rating": 4.4},
-                {"name": "Brooklyn Bridge", "lat": 40.7061, "lng": -73.9969, "type": "bridge", "rating": 4.6},
-                {"name": "One World Trade Center", "lat": 40.7127, "lng": -74.0134, "type": "building", "rating": 4.5},
-                {"name": "Metropolitan Museum of Art", "lat": 40.7813, "lng": -73.9740, "type": "museum", "rating": 4.6},
-            ],
-            "hyderabad": [
-                {"name": "Charminar", "lat": 17.3597, "lng": 78.4594, "type": "monument", "rating": 4.4},
-                {"name": "Golconda Fort", "lat": 17.3829, "lng": 78.4156, "type": "fort", "rating": 4.5},
-                {"name": "Hussain Sagar Lake", "lat": 17.3738, "lng": 78.4711, "type": "lake", "rating": 4.3},
-                {"name": "Mecca Masjid", "lat": 17.3609, "lng": 78.4682, "type": "mosque", "rating": 4.2},
-                {"name": "Salar Jung Museum", "lat": 17.3650, "lng": 78.4844, "type": "museum", "rating": 4.4},
-                {"name": "Birla Mandir", "lat": 17.3809, "lng": 78.4711, "type": "temple", "rating": 4.4},
-                {"name": "Nizam's Museum", "lat": 17.3819, "lng": 78.4706, "type": "museum", "rating": 4.3},
-            ],
-            "delhi": [
-                {"name": "Taj Mahal", "lat": 27.1751, "lng": 78.0421, "type": "monument", "rating": 4.7},
-                {"name": "Red Fort", "lat": 28.6562, "lng": 77.2410, "type": "fort", "rating": 4.4},
-                {"name": "India Gate", "lat": 28.6129, "lng": 77.2295, "type": "monument", "rating": 4.4},
-                {"name": "Jama Masjid", "lat": 28.6505, "lng": 77.2308, "type": "mosque", "rating": 4.3},
-                {"name": "Qutub Minar", "lat": 28.5244, "lng": 77.1855, "type": "tower", "rating": 4.4},
-                {"name": "Rashtrapati Bhavan", "lat": 28.5919, "lng": 77.1998, "type": "palace", "rating": 4.3},
-                {"name": "Lal Qila", "lat": 28.6562, "lng": 77.2410, "type": "fort", "rating": 4.4},
-            ],
-            "barcelona": [
-                {"name": "Sagrada Familia", "lat": 41.4036, "lng": 2.1744, "type": "basilica", "rating": 4.6},
-                {"name": "Park Güell", "lat": 41.4145, "lng": 2.1528, "type": "park", "rating": 4.6},
-                {"name": "Gothic Quarter", "lat": 41.3851, "lng": 2.1734, "type": "district", "rating": 4.5},
-                {"name": "Las Ramblas", "lat": 41.3827, "lng": 2.1707, "type": "street", "rating": 4.4},
-                {"name": "Casa Batlló", "lat": 41.3915, "lng": 2.1649, "type": "building", "rating": 4.6},
-                {"name": "Montjuïc", "lat": 41.3674, "lng": 2.1617, "type": "hill", "rating": 4.4},
-                {"name": "Arc de Triomf", "lat": 41.3906, "lng": 2.1859, "type": "monument", "rating": 4.4},
-            ],
-            "rome": [
-                {"name": "Colosseum", "lat": 41.8902, "lng": 12.4923, "type": "monument", "rating": 4.6},
-                {"name": "Roman Forum", "lat": 41.8925, "lng": 12.4853, "type": "landmark", "rating": 4.6},
-                {"name": "Pantheon", "lat": 41.8986, "lng": 12.4769, "type": "monument", "rating": 4.6},
-                {"name": "Vatican Museums", "lat": 41.9063, "lng": 12.4534, "type": "museum", "rating": 4.5},
-                {"name": "Trevi Fountain", "lat": 41.9009, "lng": 12.4833, "type": "monument", "rating": 4.6},
-                {"name": "Sistine Chapel", "lat": 41.9064, "lng": 12.4558, "type": "chapel", "rating": 4.7},
-                {"name": "Spanish Steps", "lat": 41.9058, "lng": 12.4741, "type": "landmark", "rating": 4.5},
-            ]
-        }
-        
-        # Try to match the location
-        location_lower = location.lower().strip()
-        
-        for city_key, attractions in hardcoded_places.items():
-            if city_key in location_lower or location_lower in city_key or location_lower.startswith(city_key[:3]):
-                # Convert to the format expected by nearby-attractions endpoint
-                return [
-                    {
-                        "place_id": f"hardcoded_{i}",
-                        "name": attr["name"],
-                        "location": {"lat": attr["lat"], "lng": attr["lng"]},
-                        "rating": attr["rating"],
-                        "address": f"{attr['name']}, {city_key.title()}",
-                        "type": attr["type"],
-                        "website": "",
-                        "opening_hours": "9:00 AM - 6:00 PM"
-                    }
-                    for i, attr in enumerate(attractions)
-                ]
-        
-        return None
+        seed = stable_seed(photo_reference) if photo_reference else 1
+        return f"https://picsum.photos/seed/{seed}/{maxwidth}/{int(maxwidth*0.75)}"
 
     @staticmethod
     def _get_sample_places(location: str) -> List[Dict]:
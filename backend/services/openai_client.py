@@ -0,0 +1,92 @@
+# backend/services/openai_client.py
+import os
+import threading
+from typing import Dict, Optional
+
+import httpx
+from openai import OpenAI
+
+from config import Config
+
+
+class OpenAIClient:
+    """Process-wide OpenAI client with a pooled, keep-alive HTTP connection.
+
+    The OpenAI client (and its httpx pool) is thread-safe, so one instance
+    serves every request thread. It is rebuilt after a fork (gunicorn
+    workers, worker.py processes) so children never share sockets with the
+    parent. Connection counts come from httpcore trace events, so
+    stats() shows how many requests reused a warm connection.
+    """
+
+    _client = None
+    _pid = None
+    _lock = threading.Lock()
+    _stats = {"requests": 0, "connections_opened": 0, "tls_handshakes": 0, "clients_created": 0}
+    _stats_lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> Optional[OpenAI]:
+        """Shared client, or None when no API key is configured"""
+        if not Config.OPENAI_API_KEY:
+            return None
+        if cls._client is None or cls._pid != os.getpid():
+            with cls._lock:
+                if cls._client is None or cls._pid != os.getpid():
+                    cls._client = cls._build()
+                    cls._pid = os.getpid()
+                    cls._count("clients_created")
+        return cls._client
+
+    @classmethod
+    def stats(cls) -> Dict:
+        with cls._stats_lock:
+            stats = dict(cls._stats)
+        stats["connections_reused"] = max(stats["requests"] - stats["connections_opened"], 0)
+        stats["reuse_ratio"] = round(stats["connections_reused"] / stats["requests"], 4) if stats["requests"] else 0.0
+        stats["pool"] = {
+            "max_connections": Config.OPENAI_POOL_MAX_CONNECTIONS,
+            "max_keepalive_connections": Config.OPENAI_POOL_MAX_KEEPALIVE,
+            "keepalive_expiry": Config.OPENAI_POOL_KEEPALIVE_EXPIRY
+        }
+        return stats
+
+    @classmethod
+    def _build(cls) -> OpenAI:
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=Config.OPENAI_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.OPENAI_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=Config.OPENAI_POOL_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(Config.OPENAI_TIMEOUT, connect=Config.OPENAI_CONNECT_TIMEOUT),
+            event_hooks={"request": [cls._trace_request]}
+        )
+        print(f"[OpenAI] Created pooled client (pid {os.getpid()}, "
+              f"max {Config.OPENAI_POOL_MAX_CONNECTIONS} connections)")
+        # The SDK retries connection errors, 408/409/429 and 5xx with exponential backoff
+        return OpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            base_url=Config.OPENAI_BASE_URL,
+            max_retries=Config.OPENAI_MAX_RETRIES,
+            timeout=httpx.Timeout(Config.OPENAI_TIMEOUT, connect=Config.OPENAI_CONNECT_TIMEOUT),
+            http_client=http_client
+        )
+
+    @classmethod
+    def _trace_request(cls, request: httpx.Request):
+        cls._count("requests")
+        request.extensions["trace"] = cls._on_trace
+
+    @classmethod
+    def _on_trace(cls, event_name: str, info: Dict):
+        # Only fired when the pool has no idle connection to hand out
+        if event_name == "connection.connect_tcp.complete":
+            cls._count("connections_opened")
+        elif event_name == "connection.start_tls.complete":
+            cls._count("tls_handshakes")
+
+    @classmethod
+    def _count(cls, metric: str, amount: int = 1):
+        with cls._stats_lock:
+            cls._stats[metric] += amount
@@ -0,0 +1,289 @@
+# backend/services/poi_index.py
+import math
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import Config
+from utils.geo import haversine_matrix
+from .destination_catalog import DestinationCatalog
+
+KM_PER_DEGREE = 111.32
+
+
+class PoiIndex:
+    """In-memory grid index over every POI the service knows.
+
+    Holds the catalog landmarks plus the Overpass tiles loaded by
+    MapsService (fetched or read from the tile cache). Coordinates live in
+    flat arrays; a uniform lat/lng grid maps each cell to the POIs inside
+    it, so radius and k-nearest queries only compute exact (haversine)
+    distances for the handful of cells around the query point.
+
+    Catalog landmarks stay for good. Tiles are kept in LRU order and the least
+    recently used ones are dropped once the index holds more than
+    POI_INDEX_MAX_PLACES places; the arrays are then compacted. Places are
+    identified by a slot number that is never reused, so ids returned by
+    in_bbox() stay valid (or resolve to None) across compactions.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    # Grid cell size in degrees (~2.2 km north-south)
+    CELL_DEGREES = 0.02
+    # Change tracking for version(): coarse cells, at most 180 x 360 of them
+    VERSION_DEGREES = 1.0
+    # Eviction drops tiles until the index is back under this share of the cap
+    EVICT_TO = 0.9
+
+    def __init__(self, max_places: int = None):
+        self.max_places = Config.POI_INDEX_MAX_PLACES if max_places is None else max_places
+        self.lat = array("d")
+        self.lng = array("d")
+        self.rating = array("f")
+        self.slot = array("q")      # position -> slot
+        self._places = {}           # slot -> place dict
+        self._ids = {}              # place_id -> slot
+        self._owners = {}           # slot -> number of tiles holding it (catalog places: none, pinned)
+        self._cells = {}            # (row, col) -> list of positions
+        self._tiles = OrderedDict() # tile key -> slots, least recently used first
+        self._next_slot = 0
+        self._generation = 0
+        self._cell_versions = {}    # coarse (row, col) -> generation of its last change
+        self._evictions = 0
+        self._rw_lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "PoiIndex":
+        """Process-wide index, seeded with the catalog attractions on first use"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    index = cls()
+                    index.add_catalog(DestinationCatalog.get())
+                    cls._instance = index
+        return cls._instance
+
+    def __len__(self):
+        return len(self._places)
+
+    def add_catalog(self, catalog: DestinationCatalog):
+        places = []
+        for city_id in range(len(catalog)):
+            city_name = catalog.city_name(city_id)
+            for i, attr in enumerate(catalog.attractions(city_id)):
+                places.append({
+                    "place_id": f"catalog_{city_id}_{i}",
+                    "name": attr["name"],
+                    "lat": attr["lat"],
+                    "lng": attr["lng"],
+                    "rating": attr["rating"],
+                    "address": f"{attr['name']}, {city_name}",
+                    "type": attr["type"],
+                    "website": "",
+                    "opening_hours": "9:00 AM - 6:00 PM"
+                })
+        self.add(places)
+
+    def add(self, places: List[Dict]) -> int:
+        """Index place dicts (place_id, lat, lng, ...) for good; returns how many were new"""
+        with self._rw_lock:
+            _, added = self._add(places, pinned=True)
+        return added
+
+    def has_tile(self, key: str) -> bool:
+        """Whether a tile is loaded (and mark it recently used)"""
+        with self._rw_lock:
+            if key not in self._tiles:
+                return False
+            self._tiles.move_to_end(key)
+            return True
+
+    def add_tile(self, key: str, places: List[Dict]):
+        """Index an Overpass tile, evicting least recently used tiles over the cap"""
+        with self._rw_lock:
+            if key in self._tiles:
+                self._tiles.move_to_end(key)
+                return
+            slots, _ = self._add(places, pinned=False)
+            for slot in slots:
+                if slot in self._owners:
+                    self._owners[slot] += 1
+            self._tiles[key] = slots
+            if len(self._places) > self.max_places:
+                self._evict()
+
+    def version(self, south: float, west: float, north: float, east: float) -> int:
+        """Counter that changes whenever places inside a bounding box are added or dropped"""
+        row_min, col_min = self._version_cell(south, west)
+        row_max, col_max = self._version_cell(north, east)
+        with self._rw_lock:
+            if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self._cell_versions):
+                versions = [version for (row, col), version in self._cell_versions.items()
+                            if row_min <= row <= row_max and col_min <= col <= col_max]
+            else:
+                versions = [self._cell_versions.get((row, col), 0)
+                            for row in range(row_min, row_max + 1) for col in range(col_min, col_max + 1)]
+        return max(versions, default=0)
+
+    def within(self, lat: float, lng: float, radius_km: float, limit: Optional[int] = None) -> List[Dict]:
+        """
+        POIs within `radius_km` of a point, nearest first
+
+        Returns:
+            Place dicts with an added "distance_km"
+        """
+        return self._ranked(lat, lng, radius_km, limit)
+
+    def nearest(self, lat: float, lng: float, k: int, max_km: float = 50.0) -> List[Dict]:
+        """The `k` POIs closest to a point (no further than `max_km`), nearest first"""
+        if k <= 0:
+            return []
+        # Grow the searched square until it holds k POIs closer than its inner radius
+        radius_km = self.CELL_DEGREES * KM_PER_DEGREE / 2
+        while True:
+            radius_km = min(radius_km * 2, max_km)
+            ranked = self._ranked(lat, lng, radius_km, k)
+            if len(ranked) >= k or radius_km >= max_km:
+                return ranked
+
+    def in_bbox(self, south: float, west: float, north: float, east: float):
+        """POIs inside a bounding box as (ids, lat, lng, rating) arrays; see place()"""
+        with self._rw_lock:
+            candidates = np.array(self._cells_between(south, west, north, east), dtype=np.int64)
+            if not len(candidates):
+                empty = np.empty(0)
+                return candidates, empty, empty, empty
+            lat = np.frombuffer(self.lat)[candidates]
+            lng = np.frombuffer(self.lng)[candidates]
+            rating = np.frombuffer(self.rating, dtype=np.float32)[candidates].astype(float)
+            ids = np.frombuffer(self.slot, dtype=np.int64)[candidates]
+        inside = (lat >= south) & (lat <= north) & (lng >= west) & (lng <= east)
+        return ids[inside], lat[inside], lng[inside], rating[inside]
+
+    def place(self, slot: int) -> Optional[Dict]:
+        """Place dict of an in_bbox() id, or None if its tile has been evicted since"""
+        return self._places.get(slot)
+
+    def stats(self) -> Dict:
+        with self._rw_lock:
+            return {
+                "places": len(self._places),
+                "max_places": self.max_places,
+                "cells": len(self._cells),
+                "tiles": len(self._tiles),
+                "evictions": self._evictions
+            }
+
+    def _add(self, places: List[Dict], pinned: bool):
+        """Append new places; returns (slots of all given places, number added). Lock held"""
+        slots = []
+        added = 0
+        changed = set()
+        for place in places:
+            place_id = place.get("place_id")
+            slot = self._ids.get(place_id)
+            if slot is not None:
+                if pinned:
+                    self._owners.pop(slot, None)
+                slots.append(slot)
+                continue
+            slot = self._next_slot
+            self._next_slot += 1
+            self._ids[place_id] = slot
+            self._places[slot] = place
+            if not pinned:
+                self._owners[slot] = 0
+            position = len(self.slot)
+            self.lat.append(float(place["lat"]))
+            self.lng.append(float(place["lng"]))
+            self.rating.append(float(place.get("rating") or 0.0))
+            self.slot.append(slot)
+            self._cells.setdefault(self._cell(place["lat"], place["lng"]), []).append(position)
+            changed.add(self._version_cell(place["lat"], place["lng"]))
+            slots.append(slot)
+            added += 1
+        self._touch(changed)
+        return slots, added
+
+    def _evict(self):
+        """Drop least recently used tiles down to EVICT_TO of the cap, then compact. Lock held"""
+        target = int(self.max_places * self.EVICT_TO)
+        changed = set()
+        while len(self._places) > target and self._tiles:
+            _, slots = self._tiles.popitem(last=False)
+            self._evictions += 1
+            for slot in slots:
+                if slot not in self._owners:
+                    continue  # pinned
+                self._owners[slot] -= 1
+                if self._owners[slot] == 0:
+                    del self._owners[slot]
+                    place = self._places.pop(slot)
+                    del self._ids[place.get("place_id")]
+                    changed.add(self._version_cell(place["lat"], place["lng"]))
+        self._touch(changed)
+
+        # Compact: fresh arrays, so no numpy view of the old ones is affected
+        keep = [position for position, slot in enumerate(self.slot) if slot in self._places]
+        self.lat = array("d", (self.lat[position] for position in keep))
+        self.lng = array("d", (self.lng[position] for position in keep))
+        self.rating = array("f", (self.rating[position] for position in keep))
+        self.slot = array("q", (self.slot[position] for position in keep))
+        self._cells = {}
+        for position in range(len(self.slot)):
+            self._cells.setdefault(self._cell(self.lat[position], self.lng[position]), []).append(position)
+
+    def _touch(self, version_cells):
+        if not version_cells:
+            return
+        self._generation += 1
+        for cell in version_cells:
+            self._cell_versions[cell] = self._generation
+
+    def _cell(self, lat: float, lng: float):
+        return int(math.floor(lat / self.CELL_DEGREES)), int(math.floor(lng / self.CELL_DEGREES))
+
+    def _version_cell(self, lat: float, lng: float):
+        return int(math.floor(lat / self.VERSION_DEGREES)), int(math.floor(lng / self.VERSION_DEGREES))
+
+    def _cells_between(self, south: float, west: float, north: float, east: float) -> List[int]:
+        """Positions of POIs in the grid cells overlapping a bounding box. Lock held"""
+        row_min, col_min = self._cell(south, west)
+        row_max, col_max = self._cell(north, east)
+        candidates = []
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self._cells):
+            # Huge query area: scanning the occupied cells is cheaper
+            for (row, col), members in self._cells.items():
+                if row_min <= row <= row_max and col_min <= col <= col_max:
+                    candidates.extend(members)
+        else:
+            for row in range(row_min, row_max + 1):
+                for col in range(col_min, col_max + 1):
+                    candidates.extend(self._cells.get((row, col), ()))
+        return candidates
+
+    def _ranked(self, lat: float, lng: float, radius_km: float, limit: Optional[int]) -> List[Dict]:
+        """POIs in the cells overlapping the query circle's bounding box, nearest first"""
+        lat_delta = radius_km / KM_PER_DEGREE
+        lng_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(min(abs(lat) + lat_delta, 89.9))), 0.01))
+        with self._rw_lock:
+            candidates = self._cells_between(lat - lat_delta, lng - lng_delta, lat + lat_delta, lng + lng_delta)
+            if not candidates:
+                return []
+            candidates = np.array(candidates, dtype=np.int64)
+            # Copies out of the arrays, so no buffer export outlives the lock
+            points = np.column_stack((np.frombuffer(self.lat)[candidates], np.frombuffer(self.lng)[candidates]))
+            places = [self._places[self.slot[int(position)]] for position in candidates]
+        distances = haversine_matrix(np.array([[lat, lng]]), points)[0]
+        order = np.argsort(distances, kind="stable")
+        results = []
+        for position in order:
+            if distances[position] > radius_km or (limit is not None and len(results) >= limit):
+                break
+            results.append(dict(places[position], distance_km=round(float(distances[position]), 2)))
+        return results
@@ -0,0 +1,337 @@
+# backend/services/poi_store.py
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import Config
+from utils import osm_tags
+from utils.geo import haversine_matrix
+
+MAGIC = b"TBPOI\x00\x01\x00"
+KM_PER_DEGREE = 111.32
+# Cell keys: row and column shifted to non-negative, one row per KEY_STRIDE
+KEY_OFFSET = 1 << 20
+KEY_STRIDE = 1 << 21
+# Separator between the text fields of a record
+FIELD_SEPARATOR = "\x1f"
+TEXT_FIELDS = ("name", "address", "website", "opening_hours")
+
+
+def _cell_key(row, col):
+    """Sort key of a grid cell (ints or numpy arrays)"""
+    return (row + KEY_OFFSET) * KEY_STRIDE + (col + KEY_OFFSET)
+
+
+class PoiStore:
+    """Read-only POI file built by import_osm.py, memory-mapped.
+
+    Records are sorted by grid cell; a sorted array of cell keys with start
+    offsets is the spatial index. Coordinates, ratings, types and OSM ids
+    are fixed-width columns and the text fields sit in one UTF-8 blob, so
+    the whole file is used in place through numpy views on the mmap. Every
+    gunicorn worker maps the same pages from the OS page cache instead of
+    holding its own copy.
+
+    Coverage is the set of coarse grid cells (coverage_degrees, ~5 km) that
+    hold at least one imported POI, so a neighbouring country inside the
+    extract's bounding box is not mistaken for an area without attractions.
+
+    Layout: MAGIC, uint32 header length, JSON header (counts, bounds, type
+    names, section offsets), then 8-byte aligned sections.
+    """
+
+    _instance = None
+    _loaded = False
+    _lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a POI store")
+        (header_length,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mmap[start:start + header_length].decode("utf-8"))
+        self.count = self.header["count"]
+        self.cell_degrees = self.header["cell_degrees"]
+        self.bounds = self.header["bounds"]
+        self.types = self.header["types"]
+
+        sections = {}
+        for name, (offset, dtype, length) in self.header["sections"].items():
+            sections[name] = np.frombuffer(self._mmap, dtype=dtype, count=length, offset=offset)
+        self.cell_keys = sections["cell_keys"]
+        self.cell_start = sections["cell_start"]
+        self.lat = sections["lat"]
+        self.lng = sections["lng"]
+        self.rating = sections["rating"]
+        self.type = sections["type"]
+        self.osm_id = sections["osm_id"]
+        # Stores written before element kinds were recorded have bare "osm_<id>" place ids
+        self.osm_type = sections.get("osm_type")
+        self.text_offsets = sections["text_offsets"]
+        self.text = sections["text"]
+        # Stores written before coverage was recorded fall back to the bounding box
+        self.coverage_degrees = self.header.get("coverage_degrees")
+        self.coverage_keys = sections.get("coverage_keys")
+
+    @classmethod
+    def get(cls) -> Optional["PoiStore"]:
+        """Process-wide store from Config.POI_STORE_PATH, or None when there is no usable file"""
+        if not cls._loaded:
+            with cls._lock:
+                if not cls._loaded:
+                    cls._instance = cls.open(Config.POI_STORE_PATH)
+                    cls._loaded = True
+        return cls._instance
+
+    @classmethod
+    def open(cls, path: str) -> Optional["PoiStore"]:
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            store = cls(path)
+            print(f"Mapped POI store {path}: {store.count} places")
+            return store
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not open POI store {path}: {e}")
+            return None
+
+    def __len__(self):
+        return self.count
+
+    def contains(self, lat: float, lng: float) -> bool:
+        """Whether a point lies in a coverage cell of the imported extract"""
+        return bool(self.covers(np.array([lat]), np.array([lng]))[0])
+
+    def covers(self, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+        """contains() for arrays of points, as a boolean mask"""
+        lat = np.asarray(lat, dtype=float)
+        lng = np.asarray(lng, dtype=float)
+        if self.coverage_keys is None:
+            south, west, north, east = self.bounds
+            return (lat >= south) & (lat <= north) & (lng >= west) & (lng <= east)
+        # Not pre-filtered by the bounds: they are float32, so a POI's own float64
+        # location can fall a hair outside them
+        if not len(self.coverage_keys):
+            return np.zeros(lat.shape, dtype=bool)
+        keys = _cell_key(np.floor(lat / self.coverage_degrees).astype(np.int64),
+                         np.floor(lng / self.coverage_degrees).astype(np.int64))
+        positions = np.minimum(np.searchsorted(self.coverage_keys, keys), len(self.coverage_keys) - 1)
+        return self.coverage_keys[positions] == keys
+
+    def within(self, lat: float, lng: float, radius_km: float, limit: Optional[int] = None) -> List[Dict]:
+        """POIs within `radius_km` of a point, nearest first, with "distance_km\""""
+        return self._ranked(lat, lng, self._candidates(lat, lng, radius_km), radius_km, limit)
+
+    def nearest(self, lat: float, lng: float, k: int, max_km: float = 50.0) -> List[Dict]:
+        """The `k` POIs closest to a point (no further than `max_km`), nearest first"""
+        if k <= 0:
+            return []
+        radius_km = self.cell_degrees * KM_PER_DEGREE / 2
+        while True:
+            radius_km = min(radius_km * 2, max_km)
+            candidates = self._candidates(lat, lng, radius_km)
+            if len(candidates) >= k or radius_km >= max_km:
+                ranked = self._ranked(lat, lng, candidates, radius_km, k)
+                if len(ranked) >= k or radius_km >= max_km:
+                    return ranked
+
+    def in_bbox(self, south: float, west: float, north: float, east: float):
+        """Records inside a bounding box as (indexes, lat, lng, rating) arrays; see place()"""
+        candidates = self._cells_between(south, west, north, east)
+        lat = self.lat[candidates].astype(float)
+        lng = self.lng[candidates].astype(float)
+        inside = (lat >= south) & (lat <= north) & (lng >= west) & (lng <= east)
+        return candidates[inside], lat[inside], lng[inside], self.rating[candidates][inside].astype(float)
+
+    def place(self, index: int) -> Dict:
+        start, end = int(self.text_offsets[index]), int(self.text_offsets[index + 1])
+        fields = dict(zip(TEXT_FIELDS, self.text[start:end].tobytes().decode("utf-8").split(FIELD_SEPARATOR)))
+        osm_id = int(self.osm_id[index])
+        if self.osm_type is not None:
+            place_id = osm_tags.place_id(osm_tags.OSM_TYPES[int(self.osm_type[index])], osm_id)
+        else:
+            place_id = f"osm_{osm_id}"
+        return {
+            "place_id": place_id,
+            "name": fields["name"],
+            "lat": round(float(self.lat[index]), 6),
+            "lng": round(float(self.lng[index]), 6),
+            "rating": round(float(self.rating[index]), 1),
+            "address": fields["address"],
+            "type": self.types[int(self.type[index])],
+            "website": fields["website"],
+            "opening_hours": fields["opening_hours"]
+        }
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "places": self.count,
+            "cells": len(self.cell_keys),
+            "coverage_cells": len(self.coverage_keys) if self.coverage_keys is not None else None,
+            "bytes": len(self._mmap),
+            "bounds": self.bounds,
+            "created_at": self.header.get("created_at")
+        }
+
+    def _cell(self, lat: float, lng: float):
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lng / self.cell_degrees))
+
+    def _candidates(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Record indexes in the cells overlapping the query circle's bounding box"""
+        lat_delta = radius_km / KM_PER_DEGREE
+        lng_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(min(abs(lat) + lat_delta, 89.9))), 0.01))
+        return self._cells_between(lat - lat_delta, lng - lng_delta, lat + lat_delta, lng + lng_delta)
+
+    def _cells_between(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """Record indexes in the grid cells overlapping a bounding box"""
+        row_min, col_min = self._cell(south, west)
+        row_max, col_max = self._cell(north, east)
+        # Cells of one row are contiguous in key order, so each row is one slice
+        rows = np.arange(row_min, row_max + 1, dtype=np.int64)
+        first = np.searchsorted(self.cell_keys, _cell_key(rows, col_min), "left")
+        last = np.searchsorted(self.cell_keys, _cell_key(rows, col_max), "right")
+        ranges = [(int(self.cell_start[a]), int(self.cell_start[b])) for a, b in zip(first, last) if a < b]
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(a, b, dtype=np.int64) for a, b in ranges])
+
+    def _ranked(self, lat: float, lng: float, candidates: np.ndarray, radius_km: float,
+                limit: Optional[int]) -> List[Dict]:
+        if not len(candidates):
+            return []
+        points = np.column_stack((self.lat[candidates], self.lng[candidates])).astype(float)
+        distances = haversine_matrix(np.array([[lat, lng]]), points)[0]
+        order = np.argsort(distances, kind="stable")
+        results = []
+        for position in order:
+            if distances[position] > radius_km or (limit is not None and len(results) >= limit):
+                break
+            results.append(dict(self.place(int(candidates[position])),
+                                distance_km=round(float(distances[position]), 2)))
+        return results
+
+
+class PoiStoreWriter:
+    """Collects places (import_osm.py) and writes them as a PoiStore file"""
+
+    def __init__(self, cell_degrees: float = 0.02, coverage_degrees: float = 0.05):
+        self.cell_degrees = cell_degrees
+        self.coverage_degrees = coverage_degrees
+        self.lat = array("f")
+        self.lng = array("f")
+        self.rating = array("f")
+        self.type = array("H")
+        self.osm_id = array("q")
+        self.osm_type = array("B")
+        self.texts = []
+        self.types = []
+        self._type_ids = {}
+        self._seen = set()
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, place: Dict) -> bool:
+        """Add a place dict (osm_tags.attraction_place format); False for duplicates and non-OSM ids"""
+        element = osm_tags.parse_place_id(place.get("place_id"))
+        if element is None or element in self._seen:
+            return False
+        self._seen.add(element)
+        osm_type, osm_id = element
+        place_type = place.get("type") or "attraction"
+        if place_type not in self._type_ids:
+            self._type_ids[place_type] = len(self.types)
+            self.types.append(place_type)
+        self.lat.append(float(place["lat"]))
+        self.lng.append(float(place["lng"]))
+        self.rating.append(float(place.get("rating", 0.0)))
+        self.type.append(self._type_ids[place_type])
+        self.osm_id.append(osm_id)
+        self.osm_type.append(osm_tags.OSM_TYPES.index(osm_type))
+        self.texts.append(FIELD_SEPARATOR.join(
+            str(place.get(field) or "").replace(FIELD_SEPARATOR, " ") for field in TEXT_FIELDS
+        ).encode("utf-8"))
+        return True
+
+    def save(self, path: str, source: str = ""):
+        """Write the store atomically (running workers keep their old mapping until restarted)"""
+        lat = np.array(self.lat, dtype=np.float32)
+        lng = np.array(self.lng, dtype=np.float32)
+        rows = np.floor(lat.astype(float) / self.cell_degrees).astype(np.int64)
+        cols = np.floor(lng.astype(float) / self.cell_degrees).astype(np.int64)
+        keys = _cell_key(rows, cols)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        cell_keys, cell_first = np.unique(keys, return_index=True)
+        cell_start = np.append(cell_first, len(keys)).astype(np.uint32)
+
+        coverage_keys = np.unique(_cell_key(
+            np.floor(lat.astype(float) / self.coverage_degrees).astype(np.int64),
+            np.floor(lng.astype(float) / self.coverage_degrees).astype(np.int64)
+        ))
+
+        texts = [self.texts[i] for i in order]
+        text_offsets = np.zeros(len(texts) + 1, dtype=np.uint32)
+        np.cumsum([len(text) for text in texts], out=text_offsets[1:])
+
+        columns = {
+            "cell_keys": cell_keys.astype(np.int64),
+            "cell_start": cell_start,
+            "lat": lat[order],
+            "lng": lng[order],
+            "rating": np.array(self.rating, dtype=np.float32)[order],
+            "type": np.array(self.type, dtype=np.uint16)[order],
+            "osm_id": np.array(self.osm_id, dtype=np.int64)[order],
+            "osm_type": np.array(self.osm_type, dtype=np.uint8)[order],
+            "text_offsets": text_offsets,
+            "text": np.frombuffer(b"".join(texts), dtype=np.uint8),
+            "coverage_keys": coverage_keys.astype(np.int64)
+        }
+        bounds = [float(lat.min()), float(lng.min()), float(lat.max()), float(lng.max())] if len(self) else [0, 0, 0, 0]
+        header = {
+            "version": 3,
+            "count": len(self),
+            "cell_degrees": self.cell_degrees,
+            "coverage_degrees": self.coverage_degrees,
+            "bounds": bounds,
+            "types": self.types,
+            "source": source,
+            "created_at": datetime.utcnow().isoformat()
+        }
+
+        # Section offsets depend on the header length, which depends on the offsets: reserve room
+        sections = {}
+        header_bytes = b""
+        for _ in range(3):
+            offset = self._align(len(MAGIC) + 4 + len(header_bytes) + 64)
+            sections = {}
+            for name, column in columns.items():
+                sections[name] = [offset, column.dtype.str, len(column)]
+                offset = self._align(offset + column.nbytes)
+            header_bytes = json.dumps(dict(header, sections=sections)).encode("utf-8")
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            for name, column in columns.items():
+                f.write(b"\x00" * (sections[name][0] - f.tell()))
+                f.write(column.tobytes())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + 7) // 8 * 8
@@ -0,0 +1,116 @@
+# backend/services/rate_limiter.py
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict
+
+from config import Config
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: limit per process only
+    FCNTL_AVAILABLE = False
+
+# Bucket state on disk: tokens, last refill time
+_STATE = struct.Struct("dd")
+
+
+class TokenBucket:
+    """Token bucket shared by every process on the host.
+
+    The bucket state lives in a small file under RATE_LIMIT_DIR, updated under
+    an exclusive flock, so all gunicorn workers and worker.py processes draw
+    from the same budget (e.g. Nominatim's 1 request/second). Without fcntl
+    the bucket falls back to a per-process, thread-safe one.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float = 1.0, state_dir: str = None):
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._path = os.path.join(state_dir or Config.RATE_LIMIT_DIR or tempfile.gettempdir(),
+                                  f"travelbuddy-{name}.bucket")
+        self._stats = {"acquired": 0, "waited": 0, "rejected": 0}
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """
+        Take one token, waiting up to `timeout` seconds for it
+
+        Returns False (without waiting) when the next token would arrive after
+        the timeout, so callers can fail fast instead of piling up.
+        """
+        deadline = time.time() + max(timeout, 0.0)
+        waited = False
+        while True:
+            wait = self._try_take()
+            if wait <= 0:
+                self._count("acquired")
+                if waited:
+                    self._count("waited")
+                return True
+            if time.time() + wait > deadline:
+                self._count("rejected")
+                return False
+            waited = True
+            time.sleep(wait)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "shared": FCNTL_AVAILABLE
+        })
+        return stats
+
+    def _try_take(self) -> float:
+        """Consume a token if available; otherwise return seconds until one is"""
+        with self._lock:
+            if not FCNTL_AVAILABLE:
+                self._tokens, self._updated, wait = self._take(self._tokens, self._updated)
+                return wait
+            try:
+                return self._take_shared()
+            except OSError as e:
+                print(f"[RateLimiter] Shared bucket {self._path} unavailable, using per-process bucket: {e}")
+                self._tokens, self._updated, wait = self._take(self._tokens, self._updated)
+                return wait
+
+    def _take_shared(self) -> float:
+        with open(self._path, "a+b") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read(_STATE.size)
+                tokens, updated = _STATE.unpack(raw) if len(raw) == _STATE.size else (self.capacity, time.time())
+                tokens, updated, wait = self._take(tokens, updated)
+                f.seek(0)
+                f.truncate()
+                f.write(_STATE.pack(tokens, updated))
+                f.flush()
+                return wait
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _take(self, tokens: float, updated: float):
+        """Refill for the elapsed time and try to consume; returns (tokens, updated, wait)"""
+        now = time.time()
+        tokens = min(self.capacity, tokens + max(now - updated, 0.0) * self.rate)
+        if tokens >= 1.0:
+            return tokens - 1.0, now, 0.0
+        return tokens, now, (1.0 - tokens) / self.rate
+
+    def _count(self, metric: str):
+        with self._lock:
+            self._stats[metric] += 1
+
+
+# Nominatim usage policy: at most 1 request per second per application
+nominatim_limiter = TokenBucket("nominatim", rate=Config.NOMINATIM_RATE, capacity=Config.NOMINATIM_BURST)
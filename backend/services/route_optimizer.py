@@ -0,0 +1,155 @@
+# backend/services/route_optimizer.py
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class RouteOptimizer:
+    """Visiting order for a set of stops given a distance (or duration) matrix.
+
+    Routes are open paths: they start at `start` and end wherever is
+    cheapest. Small inputs are solved exactly (Held-Karp); larger ones are
+    built with nearest neighbour and improved with 2-opt, each 2-opt pass
+    evaluating all reversals for a segment start in one NumPy operation.
+    """
+
+    MAX_TWO_OPT_PASSES = 50
+    # Held-Karp is exact but O(2^n * n^2): use it up to this many stops
+    EXACT_MAX_STOPS = 12
+    # Without a fixed start, try every stop as the start up to this many stops
+    MAX_FREE_STARTS = 16
+
+    @staticmethod
+    def solve(matrix: np.ndarray, start: Optional[int] = 0) -> List[int]:
+        """
+        Heuristic shortest open path through every stop
+
+        Args:
+            matrix: (n, n) distances or durations
+            start: index of the first stop, or None to pick the best start
+
+        Returns:
+            List of stop indexes in visiting order
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        n = len(matrix)
+        if n == 0:
+            return []
+        if start is None:
+            if n > RouteOptimizer.MAX_FREE_STARTS:
+                start = RouteOptimizer.central_stop(matrix)
+            else:
+                routes = [RouteOptimizer.solve(matrix, candidate) for candidate in range(n)]
+                return min(routes, key=lambda route: RouteOptimizer.route_length(matrix, route))
+        if n <= 2:
+            return [start] + [i for i in range(n) if i != start]
+        order = RouteOptimizer.nearest_neighbor(matrix, start)
+        return RouteOptimizer.two_opt(matrix, order)
+
+    @staticmethod
+    def optimal(matrix: np.ndarray, start: Optional[int] = 0) -> Tuple[List[int], bool]:
+        """Exact order for small inputs, heuristic beyond EXACT_MAX_STOPS; returns (order, exact)"""
+        matrix = np.asarray(matrix, dtype=float)
+        if len(matrix) <= RouteOptimizer.EXACT_MAX_STOPS:
+            return RouteOptimizer.held_karp(matrix, start), True
+        return RouteOptimizer.solve(matrix, start), False
+
+    @staticmethod
+    def held_karp(matrix: np.ndarray, start: Optional[int] = 0) -> List[int]:
+        """
+        Exact shortest open path (dynamic programming over visited subsets)
+
+        cost[mask, j] is the cheapest path visiting exactly the stops in mask
+        and ending at j; each mask relaxes all (i, j) extensions in one NumPy
+        operation. Works for asymmetric matrices (e.g. OSRM durations).
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        n = len(matrix)
+        if n <= 1:
+            return list(range(n))
+
+        full = 1 << n
+        cost = np.full((full, n), np.inf)
+        parent = np.full((full, n), -1, dtype=np.int64)
+        for i in ([start] if start is not None else range(n)):
+            cost[1 << i, i] = 0.0
+
+        bits = 1 << np.arange(n)
+        for mask in range(1, full):
+            current = cost[mask]
+            if not np.isfinite(current).any():
+                continue
+            # Best predecessor i for every next stop j
+            extended = current[:, None] + matrix
+            best_from = np.argmin(extended, axis=0)
+            best_cost = extended[best_from, np.arange(n)]
+            for j in np.flatnonzero((mask & bits) == 0):
+                next_mask = mask | (1 << int(j))
+                if best_cost[j] < cost[next_mask, j]:
+                    cost[next_mask, j] = best_cost[j]
+                    parent[next_mask, j] = best_from[j]
+
+        # Walk back from the cheapest final stop
+        last = int(np.argmin(cost[full - 1]))
+        mask = full - 1
+        order = []
+        while last != -1:
+            order.append(last)
+            previous = int(parent[mask, last])
+            mask ^= 1 << last
+            last = previous
+        return order[::-1]
+
+    @staticmethod
+    def nearest_neighbor(matrix: np.ndarray, start: int = 0) -> List[int]:
+        n = len(matrix)
+        visited = np.zeros(n, dtype=bool)
+        order = [start]
+        visited[start] = True
+        for _ in range(n - 1):
+            distances = np.where(visited, np.inf, matrix[order[-1]])
+            nearest = int(np.argmin(distances))
+            order.append(nearest)
+            visited[nearest] = True
+        return order
+
+    @staticmethod
+    def two_opt(matrix: np.ndarray, order: List[int]) -> List[int]:
+        """Improve an open path (first stop fixed) by segment reversals until none helps"""
+        # Reversals flip edge directions, so score moves on the symmetric part
+        matrix = (matrix + matrix.T) / 2
+        route = np.array(order)
+        n = len(route)
+        for _ in range(RouteOptimizer.MAX_TWO_OPT_PASSES):
+            improved = False
+            for i in range(1, n - 1):
+                ks = np.arange(i + 1, n)
+                before, first = route[i - 1], route[i]
+                last = route[ks]
+                # Edge after the segment; reversing a tail segment removes no edge
+                after = np.where(ks + 1 < n, route[np.minimum(ks + 1, n - 1)], -1)
+                has_after = after >= 0
+                delta = matrix[before, last] - matrix[before, first]
+                delta = delta + np.where(has_after, matrix[first, after] - matrix[last, after], 0.0)
+                best = int(np.argmin(delta))
+                if delta[best] < -1e-9:
+                    k = int(ks[best])
+                    route[i:k + 1] = route[i:k + 1][::-1]
+                    improved = True
+            if not improved:
+                break
+        return route.tolist()
+
+    @staticmethod
+    def route_length(matrix: np.ndarray, order: List[int]) -> float:
+        if len(order) < 2:
+            return 0.0
+        order = np.asarray(order)
+        return float(np.asarray(matrix)[order[:-1], order[1:]].sum())
+
+    @staticmethod
+    def central_stop(matrix: np.ndarray) -> Optional[int]:
+        """Stop with the smallest total distance to the others (a natural starting point)"""
+        if not len(matrix):
+            return None
+        return int(np.argmin(np.asarray(matrix).sum(axis=1)))
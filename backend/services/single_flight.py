@@ -0,0 +1,72 @@
+# backend/services/single_flight.py
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-progress computation that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait and receive their own copy of the result as the
+    function returned it (or the same exception). Nothing is cached once the call has finished.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Callers may mutate what they get back, so each follower gets its own copy
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn(*args, **kwargs)
+            # Snapshot before the leader can mutate its result; followers copy the snapshot
+            call.result = copy.deepcopy(result)
+            return result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,  # upstream pipelines saved
+                "in_flight": len(self._calls)
+            }
+
+
+# Process-wide instance shared by the itinerary generation paths
+generation_flight = SingleFlight()
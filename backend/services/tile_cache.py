@@ -0,0 +1,49 @@
+# backend/services/tile_cache.py
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from config import Config
+from database import MongoDatabase
+
+
+class TileCache:
+    """Overpass results cached per geohash tile (`overpass_tiles` collection).
+
+    Each document holds the parsed places found inside one tile, keyed on
+    "<query version>:<geohash>", so a request for an area only queries
+    Overpass for the tiles nobody has fetched yet. Empty tiles are cached too.
+    A TTL index on expires_at removes stale tiles. If Mongo is unreachable
+    every tile is a miss and the places are fetched live.
+    """
+
+    @staticmethod
+    def get_many(keys: List[str]) -> Dict[str, List[Dict]]:
+        """Cached places for the tiles that have them: {key: places}"""
+        if not keys:
+            return {}
+        try:
+            docs = MongoDatabase.get_db().overpass_tiles.find({
+                "_id": {"$in": list(keys)},
+                "expires_at": {"$gt": datetime.utcnow()}
+            })
+            return {doc["_id"]: doc.get("places", []) for doc in docs}
+        except Exception as e:
+            print(f"[TileCache] Lookup failed: {e}")
+            return {}
+
+    @staticmethod
+    def set(key: str, places: List[Dict]):
+        now = datetime.utcnow()
+        try:
+            MongoDatabase.get_db().overpass_tiles.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "places": places,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=Config.OVERPASS_TILE_TTL)
+                },
+                upsert=True
+            )
+        except Exception as e:
+            print(f"[TileCache] Store failed: {e}")
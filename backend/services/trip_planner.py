@@ -0,0 +1,341 @@
+# backend/services/trip_planner.py
+import math
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.geo import coordinates, haversine_matrix, place_coordinates, project_km, travel_minutes, WALKING_LIMIT_KM
+from .route_optimizer import RouteOptimizer
+
+
+class TripPlanner:
+    """Local itinerary planner working from attraction coordinates.
+
+    Attractions are grouped into one geographic cluster per day (balanced
+    k-means on a local km projection), each day's stops are ordered with
+    RouteOptimizer over a haversine matrix, and the days themselves are
+    ordered so consecutive days are close together. No network calls: a
+    plan takes milliseconds. The plan is used directly as the no-LLM
+    itinerary and as a suggested day grouping in the LLM prompt.
+    """
+
+    DAY_START_MINUTES = 9 * 60
+    # Lunch starts between noon and 14:00
+    LUNCH_EARLIEST_MINUTES = 12 * 60
+    LUNCH_AFTER_MINUTES = 12 * 60 + 30
+    LUNCH_LATEST_MINUTES = 14 * 60
+    # Days whose visits end before this get an afternoon around their area
+    AFTERNOON_FREE_MINUTES = 15 * 60
+    DINNER_MINUTES = 19 * 60
+    VISIT_MINUTES = 120
+    # More than this doesn't fit between breakfast and dinner
+    MAX_STOPS_PER_DAY = 4
+    MAX_KMEANS_ITERATIONS = 25
+    # Share of the daily budget spent on meals, and per-meal split
+    MEAL_SHARE = 0.35
+    MEAL_SPLIT = {"breakfast": 0.2, "lunch": 0.35, "dinner": 0.45}
+
+    @staticmethod
+    def has_coordinates(attractions: List[Dict]) -> bool:
+        return sum(1 for attr in attractions if place_coordinates(attr)) >= 2
+
+    @staticmethod
+    def plan_days(attractions: List[Dict], days: int) -> List[Dict]:
+        """
+        Group attractions into days and order each day's stops
+
+        Args:
+            attractions: dicts with lat/lng or location {lat, lng}
+            days: number of trip days
+
+        Returns:
+            One entry per day: {"day", "stops" (attraction dicts in visiting
+            order), "legs" ([{"distance_km", "minutes"}] between stops),
+            "distance_km"}. Every day gets at least one stop while there
+            are as many attractions as days; with fewer, the remaining days
+            have an empty "stops" list and "near", the closest-in-time stop
+            of another day, to explore around. Attractions that don't fit
+            in the trip (MAX_STOPS_PER_DAY) are dropped from the end of the
+            list.
+        """
+        days = max(int(days), 1)
+        attractions = attractions[:days * TripPlanner.MAX_STOPS_PER_DAY]
+        located = [attr for attr in attractions if place_coordinates(attr)]
+        unlocated = [attr for attr in attractions if not place_coordinates(attr)]
+        plan = [{"day": number, "stops": [], "legs": [], "distance_km": 0.0} for number in range(1, days + 1)]
+        if not located:
+            for i, attr in enumerate(unlocated):
+                plan[i % days]["stops"].append(attr)
+            return plan
+
+        points = coordinates(located)
+        k = min(days, len(located))
+        labels, centers = TripPlanner._cluster(project_km(points), k)
+
+        # Visit clusters in a sensible order (closest clusters on consecutive days)
+        center_matrix = np.sqrt(((centers[:, None, :] - centers[None, :, :]) ** 2).sum(axis=-1))
+        cluster_order = RouteOptimizer.solve(center_matrix, start=None)
+
+        # Spread cluster days evenly when there are more days than clusters
+        slots = [int(round(i * days / k)) for i in range(k)]
+        for slot, cluster in zip(slots, cluster_order):
+            members = np.flatnonzero(labels == cluster)
+            matrix = haversine_matrix(points[members])
+            order = RouteOptimizer.solve(matrix, start=None)
+            legs = [matrix[a, b] for a, b in zip(order, order[1:])]
+            plan[slot]["stops"] = [located[members[i]] for i in order]
+            plan[slot]["legs"] = [
+                {"distance_km": round(float(distance), 2), "minutes": int(round(float(travel_minutes(distance))))}
+                for distance in legs
+            ]
+            plan[slot]["distance_km"] = round(float(sum(legs)), 2)
+
+        # Places without coordinates go to the lightest days
+        for attr in unlocated:
+            min(plan, key=lambda day: len(day["stops"]))["stops"].append(attr)
+        TripPlanner._mark_nearby(plan)
+        return plan
+
+    @staticmethod
+    def build_itinerary(destination: str, budget, days: int, travel_style: str,
+                        attractions: List[Dict], plan: Optional[List[Dict]] = None) -> Dict:
+        """Complete itinerary (same schema as the AI one) from a day plan"""
+        plan = plan or TripPlanner.plan_days(attractions, days)
+        daily_budget = float(budget) / max(days, 1)
+        return {
+            "title": f"{days} Days in {destination}",
+            "destination": destination,
+            "budget": budget,
+            "currency": "USD",
+            "days": [TripPlanner._build_day(day, destination, daily_budget) for day in plan],
+            "tips": [
+                "Days group nearby attractions, so most hops are short walks",
+                "Book popular attractions in advance to skip the queues",
+                "Use public transportation for the longer legs",
+                "Try local cuisine close to each day's last stop",
+                f"Best time to visit {destination} is during shoulder seasons"
+            ],
+            "tourist_spots": attractions,
+            "estimated_total_cost": f"${budget}",
+            "planner": "local"
+        }
+
+    @staticmethod
+    def _mark_nearby(plan: List[Dict]):
+        """Give days without stops the stop of the nearest planned day ("near") to explore around"""
+        planned = [day for day in plan if day["stops"]]
+        if not planned:
+            return
+        for day in plan:
+            if not day["stops"]:
+                # Prefer the previous day's last stop, the way a traveller continues from where they were
+                neighbour = min(planned, key=lambda other: (abs(other["day"] - day["day"]), other["day"] > day["day"]))
+                day["near"] = neighbour["stops"][-1 if neighbour["day"] < day["day"] else 0]
+
+    @staticmethod
+    def describe(plan: List[Dict]) -> str:
+        """Prompt text for a day plan ("Day 1: A -> B (0.8 km) -> C")"""
+        lines = []
+        for day in plan:
+            if not day["stops"]:
+                near = f" around {day['near'].get('name', '')}" if day.get("near") else ""
+                lines.append(f"Day {day['day']}: free day{near} (neighbourhoods, food, markets)")
+                continue
+            parts = [day["stops"][0].get("name", "")]
+            for stop, leg in zip(day["stops"][1:], day["legs"]):
+                parts.append(f"{stop.get('name', '')} ({leg['distance_km']} km)")
+            parts.extend(stop.get("name", "") for stop in day["stops"][len(day["legs"]) + 1:])
+            lines.append(f"Day {day['day']}: " + " -> ".join(parts))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _cluster(points: np.ndarray, k: int):
+        """Balanced k-means; returns (labels, centers) for points in a km plane"""
+        n = len(points)
+        capacity = min(math.ceil(n / k) + 1, TripPlanner.MAX_STOPS_PER_DAY) if n > k else 1
+
+        # Deterministic farthest-point initialisation
+        centers = [points[int(np.argmax(((points - points.mean(axis=0)) ** 2).sum(axis=1)))]]
+        while len(centers) < k:
+            distances = ((points[:, None, :] - np.array(centers)[None, :, :]) ** 2).sum(axis=-1).min(axis=1)
+            centers.append(points[int(np.argmax(distances))])
+        centers = np.array(centers)
+
+        labels = np.zeros(n, dtype=int)
+        for _ in range(TripPlanner.MAX_KMEANS_ITERATIONS):
+            distances = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=-1)
+            labels = TripPlanner._assign(distances, capacity)
+            new_centers = np.array([
+                points[labels == j].mean(axis=0) if np.any(labels == j) else centers[j]
+                for j in range(k)
+            ])
+            if np.allclose(new_centers, centers):
+                break
+            centers = new_centers
+        return labels, centers
+
+    @staticmethod
+    def _assign(distances: np.ndarray, capacity: int) -> np.ndarray:
+        """Nearest-center assignment with a per-cluster capacity; no cluster left empty"""
+        n, k = distances.shape
+        preferences = np.argsort(distances, axis=1)
+        ranked = np.take_along_axis(distances, preferences, axis=1)
+        # Points with the most to lose from a second choice pick first
+        regret = ranked[:, 1] - ranked[:, 0] if k > 1 else np.zeros(n)
+        labels = np.full(n, -1)
+        counts = np.zeros(k, dtype=int)
+        for i in np.argsort(-regret):
+            for j in preferences[i]:
+                if counts[j] < capacity:
+                    labels[i] = j
+                    counts[j] += 1
+                    break
+
+        # Every day gets at least one stop: move the cheapest point into empty clusters
+        for j in np.flatnonzero(counts == 0):
+            donors = np.flatnonzero(counts[labels] > 1)
+            if not len(donors):
+                break
+            i = donors[int(np.argmin(distances[donors, j] - distances[donors, labels[donors]]))]
+            counts[labels[i]] -= 1
+            labels[i] = j
+            counts[j] += 1
+        return labels
+
+    @staticmethod
+    def _build_day(day: Dict, destination: str, daily_budget: float) -> Dict:
+        meal_costs = {
+            meal: daily_budget * TripPlanner.MEAL_SHARE * share
+            for meal, share in TripPlanner.MEAL_SPLIT.items()
+        }
+        activities = [{
+            "time": TripPlanner._clock(8 * 60),
+            "activity": "Breakfast at a local cafe",
+            "cost": TripPlanner._money(meal_costs["breakfast"]),
+            "duration": "1 hour"
+        }]
+        total = meal_costs["breakfast"]
+        minutes = TripPlanner.DAY_START_MINUTES
+        had_lunch = False
+
+        def lunch():
+            nonlocal minutes, total
+            minutes = max(minutes, TripPlanner.LUNCH_EARLIEST_MINUTES)
+            activities.append({
+                "time": TripPlanner._clock(minutes),
+                "activity": "Lunch at a nearby restaurant",
+                "cost": TripPlanner._money(meal_costs["lunch"]),
+                "duration": "1 hour"
+            })
+            total += meal_costs["lunch"]
+            minutes += 60
+
+        stops = day["stops"]
+        near = day.get("near")
+        area = near.get("name") if near and near.get("name") else None
+        if not stops:
+            activities.append({
+                "time": TripPlanner._clock(minutes),
+                "activity": f"Explore the neighbourhood around {area} and its local markets" if area
+                else f"Explore {destination}'s neighbourhoods and local markets",
+                "cost": TripPlanner._money(daily_budget * 0.1),
+                "duration": "3 hours"
+            })
+            total += daily_budget * 0.1
+            minutes += 180
+
+        for index, stop in enumerate(stops):
+            leg = day["legs"][index - 1] if 0 < index <= len(day["legs"]) else None
+            leg_minutes = leg["minutes"] if leg else 0
+            # Lunch before moving on if it's lunchtime, or if getting there and
+            # visiting would run past the lunch window
+            if not had_lunch and (minutes >= TripPlanner.LUNCH_AFTER_MINUTES or
+                                  minutes + leg_minutes + TripPlanner.VISIT_MINUTES > TripPlanner.LUNCH_LATEST_MINUTES):
+                lunch()
+                had_lunch = True
+
+            if leg:
+                walking = leg["distance_km"] <= WALKING_LIMIT_KM
+                fare = 0.0 if walking else min(2.0 + leg["distance_km"] * 0.3, daily_budget * 0.1)
+                activities.append({
+                    "time": TripPlanner._clock(minutes),
+                    "activity": f"{'Walk' if walking else 'Take public transport'} to {stop.get('name', '')} "
+                                f"({leg['distance_km']} km, ~{leg['minutes']} min)",
+                    "cost": TripPlanner._money(fare),
+                    "duration": f"{leg['minutes']} min"
+                })
+                total += fare
+                minutes += leg["minutes"]
+
+            ticket = TripPlanner._ticket_cost(stop, daily_budget)
+            activities.append({
+                "time": TripPlanner._clock(minutes),
+                "activity": f"Visit {stop.get('name', 'attraction')}",
+                "cost": TripPlanner._money(ticket),
+                "duration": f"{TripPlanner.VISIT_MINUTES // 60} hours"
+            })
+            total += ticket
+            minutes += TripPlanner.VISIT_MINUTES
+
+        if not had_lunch:
+            lunch()
+
+        if stops and minutes < TripPlanner.AFTERNOON_FREE_MINUTES:
+            # Light day: the afternoon stays near the last stop
+            activities.append({
+                "time": TripPlanner._clock(minutes),
+                "activity": f"Stroll and shop around {stops[-1].get('name', destination)}",
+                "cost": TripPlanner._money(daily_budget * 0.05),
+                "duration": "3 hours"
+            })
+            total += daily_budget * 0.05
+            minutes += 180
+
+        activities.append({
+            "time": TripPlanner._clock(max(minutes, TripPlanner.DINNER_MINUTES)),
+            "activity": "Dinner & evening stroll",
+            "cost": TripPlanner._money(meal_costs["dinner"]),
+            "duration": "2 hours"
+        })
+        total += meal_costs["dinner"]
+
+        names = [stop.get("name", "") for stop in stops]
+        if not names:
+            title = f"Day {day['day']}: Around {area}" if area else f"Day {day['day']}: Local life in {destination}"
+        elif len(names) <= 2:
+            title = f"Day {day['day']}: {' & '.join(names)}"
+        else:
+            title = f"Day {day['day']}: {names[0]}, {names[1]} & more"
+
+        return {
+            "day": day["day"],
+            "title": title,
+            "activities": activities,
+            "meals": {
+                "breakfast": "Local cafe specialties",
+                "lunch": f"Restaurant near {names[0]}" if names else "Traditional restaurant",
+                "dinner": f"Dinner near {names[-1]}" if names else "Local favourite"
+            },
+            "total_cost": TripPlanner._money(total),
+            "route": names,
+            "distance_km": day["distance_km"]
+        }
+
+    @staticmethod
+    def _ticket_cost(stop: Dict, daily_budget: float) -> float:
+        """Midpoint of a "$15-25" style ticket price, or a budget-based guess"""
+        amounts = [float(value) for value in re.findall(r"\d+(?:\.\d+)?", str(stop.get("ticket_price", "")))]
+        if amounts:
+            return sum(amounts[:2]) / len(amounts[:2])
+        return min(20.0, daily_budget * 0.1)
+
+    @staticmethod
+    def _money(amount: float) -> str:
+        return f"${amount:.0f}"
+
+    @staticmethod
+    def _clock(minutes: int) -> str:
+        minutes = int(minutes) % (24 * 60)
+        hour, minute = divmod(minutes, 60)
+        return f"{(hour % 12) or 12:02d}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
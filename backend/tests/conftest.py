@@ -0,0 +1,20 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# Tests import modules the way the app does (from the backend directory)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mongomock
+import pytest
+
+from database import MongoDatabase
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    """Fresh in-memory MongoDB for MongoDatabase.get_db()"""
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(MongoDatabase, "_client", client)
+    monkeypatch.setattr(MongoDatabase, "_db", client["travel_buddy_test"])
+    return MongoDatabase._db
@@ -0,0 +1,101 @@
+# backend/tests/test_cache_backends.py
+import multiprocessing
+import time
+
+import fakeredis
+import pytest
+
+from services import cache_backends
+from services.cache_backends import CacheBackend, MemoryBackend, RedisBackend, SqliteBackend, create_cache
+
+
+def _sqlite_writer(path, worker, count):
+    backend = SqliteBackend("shared", 60, path=path)
+    for i in range(count):
+        backend.set(f"w{worker}:{i}", "text/plain", f"{worker}-{i}".encode())
+
+
+def test_backend_base_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend("x", 60)
+
+
+def test_redis_round_trip_and_prefix():
+    client = fakeredis.FakeRedis()
+    cache = RedisBackend("photos", 60, client=client)
+    cache.set("a", "image/jpeg", b"\x00bytes\x00")
+    assert cache.get("a") == ("image/jpeg", b"\x00bytes\x00")
+    assert cache.get("missing") is None
+    assert all(key.decode().endswith(":photos:a") for key in client.keys())
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["backend"]) == (1, 1, "redis")
+
+
+def test_redis_ttl_and_clear_only_own_keys():
+    client = fakeredis.FakeRedis()
+    photos = RedisBackend("photos", 60, client=client)
+    landmarks = RedisBackend("landmarks", 60, client=client)
+    photos.set("a", "image/jpeg", b"1", ttl=5)
+    landmarks.set("a", "text/uri-list", b"2")
+    assert 0 < client.ttl(f"{photos._prefix}a") <= 5
+    photos.clear()
+    assert photos.get("a") is None
+    assert landmarks.get("a") == ("text/uri-list", b"2")
+
+
+def test_redis_errors_count_as_misses():
+    class BrokenClient:
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def set(self, *args, **kwargs):
+            raise ConnectionError("down")
+
+    cache = RedisBackend("photos", 60, client=BrokenClient())
+    cache.set("a", "image/jpeg", b"1")
+    assert cache.get("a") is None
+    assert cache.stats()["errors"] == 2
+
+
+def test_create_cache_uses_redis_and_falls_back_without_package(monkeypatch):
+    monkeypatch.setattr(cache_backends.redis.Redis, "from_url", classmethod(lambda cls, url, **kw: fakeredis.FakeRedis()))
+    assert isinstance(create_cache("t", backend="redis"), RedisBackend)
+    monkeypatch.setattr(cache_backends, "REDIS_AVAILABLE", False)
+    monkeypatch.setattr(cache_backends.Config, "CACHE_DISK_DIR", "")
+    assert isinstance(create_cache("t", backend="redis"), MemoryBackend)
+
+
+def test_sqlite_expiry(tmp_path):
+    cache = SqliteBackend("t", 60, path=str(tmp_path / "c.sqlite3"))
+    cache.set("a", "text/plain", b"1", ttl=-1)
+    cache.set("b", "text/plain", b"2")
+    assert cache.get("a") is None
+    assert cache.get("b") == ("text/plain", b"2")
+
+
+def test_sqlite_prune_keeps_recent_entries_under_budget(tmp_path):
+    cache = SqliteBackend("t", 60, path=str(tmp_path / "c.sqlite3"), max_bytes=1000)
+    for i in range(50):
+        cache.set(f"k{i:02d}", "text/plain", b"x" * 97)
+        time.sleep(0.001)
+    cache.prune()
+    stats = cache.stats()
+    assert stats["bytes"] <= 1000
+    assert cache.get("k49") is not None
+    assert cache.get("k00") is None
+
+
+def test_sqlite_shared_between_processes(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    SqliteBackend("shared", 60, path=path)
+    processes = [multiprocessing.Process(target=_sqlite_writer, args=(path, worker, 50)) for worker in range(2)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    reader = SqliteBackend("shared", 60, path=path)
+    assert reader.get("w0:49") == ("text/plain", b"0-49")
+    assert reader.get("w1:0") == ("text/plain", b"1-0")
+    assert reader.stats()["entries"] == 100
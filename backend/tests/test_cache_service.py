@@ -0,0 +1,88 @@
+# backend/tests/test_cache_service.py
+import time
+
+from services.cache_service import _ENTRY_OVERHEAD, CacheService
+
+
+def _cache(max_bytes=10_000, **kwargs):
+    kwargs.setdefault("policy", "lru")
+    return CacheService(default_ttl=60, max_bytes=max_bytes, sweep_interval=0, **kwargs)
+
+
+def _entry_bytes(key, data):
+    return len(key) + len(data) + _ENTRY_OVERHEAD
+
+
+def test_get_set_and_expiry():
+    cache = _cache()
+    cache.set("a", "image/jpeg", b"x" * 10)
+    assert cache.get("a") == ("image/jpeg", b"x" * 10)
+    cache.set("b", "image/jpeg", b"y", ttl=-1)
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["expirations"] == 1
+
+
+def test_byte_budget_evicts_least_recently_used():
+    data = b"x" * 100
+    cache = _cache(max_bytes=3 * _entry_bytes("k0", data))
+    for key in ("k0", "k1", "k2"):
+        cache.set(key, "image/png", data)
+    cache.get("k0")
+    cache.set("k3", "image/png", data)
+    assert cache.get("k1") is None
+    assert cache.get("k0") and cache.get("k2") and cache.get("k3")
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    assert cache.stats()["evictions"] == 1
+
+
+def test_oversized_entries_are_rejected():
+    cache = _cache(max_bytes=200)
+    cache.set("big", "image/png", b"x" * 500)
+    assert cache.get("big") is None
+    assert cache.stats()["rejections"] == 1
+
+
+def test_tinylfu_keeps_popular_entries():
+    data = b"x" * 100
+    cache = _cache(max_bytes=2 * _entry_bytes("hot1", data), policy="tinylfu")
+    for key in ("hot1", "hot2"):
+        cache.set(key, "image/png", data)
+        for _ in range(5):
+            cache.get(key)
+    # A stream of one-off keys doesn't flush the popular ones
+    for i in range(20):
+        cache.set(f"once{i}", "image/png", data)
+    assert cache.get("hot1") and cache.get("hot2")
+    assert cache.stats()["rejections"] == 20
+
+
+def test_disk_tier_spills_and_promotes(tmp_path):
+    data = b"x" * 100
+    cache = _cache(max_bytes=_entry_bytes("k0", data), disk_dir=str(tmp_path))
+    cache.set("k0", "image/png", data)
+    cache.set("k1", "image/png", data)  # evicts k0 to disk
+    assert cache.stats()["disk"]["entries"] == 1
+    assert cache.get("k0") == ("image/png", data)
+    assert cache.stats()["disk_hits"] == 1
+    # Entries survive a new cache instance on the same directory
+    assert _cache(disk_dir=str(tmp_path)).get("k0") == ("image/png", data)
+
+
+def test_sweep_drops_expired_entries(tmp_path):
+    cache = _cache(disk_dir=str(tmp_path))
+    cache.set("short", "text/plain", b"a", ttl=0.05)
+    cache.set("long", "text/plain", b"b")
+    time.sleep(0.1)
+    cache.sweep()
+    assert cache.stats()["entries"] == 1
+    assert cache.get("long") == ("text/plain", b"b")
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = _cache(max_bytes=_entry_bytes("k0", b"x"), disk_dir=str(tmp_path))
+    cache.set("k0", "text/plain", b"x")
+    cache.set("k1", "text/plain", b"x")
+    cache.clear()
+    assert cache.get("k0") is None and cache.get("k1") is None
+    assert cache.stats()["bytes"] == 0 and cache.stats()["disk"]["entries"] == 0
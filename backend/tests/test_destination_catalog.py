@@ -0,0 +1,62 @@
+# backend/tests/test_destination_catalog.py
+import pytest
+
+from services.destination_catalog import DestinationCatalog
+
+DATA = {
+    "countries": {"FR": ["France", "Francia"], "US": ["United States", "USA"], "ES": ["Spain", "España"]},
+    "destinations": [
+        {
+            "name": "Paris", "country_code": "FR", "lat": 48.8566, "lng": 2.3522,
+            "aliases": ["Parigi", "Paris, France"],
+            "attractions": [
+                {"name": "Eiffel Tower", "lat": 48.8584, "lng": 2.2945, "type": "monument", "rating": 4.7},
+                {"name": "Louvre Museum", "lat": 48.8606, "lng": 2.3376, "type": "museum"}
+            ]
+        },
+        {
+            "name": "Barcelona", "country_code": "ES", "lat": 41.3874, "lng": 2.1686,
+            "attractions": [{"name": "Sagrada Familia", "lat": 41.4036, "lng": 2.1744, "type": "church"}]
+        },
+        {"name": "New York City", "country_code": "US", "lat": 40.7128, "lng": -74.006, "aliases": ["NYC"]}
+    ]
+}
+
+
+@pytest.fixture
+def catalog():
+    return DestinationCatalog(DATA)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Paris", "Paris"),
+    ("  PARIS ", "Paris"),
+    ("parigi", "Paris"),
+    ("Paris, Francia", "Paris"),
+    ("rome paris trip", "Paris"),
+    ("barcel", "Barcelona"),
+    ("nyc", "New York City"),
+])
+def test_resolve(catalog, query, expected):
+    assert catalog.city_name(catalog.resolve(query)) == expected
+
+
+@pytest.mark.parametrize("query", ["", "Tokyo", "Paris, Texas", "Paris, USA", "bar"])
+def test_resolve_unknown(catalog, query):
+    assert catalog.resolve(query) is None
+
+
+def test_attractions_are_sliced_per_city(catalog):
+    paris = catalog.resolve("Paris")
+    assert catalog.attraction_names(paris) == ["Eiffel Tower", "Louvre Museum"]
+    attractions = catalog.attractions(paris)
+    assert attractions[0]["type"] == "monument" and attractions[0]["rating"] == 4.7
+    assert attractions[1]["rating"] == 4.5
+    assert catalog.attractions(catalog.resolve("NYC")) == []
+    assert catalog.city_location(paris) == {"lat": 48.8566, "lng": 2.3522}
+
+
+def test_missing_file_gives_an_empty_catalog(tmp_path):
+    catalog = DestinationCatalog.load(str(tmp_path / "missing.json"))
+    assert len(catalog) == 0
+    assert catalog.resolve("Paris") is None
@@ -0,0 +1,101 @@
+# backend/tests/test_gazetteer.py
+import pytest
+
+from config import Config
+from services import gazetteer as gazetteer_module
+from services.gazetteer import Gazetteer
+
+COUNTRIES = [
+    ("FR", "FRA", "France"),
+    ("US", "USA", "United States"),
+    ("IN", "IND", "India"),
+    ("IT", "ITA", "Italy"),
+    ("GB", "GBR", "United Kingdom"),
+]
+CITIES = [
+    # name, ascii name, alternate names, lat, lng, country, population
+    ("Paris", "Paris", "Parigi,París,PAR", 48.85341, 2.3488, "FR", 2138551),
+    ("Paris", "Paris", "", 33.66094, -95.55551, "US", 24782),
+    ("Hyderabad", "Hyderabad", "Haidarabad", 17.38405, 78.45636, "IN", 6809970),
+    ("Rome", "Rome", "Roma,Rom", 41.89193, 12.51133, "IT", 2318895),
+    ("Tiny Village", "Tiny Village", "", 45.0, 5.0, "FR", 50),
+    ("London", "London", "Londres", 51.50853, -0.12574, "GB", 8961989),
+]
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    countries = tmp_path / "countryInfo.txt"
+    countries.write_text("#ISO\tISO3\tISO-Numeric\tfips\tCountry\n" + "".join(
+        f"{code}\t{iso3}\t000\t{code}\t{name}\n" for code, iso3, name in COUNTRIES
+    ), encoding="utf-8")
+    cities = tmp_path / "cities.txt"
+    rows = []
+    for i, (name, ascii_name, alternates, lat, lng, country, population) in enumerate(CITIES):
+        row = [str(i), name, ascii_name, alternates, str(lat), str(lng), "P", "PPL", country,
+               "", "", "", "", "", str(population), "", "", "Europe/Paris", "2024-01-01"]
+        rows.append("\t".join(row) + "\n")
+    cities.write_text("".join(rows), encoding="utf-8")
+    return Gazetteer.load(str(cities), str(countries), min_population=1000)
+
+
+@pytest.mark.parametrize("query, address", [
+    ("Paris", "Paris, France"),
+    ("  PARIS ", "Paris, France"),
+    ("Parigi", "Paris, France"),
+    ("Paris, France", "Paris, France"),
+    ("Paris, FRA", "Paris, France"),
+    ("Paris, USA", "Paris, United States"),
+    ("Paris, United States of America", "Paris, United States"),
+    ("hyderabad, india", "Hyderabad, India"),
+    ("roma italia", "Rome, Italy"),
+    ("London, England", "London, United Kingdom"),
+])
+def test_lookup_resolves_cities_and_country_qualifiers(gazetteer, query, address):
+    result = gazetteer.lookup(query)
+    assert result is not None and result["address"] == address
+
+
+def test_ambiguous_names_resolve_to_the_most_populous_city(gazetteer):
+    assert gazetteer.lookup("Paris")["lat"] == pytest.approx(48.85341)
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "10 Downing Street, London",       # digits: street address
+    "Paris 75001",
+    "Rue de Rivoli, Paris, Ile-de-France, France",  # more parts than city, region, country
+    "Paris, Texas",                    # unknown qualifier: left to Nominatim
+    "London, Greater London, UK",      # regions can't be checked either
+    "Rome, France",                    # known country that doesn't have the city
+    "Atlantis",
+    "Tiny Village",                    # below min_population
+    "PA",                              # too short to be indexed
+])
+def test_lookup_rejects_what_nominatim_should_handle(gazetteer, query):
+    assert gazetteer.lookup(query) is None
+
+
+def test_stats_count_hits_and_fallbacks(gazetteer):
+    gazetteer.lookup("Paris")
+    gazetteer.lookup("Paris, Texas")
+    stats = gazetteer.stats()
+    assert stats["lookups"] == 2 and stats["hits"] == 1 and stats["fallbacks"] == 1
+    assert stats["hit_ratio"] == 0.5 and stats["cities"] == 5
+
+
+def test_missing_files_give_an_empty_gazetteer(tmp_path):
+    gazetteer = Gazetteer.load(str(tmp_path / "missing.txt"), str(tmp_path / "missing_countries.txt"))
+    assert len(gazetteer) == 0
+    assert gazetteer.lookup("Paris") is None
+
+
+def test_falls_back_to_the_bundled_sample(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(Gazetteer, "_instance", None)
+    monkeypatch.setattr(Config, "GAZETTEER_CITIES_PATH", str(tmp_path / "cities15000.txt"))
+    monkeypatch.setattr(Config, "GAZETTEER_COUNTRIES_PATH", str(tmp_path / "countryInfo.txt"))
+    gazetteer = Gazetteer.get()
+    assert "using the bundled sample" in capsys.readouterr().out
+    assert len(gazetteer) > 0
+    assert gazetteer.lookup("Paris, France")["address"] == "Paris, France"
+    assert gazetteer_module.SAMPLE_CITIES_PATH.endswith("cities_sample.tsv")
@@ -0,0 +1,38 @@
+# backend/tests/test_geohash.py
+import pytest
+
+from utils import geohash
+
+
+def test_encode_known_values():
+    # Reference values from the original geohash.org implementation
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash.encode(48.8584, 2.2945, 5) == "u09tu"
+
+
+def test_bounds_contain_the_encoded_point():
+    for lat, lng in [(48.8584, 2.2945), (-33.8568, 151.2153), (40.6892, -74.0445), (0.0, 0.0)]:
+        for precision in (1, 4, 7):
+            south, west, north, east = geohash.bounds(geohash.encode(lat, lng, precision))
+            assert south <= lat <= north and west <= lng <= east
+            lat_step, lng_step = geohash.cell_size(precision)
+            assert north - south == pytest.approx(lat_step)
+            assert east - west == pytest.approx(lng_step)
+
+
+def test_covering_spans_the_box_without_duplicates():
+    south, west, north, east = 48.80, 2.25, 48.92, 2.42
+    cells = geohash.covering(south, west, north, east, 5)
+    assert cells == sorted(set(cells))
+    assert all(len(cell) == 5 for cell in cells)
+    # Every corner and the centre falls in one of the cells
+    for lat, lng in [(south, west), (south, east), (north, west), (north, east), (48.86, 2.33)]:
+        assert geohash.encode(lat, lng, 5) in cells
+    # And each cell overlaps the box
+    for cell in cells:
+        cell_south, cell_west, cell_north, cell_east = geohash.bounds(cell)
+        assert cell_south <= north and cell_north >= south and cell_west <= east and cell_east >= west
+
+
+def test_covering_a_point():
+    assert geohash.covering(10.0, 20.0, 10.0, 20.0, 4) == [geohash.encode(10.0, 20.0, 4)]
@@ -0,0 +1,88 @@
+# backend/tests/test_image_pipeline.py
+import io
+
+import pytest
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+from config import Config  # noqa: E402
+from services.image_pipeline import ImagePipeline, transcode  # noqa: E402
+
+
+def _encode(image, fmt="JPEG", **options):
+    out = io.BytesIO()
+    image.save(out, fmt, **options)
+    return out.getvalue()
+
+
+def _open(data):
+    return Image.open(io.BytesIO(data))
+
+
+def test_downscales_and_keeps_aspect_ratio():
+    content_type, data = transcode(_encode(Image.new("RGB", (400, 200), "red")), 100, None)
+    assert content_type == "image/jpeg"
+    assert _open(data).size == (100, 50)
+
+
+def test_exif_rotated_input_is_sized_after_transpose():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # stored landscape, displayed portrait (rotate 90 degrees)
+    source = _encode(Image.new("RGB", (400, 200), "blue"), exif=exif.tobytes())
+    content_type, data = transcode(source, 100, None)
+    image = _open(data)
+    assert image.size == (100, 200)
+    assert image.getexif().get(0x0112) in (None, 1)
+
+
+def test_animated_images_pass_through():
+    frames = [Image.new("RGB", (64, 64), color) for color in ("red", "green", "blue")]
+    source = io.BytesIO()
+    frames[0].save(source, "GIF", save_all=True, append_images=frames[1:], duration=100)
+    assert transcode(source.getvalue(), 32, "webp") is None
+
+
+def test_source_is_kept_when_reencoding_would_grow_it():
+    # A solid-colour palette PNG is smaller than any JPEG of it
+    source = _encode(Image.new("P", (40, 40), 1), "PNG")
+    assert transcode(source, 100, None) == ("image/png", source)
+
+
+def test_transparent_images_stay_transparent():
+    source = _encode(Image.new("RGBA", (300, 300), (255, 0, 0, 128)), "PNG")
+    content_type, data = transcode(source, 100, "webp")
+    assert content_type == "image/webp"
+    assert _open(data).mode == "RGBA"
+    assert transcode(source, 100, None)[0] == "image/png"
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("*/*", None),
+    ("image/*,*/*;q=0.8", None),
+    ("image/webp,*/*", "webp"),
+    ("image/avif,image/webp,*/*", "avif"),
+    ("image/avif;q=0,image/webp", "webp"),
+    ("", None),
+])
+def test_negotiate_only_counts_explicit_formats(monkeypatch, accept, expected):
+    monkeypatch.setattr(Config, "IMAGE_PIPELINE_ENABLED", True)
+    monkeypatch.setattr(Config, "IMAGE_FORMATS", ["avif", "webp"])
+    if expected and not ImagePipeline.can_encode(expected):
+        pytest.skip(f"Pillow built without {expected} support")
+    assert ImagePipeline.negotiate(accept) == expected
+
+
+def test_negotiate_is_off_with_the_pipeline_disabled(monkeypatch):
+    monkeypatch.setattr(Config, "IMAGE_PIPELINE_ENABLED", False)
+    assert ImagePipeline.negotiate("image/webp") is None
+    assert ImagePipeline.resize(b"not an image", 100) is None
+
+
+def test_resize_runs_in_the_pool_and_reports_failures(monkeypatch):
+    monkeypatch.setattr(Config, "IMAGE_PIPELINE_ENABLED", True)
+    content_type, data = ImagePipeline.resize(_encode(Image.new("RGB", (400, 200), "red")), 100, "webp")
+    assert content_type == "image/webp" and _open(data).size == (100, 50)
+    failures = ImagePipeline.stats()["failures"]
+    assert ImagePipeline.resize(b"not an image", 100) is None
+    assert ImagePipeline.stats()["failures"] == failures + 1
@@ -0,0 +1,57 @@
+# backend/tests/test_import_osm.py
+import json
+
+import pytest
+
+from import_osm import import_overpass_json
+from services.poi_store import PoiStore, PoiStoreWriter
+from utils import osm_tags
+
+MUSEUM = {"tourism": "museum", "name": "Museum"}
+
+
+@pytest.mark.parametrize("element, expected", [
+    ({"id": 7}, 7),
+    ({"id": "7"}, 7),
+    ({}, None),
+    ({"id": None}, None),
+    ({"id": "n7"}, None),
+    ({"id": 7.5}, None),
+    ({"id": True}, None),
+])
+def test_element_id(element, expected):
+    assert osm_tags.element_id(element) == expected
+
+
+def test_place_ids_carry_the_element_kind():
+    assert osm_tags.place_id("way", 42) == "osm_way_42"
+    assert osm_tags.parse_place_id("osm_way_42") == ("way", 42)
+    assert osm_tags.parse_place_id("osm_42") is None
+    assert osm_tags.parse_place_id("osm_area_42") is None
+    assert osm_tags.parse_place_id("catalog_1_2") is None
+
+
+def test_import_keeps_node_and_way_sharing_an_id_and_skips_bad_ids(tmp_path, capsys):
+    dump = {"version": 0.6, "elements": [
+        {"type": "node", "id": 100, "lat": 48.8606, "lon": 2.3376, "tags": MUSEUM},
+        {"type": "way", "id": 100, "center": {"lat": 48.8584, "lon": 2.2945},
+         "tags": {"tourism": "attraction", "name": "Tower"}},
+        {"type": "node", "lat": 48.85, "lon": 2.35, "tags": MUSEUM},
+        {"type": "node", "id": "abc", "lat": 48.85, "lon": 2.35, "tags": MUSEUM},
+        {"type": "node", "id": 100, "lat": 48.8606, "lon": 2.3376, "tags": MUSEUM},
+        {"type": "way", "id": 200, "geometry": [{"lat": 48.0, "lon": 2.0}, {"lat": 48.2, "lon": 2.2}],
+         "tags": {"leisure": "park", "name": "Park"}},
+    ]}
+    source = tmp_path / "dump.json"
+    source.write_text(json.dumps(dump), encoding="utf-8")
+
+    writer = PoiStoreWriter()
+    import_overpass_json(str(source), writer)
+    assert "Skipped 2 elements without an integer id" in capsys.readouterr().out
+
+    path = str(tmp_path / "pois.bin")
+    writer.save(path)
+    store = PoiStore.open(path)
+    places = {store.place(i)["place_id"]: store.place(i) for i in range(len(store))}
+    assert sorted(places) == ["osm_node_100", "osm_way_100", "osm_way_200"]
+    assert places["osm_way_200"]["lat"] == pytest.approx(48.1)
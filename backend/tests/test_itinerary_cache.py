@@ -0,0 +1,155 @@
+# backend/tests/test_itinerary_cache.py
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services import itinerary_cache as itinerary_cache_module
+from services.itinerary_cache import ItineraryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(itinerary_cache_module, "time", SimpleNamespace(time=fake.time))
+    return fake
+
+
+def _itinerary(budget=1000):
+    return {
+        "title": "3 Days in Paris",
+        "budget": budget,
+        "days": [{
+            "day": 1,
+            "activities": [
+                {"activity": "Visit Louvre Museum", "cost": "$20"},
+                {"activity": "Dinner", "cost": "$85.50 per person"},
+                {"activity": "Walk", "cost": "Free"},
+                {"activity": "Day trip", "cost": "$1,200 or $ 40 by train"}
+            ],
+            "total_cost": "$1,305.50"
+        }],
+        "estimated_total_cost": "$1,000"
+    }
+
+
+class Generator:
+    """Stub generator counting calls; optionally blocks until released"""
+
+    def __init__(self, budget=1000, block=False):
+        self.calls = 0
+        self.budget = budget
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        return _itinerary(self.budget)
+
+
+def test_nearby_budgets_share_a_bucket():
+    cache = ItineraryCache(budget_step=0.25)
+    assert cache.budget_bucket(1000) == cache.budget_bucket(1050)
+    assert cache.budget_bucket(1000) != cache.budget_bucket(1300)
+    assert cache.budget_bucket(0) == cache.budget_bucket(1) == 0
+    # Buckets are geometric: the boundary sits halfway between powers in log space
+    boundary = 1.25 ** 30.5
+    assert cache.budget_bucket(boundary * 0.999) == 30
+    assert cache.budget_bucket(boundary * 1.001) == 31
+    assert cache.make_key("Paris ", 1000, 3, "Leisure") == cache.make_key("paris", 1050, "3", "leisure")
+    assert cache.make_key("Paris", 1000, 3, "leisure") != cache.make_key("Paris", 1000, 4, "leisure")
+
+
+def test_hit_is_rescaled_to_the_requested_budget(clock):
+    cache = ItineraryCache()
+    generate = Generator()
+    first, status = cache.get_or_generate("Paris", 1000, 3, "leisure", generate)
+    assert status == "miss" and first == _itinerary(1000)
+
+    second, status = cache.get_or_generate("paris", 1100, 3, "leisure", generate)
+    assert status == "hit" and generate.calls == 1
+    activities = second["days"][0]["activities"]
+    assert [activity["cost"] for activity in activities] == [
+        "$22", "$94.05 per person", "Free", "$1,320 or $44 by train"
+    ]
+    assert second["days"][0]["total_cost"] == "$1,436.05"
+    assert second["estimated_total_cost"] == "$1,100"
+    assert second["budget"] == 1100
+
+
+def test_hits_do_not_share_state_with_the_cache(clock):
+    cache = ItineraryCache()
+    cache.get_or_generate("Paris", 1000, 3, "leisure", Generator())
+    hit, _ = cache.get_or_generate("Paris", 1000, 3, "leisure", Generator())
+    hit["days"].clear()
+    again, _ = cache.get_or_generate("Paris", 1000, 3, "leisure", Generator())
+    assert again == _itinerary(1000)
+
+
+def test_rescale_leaves_same_budget_untouched():
+    itinerary = _itinerary()
+    assert ItineraryCache._rescale(itinerary, 1000.0, 1000) == _itinerary()
+    assert ItineraryCache._rescale(_itinerary(), 1000.0, 500)["days"][0]["activities"][0]["cost"] == "$10"
+
+
+def test_stale_entry_triggers_exactly_one_refresh(clock):
+    cache = ItineraryCache(ttl=60, stale_ttl=600)
+    cache.get_or_generate("Paris", 1000, 3, "leisure", Generator())
+
+    clock.now += 120
+    refresh = Generator(block=True)
+    for _ in range(3):
+        itinerary, status = cache.get_or_generate("Paris", 1000, 3, "leisure", refresh)
+        assert status == "stale" and itinerary == _itinerary(1000)
+    refresh.release.set()
+
+    deadline = time.time() + 5
+    while cache._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+    assert refresh.calls == 1
+    assert cache.get_or_generate("Paris", 1000, 3, "leisure", refresh)[1] == "hit"
+    assert cache.stats()["stale_hits"] == 3
+
+
+def test_entries_past_the_stale_window_are_regenerated(clock):
+    cache = ItineraryCache(ttl=60, stale_ttl=600)
+    generate = Generator()
+    cache.get_or_generate("Paris", 1000, 3, "leisure", generate)
+    clock.now += 700
+    assert cache.get_or_generate("Paris", 1000, 3, "leisure", generate)[1] == "miss"
+    assert generate.calls == 2
+
+
+def test_byte_budget_evicts_least_recently_used(clock):
+    entry_bytes = len(itinerary_cache_module.json.dumps(_itinerary()).encode("utf-8"))
+    cache = ItineraryCache(max_bytes=2 * entry_bytes + entry_bytes // 2)
+    for city in ("Paris", "Rome"):
+        cache.get_or_generate(city, 1000, 3, "leisure", Generator())
+    cache.get_or_generate("Paris", 1000, 3, "leisure", Generator())
+    cache.get_or_generate("Tokyo", 1000, 3, "leisure", Generator())
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["bytes"] <= cache._max_bytes
+    assert cache.get_or_generate("Rome", 1000, 3, "leisure", Generator())[1] == "miss"
+    assert cache.get_or_generate("Tokyo", 1000, 3, "leisure", Generator())[1] == "hit"
+
+
+def test_oversized_itineraries_are_not_cached(clock):
+    cache = ItineraryCache(max_bytes=100)
+    generate = Generator()
+    cache.get_or_generate("Paris", 1000, 3, "leisure", generate)
+    cache.get_or_generate("Paris", 1000, 3, "leisure", generate)
+    assert generate.calls == 2
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,48 @@
+# backend/tests/test_itinerary_routes.py
+import pytest
+from bson.objectid import ObjectId
+from flask import Flask
+
+from routes.itinerary_routes import itinerary_bp
+from services.job_queue import JobQueue
+from services.jwt_handler import JWTHandler
+
+
+@pytest.fixture
+def client(mongo_db):
+    app = Flask(__name__)
+    app.register_blueprint(itinerary_bp)
+    return app.test_client()
+
+
+def _auth(user_id, role="traveler"):
+    return {"Authorization": f"Bearer {JWTHandler.generate_token(user_id, 'user@example.com', role)}"}
+
+
+def test_owner_can_poll_their_job(client):
+    owner = str(ObjectId())
+    job = JobQueue.enqueue(owner, "Paris", 1000, 3, "leisure")
+    response = client.get(f"/api/itinerary/jobs/{job['_id']}", headers=_auth(owner))
+    assert response.status_code == 200
+    body = response.get_json()["job"]
+    assert body["_id"] == str(job["_id"]) and body["status"] == "queued"
+    assert "worker_id" not in body
+
+
+def test_other_users_get_403(client):
+    job = JobQueue.enqueue(str(ObjectId()), "Paris", 1000, 3, "leisure")
+    response = client.get(f"/api/itinerary/jobs/{job['_id']}", headers=_auth(str(ObjectId())))
+    assert response.status_code == 403
+
+
+def test_admin_can_poll_any_job(client):
+    job = JobQueue.enqueue(str(ObjectId()), "Paris", 1000, 3, "leisure")
+    response = client.get(f"/api/itinerary/jobs/{job['_id']}", headers=_auth(str(ObjectId()), role="admin"))
+    assert response.status_code == 200
+
+
+def test_unknown_invalid_and_anonymous_requests(client):
+    user = str(ObjectId())
+    assert client.get(f"/api/itinerary/jobs/{ObjectId()}", headers=_auth(user)).status_code == 404
+    assert client.get("/api/itinerary/jobs/not-an-id", headers=_auth(user)).status_code == 400
+    assert client.get(f"/api/itinerary/jobs/{ObjectId()}").status_code == 401
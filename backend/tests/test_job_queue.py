@@ -0,0 +1,95 @@
+# backend/tests/test_job_queue.py
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from bson.objectid import ObjectId
+
+from config import Config
+from services.job_queue import JobQueue, LeaseHeartbeat, LeaseLostError
+
+
+def _enqueue(destination="Paris"):
+    return JobQueue.enqueue(str(ObjectId()), destination, 1000, 3, "leisure")
+
+
+def _expire_lease(mongo_db, job_id):
+    mongo_db.jobs.update_one({"_id": job_id},
+                             {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}})
+
+
+def test_claims_are_exclusive_and_oldest_first(mongo_db):
+    # The claim is one find_one_and_update; MongoDB makes it atomic (mongomock doesn't
+    # serialize it across threads, so this checks the filter and update instead)
+    first, second = _enqueue("Paris"), _enqueue("Rome")
+    claimed = [JobQueue.claim("worker-a"), JobQueue.claim("worker-b")]
+    assert [job["_id"] for job in claimed] == [first["_id"], second["_id"]]
+    assert [job["worker_id"] for job in claimed] == ["worker-a", "worker-b"]
+    assert all(job["status"] == "running" and job["attempts"] == 1 for job in claimed)
+    assert JobQueue.claim("worker-c") is None
+
+
+def test_expired_lease_is_reclaimed_and_the_old_worker_loses_it(mongo_db):
+    job = _enqueue()
+    JobQueue.claim("worker-a")
+    assert JobQueue.claim("worker-b") is None
+
+    _expire_lease(mongo_db, job["_id"])
+    reclaimed = JobQueue.claim("worker-b")
+    assert reclaimed["_id"] == job["_id"]
+    assert reclaimed["worker_id"] == "worker-b" and reclaimed["attempts"] == 2
+    assert reclaimed["lease_expires_at"] > datetime.utcnow()
+
+    assert not JobQueue.extend_lease(job["_id"], "worker-a")
+    with pytest.raises(LeaseLostError):
+        JobQueue.complete(job["_id"], "worker-a", ObjectId())
+    itinerary_id = ObjectId()
+    JobQueue.complete(job["_id"], "worker-b", itinerary_id)
+    done = JobQueue.get(job["_id"])
+    assert done["status"] == "done" and done["itinerary_id"] == itinerary_id
+
+
+def test_failures_are_retried_until_max_attempts(mongo_db, monkeypatch):
+    monkeypatch.setattr(Config, "JOB_MAX_ATTEMPTS", 3)
+    job = _enqueue()
+    for attempt in range(1, 4):
+        claimed = JobQueue.claim("worker-a")
+        assert claimed["attempts"] == attempt
+        JobQueue.fail(job["_id"], "worker-a", "upstream error", claimed["attempts"])
+    failed = JobQueue.get(job["_id"])
+    assert failed["status"] == "failed" and failed["error"] == "upstream error"
+    assert failed["finished_at"] is not None
+    assert JobQueue.claim("worker-a") is None
+
+
+def test_abandoned_last_attempt_is_failed_not_left_running(mongo_db, monkeypatch):
+    monkeypatch.setattr(Config, "JOB_MAX_ATTEMPTS", 2)
+    job = _enqueue()
+    for _ in range(2):
+        assert JobQueue.claim("worker-a")["_id"] == job["_id"]
+        _expire_lease(mongo_db, job["_id"])
+    assert JobQueue.claim("worker-b") is None
+    failed = JobQueue.get(job["_id"])
+    assert failed["status"] == "failed" and failed["error"] == "lease expired"
+
+
+def test_heartbeat_renews_the_lease(mongo_db):
+    job = _enqueue()
+    JobQueue.claim("worker-a")
+    _expire_lease(mongo_db, job["_id"])
+    with LeaseHeartbeat(job["_id"], "worker-a", interval=0.02) as heartbeat:
+        deadline = time.time() + 5
+        while JobQueue.get(job["_id"])["lease_expires_at"] < datetime.utcnow() and time.time() < deadline:
+            time.sleep(0.01)
+    assert not heartbeat.lost.is_set()
+    assert JobQueue.get(job["_id"])["lease_expires_at"] > datetime.utcnow()
+    assert JobQueue.claim("worker-b") is None
+
+
+def test_heartbeat_reports_a_lost_lease(mongo_db):
+    job = _enqueue()
+    JobQueue.claim("worker-a")
+    _expire_lease(mongo_db, job["_id"])
+    JobQueue.claim("worker-b")
+    with LeaseHeartbeat(job["_id"], "worker-a", interval=0.02) as heartbeat:
+        assert heartbeat.lost.wait(5)
@@ -0,0 +1,47 @@
+# backend/tests/test_json_stream.py
+import json
+
+from utils.json_stream import JsonArrayStream
+
+DOCUMENT = json.dumps({
+    "title": "Trip with ] and [ in strings",
+    "meta": {"days": [1, 2]},
+    "days": [{"day": 1, "note": "brace } inside"}, {"day": 2, "tags": ["a", "b"]}, {"day": 3}],
+    "tips": ["x"]
+})
+
+
+def _feed_in_chunks(parser, text, size):
+    elements = []
+    for start in range(0, len(text), size):
+        elements.extend(parser.feed(text[start:start + size]))
+    return elements
+
+
+def test_elements_match_a_full_parse_for_any_chunk_size():
+    expected = json.loads(DOCUMENT)["days"]
+    for size in (1, 2, 7, 64, len(DOCUMENT)):
+        assert _feed_in_chunks(JsonArrayStream("days"), DOCUMENT, size) == expected
+
+
+def test_elements_are_returned_as_soon_as_they_complete():
+    parser = JsonArrayStream("days")
+    assert parser.feed('{"days": [{"day": 1}, {"da') == [{"day": 1}]
+    assert parser.feed('y": 2}') == [{"day": 2}]
+    assert parser.feed("]}") == []
+    assert parser.done
+
+
+def test_prefix_before_the_object_is_ignored():
+    parser = JsonArrayStream("elements")
+    assert parser.feed('```json\n{"elements": [1, 2]}\n```') == [1, 2]
+
+
+def test_nested_key_with_the_same_name_is_skipped():
+    parser = JsonArrayStream("days")
+    assert parser.feed('{"meta": {"days": [9]}, "days": [1]}') == [1]
+
+
+def test_missing_key_yields_nothing():
+    parser = JsonArrayStream("days")
+    assert parser.feed('{"tips": [1, 2]}') == []
@@ -0,0 +1,84 @@
+# backend/tests/test_map_clusters.py
+import pytest
+
+from services import map_clusters as map_clusters_module
+from services.cache_service import CacheService
+from services.map_clusters import MapClusters
+from services.poi_index import PoiIndex
+from services.poi_store import PoiStore, PoiStoreWriter
+
+
+def _place(place_id, lat, lng, name=None, rating=4.0):
+    return {"place_id": place_id, "name": name or place_id, "lat": lat, "lng": lng,
+            "rating": rating, "type": "attraction"}
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Empty index and no store; tests fill them in"""
+    index = PoiIndex()
+    state = {"store": None}
+    monkeypatch.setattr(PoiIndex, "get", classmethod(lambda cls: index))
+    monkeypatch.setattr(PoiStore, "get", classmethod(lambda cls: state["store"]))
+    monkeypatch.setattr(map_clusters_module, "cluster_cache", CacheService(default_ttl=60, sweep_interval=0))
+    return index, state
+
+
+def _total(result):
+    return sum(cluster["count"] for cluster in result["clusters"])
+
+
+def test_every_point_is_counted_once(sources):
+    index, _ = sources
+    index.add([_place(f"p{i}", 48.80 + i * 0.01, 2.25 + i * 0.01) for i in range(15)])
+    south, west, north, east = 48.75, 2.2, 49.0, 2.45
+    for zoom in (0, 5, 10, 12):
+        assert _total(MapClusters.clusters(west, south, east, north, zoom)) == 15
+
+
+def test_points_on_the_antimeridian_and_clip_edge_are_kept(sources):
+    index, _ = sources
+    index.add([_place("east", 10.0, 180.0), _place("north", 89.0, 10.0), _place("corner", -89.0, 180.0)])
+    for zoom in (0, 1, 2):
+        assert _total(MapClusters.clusters(-180, -90, 180, 90, zoom)) == 3
+    last = 2 ** 3 - 1
+    east_tile = MapClusters.tile_clusters(3, last, MapClusters._tile(10.0, 180.0, 3)[1])
+    assert [cluster["attraction"]["place_id"] for cluster in east_tile] == ["east"]
+    north_tile = MapClusters.tile_clusters(3, MapClusters._tile(89.0, 10.0, 3)[0], 0)
+    assert [cluster["attraction"]["place_id"] for cluster in north_tile] == ["north"]
+    corner_tile = MapClusters.tile_clusters(3, last, last)
+    assert [cluster["attraction"]["place_id"] for cluster in corner_tile] == ["corner"]
+
+
+def test_index_points_covered_by_the_store_are_not_counted_twice(sources, tmp_path):
+    index, state = sources
+    writer = PoiStoreWriter()
+    writer.add(_place("osm_node_1", 48.8584, 2.2945, "Eiffel Tower"))
+    writer.add(_place("osm_node_2", 48.8606, 2.3376, "Louvre Museum"))
+    path = str(tmp_path / "pois.bin")
+    writer.save(path)
+    state["store"] = PoiStore.open(path)
+    index.add([
+        _place("catalog_0_0", 48.8584, 2.2945, "Eiffel Tower"),
+        _place("osm_node_2", 48.8606, 2.3376, "Louvre Museum"),
+        # Outside the extract's coverage: only the index knows it
+        _place("catalog_1_0", 41.9022, 12.4539, "St. Peter's Basilica")
+    ])
+    result = MapClusters.clusters(-10, 35, 20, 55, 4)
+    assert _total(result) == 3
+    names = {cluster["attraction"]["name"] for cluster in result["clusters"]}
+    assert "St. Peter's Basilica" in names
+
+
+def test_cached_tiles_survive_index_changes_elsewhere(sources):
+    index, _ = sources
+    index.add_tile("paris", [_place("p1", 48.8584, 2.2945)])
+    x, y = MapClusters._tile(48.8584, 2.2945, 10)
+    assert _total({"clusters": MapClusters.tile_clusters(10, x, y)}) == 1
+
+    index.add_tile("rome", [_place("r1", 41.9022, 12.4539)])
+    MapClusters.tile_clusters(10, x, y)
+    assert map_clusters_module.cluster_cache.stats()["hits"] == 1
+
+    index.add_tile("paris-2", [_place("p2", 48.8606, 2.3376)])
+    assert _total({"clusters": MapClusters.tile_clusters(10, x, y)}) == 2
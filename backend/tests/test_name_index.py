@@ -0,0 +1,41 @@
+# backend/tests/test_name_index.py
+from utils.name_index import NameIndex
+
+ATTRACTIONS = [
+    {"name": "Sagrada Família"},
+    {"name": "Park Güell"},
+    {"name": "Casa Batlló"},
+    {"name": "Picasso Museum"},
+    {"name": "Maritime Museum"},
+]
+
+
+def test_exact_match_ignores_case_and_accents():
+    index = NameIndex(ATTRACTIONS)
+    assert index.match("sagrada familia") is ATTRACTIONS[0]
+    assert "PARK GUELL" in index
+
+
+def test_fuzzy_match_handles_typos_and_extra_words():
+    index = NameIndex(ATTRACTIONS)
+    assert index.match("Sagrada Familya") is ATTRACTIONS[0]
+    assert index.match("Visit the Casa Batllo") is ATTRACTIONS[2]
+
+
+def test_unrelated_and_ambiguous_names_do_not_match():
+    index = NameIndex(ATTRACTIONS)
+    assert index.match("Eiffel Tower") is None
+    assert index.match("Museum") is None
+    assert index.match("") is None
+
+
+def test_duplicates_are_rejected():
+    index = NameIndex()
+    assert index.add({"name": "Park Güell"})
+    assert not index.add({"name": "park guell"})
+    assert len(index) == 1
+
+
+def test_custom_key():
+    index = NameIndex(["Louvre", "Orsay"], key=str)
+    assert index.match("louvre") == "Louvre"
@@ -0,0 +1,37 @@
+# backend/tests/test_optimize_day.py
+import pytest
+from flask import Flask
+
+from routes.maps_routes import maps_bp
+from services.maps_service import MapsService
+
+STOPS = [{"name": "Louvre", "lat": 48.8606, "lng": 2.3376}, {"name": "Eiffel Tower", "lat": 48.8584, "lng": 2.2945}]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(MapsService, "optimize_day",
+                        lambda self, stops, start_index=None, metric="duration": {"start_index": start_index})
+    app = Flask(__name__)
+    app.register_blueprint(maps_bp)
+    return app.test_client()
+
+
+@pytest.mark.parametrize("start_index", [True, False, "1", 1.0])
+def test_non_integer_start_index_is_rejected(client, start_index):
+    response = client.post("/api/maps/optimize-day", json={"stops": STOPS, "start_index": start_index})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "start_index must be an integer"
+
+
+@pytest.mark.parametrize("start_index", [-1, 2])
+def test_out_of_range_start_index_is_rejected(client, start_index):
+    response = client.post("/api/maps/optimize-day", json={"stops": STOPS, "start_index": start_index})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("start_index", [None, 0, 1])
+def test_valid_start_index_is_passed_on(client, start_index):
+    response = client.post("/api/maps/optimize-day", json={"stops": STOPS, "start_index": start_index})
+    assert response.status_code == 200
+    assert response.get_json() == {"start_index": start_index}
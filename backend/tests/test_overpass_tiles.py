@@ -0,0 +1,107 @@
+# backend/tests/test_overpass_tiles.py
+import json
+
+import pytest
+import requests
+
+from config import Config
+from services.maps_service import MapsService
+from utils import geohash
+
+TILE = "u09t"  # central Paris at precision 4
+SOUTH, WEST, NORTH, EAST = geohash.bounds(TILE)
+
+
+def _node(osm_id, name, lat=None, lng=None, osm_type="node"):
+    lat = SOUTH + (NORTH - SOUTH) * 0.5 if lat is None else lat
+    lng = WEST + (EAST - WEST) * (0.1 + (osm_id % 80) / 100) if lng is None else lng
+    element = {"type": osm_type, "id": osm_id, "tags": {"tourism": "museum", "name": name}}
+    if osm_type == "node":
+        element.update(lat=lat, lon=lng)
+    else:
+        element["center"] = {"lat": lat, "lon": lng}
+    return element
+
+
+class FakeResponse:
+    """Streaming Overpass response that records how much of the body was read"""
+
+    def __init__(self, elements, status_code=200, chunk_chars=200):
+        self.status_code = status_code
+        self.encoding = "utf-8"
+        self.body = json.dumps({"version": 0.6, "elements": elements})
+        self.chunk_chars = chunk_chars
+        self.chars_read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=None, decode_unicode=False):
+        for start in range(0, len(self.body), self.chunk_chars):
+            chunk = self.body[start:start + self.chunk_chars]
+            self.chars_read += len(chunk)
+            yield chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+        return False
+
+
+@pytest.fixture
+def service(monkeypatch):
+    maps_service = MapsService()
+    maps_service.responses = []
+
+    def get(url, params=None, timeout=None, stream=False):
+        maps_service.last_query = params["data"]
+        response = maps_service.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(maps_service.session, "get", get)
+    return maps_service
+
+
+def test_reading_stops_once_enough_places_are_collected(service, monkeypatch):
+    monkeypatch.setattr(Config, "OVERPASS_TILE_MAX_PLACES", 5)
+    response = FakeResponse([_node(i, f"Museum {i}") for i in range(1, 200)])
+    service.responses.append(response)
+    places = service._fetch_tile(TILE)
+    assert [place["place_id"] for place in places] == [f"osm_node_{i}" for i in range(1, 6)]
+    assert response.chars_read < len(response.body) / 5
+    assert response.closed
+    assert "out center 10;" in service.last_query
+
+
+def test_duplicates_and_places_outside_the_tile_are_skipped(service):
+    service.responses.append(FakeResponse([
+        _node(1, "Louvre"),
+        _node(1, "Louvre"),
+        # Same landmark mapped as a way: same name and position
+        _node(1, "Louvre", osm_type="way"),
+        # A way sharing the node's id is a different feature
+        _node(1, "Jardin", lat=SOUTH + 0.01, osm_type="way"),
+        _node(2, "Outside", lat=NORTH + 0.01),
+        # Points on the north / east edge belong to the neighbouring tile
+        _node(3, "North edge", lat=NORTH),
+        _node(4, "Unnamed") | {"tags": {"tourism": "museum"}},
+        {"type": "node", "lat": SOUTH + 0.01, "lon": WEST + 0.01, "tags": {"tourism": "museum", "name": "No id"}},
+    ]))
+    places = service._fetch_tile(TILE)
+    assert [place["place_id"] for place in places] == ["osm_node_1", "osm_way_1"]
+
+
+def test_short_responses_are_read_to_the_end(service):
+    response = FakeResponse([_node(i, f"Museum {i}") for i in range(1, 4)])
+    service.responses.append(response)
+    assert len(service._fetch_tile(TILE)) == 3
+    assert response.chars_read == len(response.body)
+
+
+def test_failures_return_none(service):
+    service.responses.append(FakeResponse([], status_code=429))
+    assert service._fetch_tile(TILE) is None
+    service.responses.append(requests.ConnectionError("down"))
+    assert service._fetch_tile(TILE) is None
@@ -0,0 +1,165 @@
+# backend/tests/test_pexels_quota.py
+from types import SimpleNamespace
+
+import pytest
+
+from config import Config
+from services import image_service as image_service_module
+from services.image_service import ImageService, PexelsQuota
+
+NOW = 1_700_000_000.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = NOW
+
+    def time(self):
+        return self.now
+
+
+def _response(status_code=200, **headers):
+    return SimpleNamespace(
+        status_code=status_code,
+        headers={name.replace("_", "-"): value for name, value in headers.items()},
+        text=""
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(image_service_module, "time", SimpleNamespace(time=fake.time))
+    # The quota is process-wide class state; give every test a fresh one
+    monkeypatch.setattr(PexelsQuota, "_limit", None)
+    monkeypatch.setattr(PexelsQuota, "_remaining", None)
+    monkeypatch.setattr(PexelsQuota, "_reset_at", None)
+    monkeypatch.setattr(PexelsQuota, "_blocked_until", 0.0)
+    monkeypatch.setattr(PexelsQuota, "_consecutive_throttles", 0)
+    monkeypatch.setattr(PexelsQuota, "_stats", {"requests": 0, "throttled": 0, "skipped": 0})
+    monkeypatch.setattr(Config, "PEXELS_BACKOFF_SECONDS", 60)
+    monkeypatch.setattr(Config, "PEXELS_MAX_BACKOFF_SECONDS", 3600)
+    monkeypatch.setattr(Config, "PEXELS_QUOTA_RESERVE", 50)
+    return fake
+
+
+def test_headers_update_limit_remaining_and_reset(clock):
+    delay = PexelsQuota.record(_response(
+        X_Ratelimit_Limit="20000", X_Ratelimit_Remaining="19684", X_Ratelimit_Reset=str(int(NOW) + 600)
+    ))
+
+    assert delay is None
+    stats = PexelsQuota.stats()
+    assert stats["limit"] == 20000
+    assert stats["remaining"] == 19684
+    assert stats["reset_in"] == 600
+    assert stats["blocked_for"] == 0
+
+
+def test_reset_accepts_delta_seconds_and_ignores_bad_values(clock):
+    PexelsQuota.record(_response(X_Ratelimit_Remaining="10", X_Ratelimit_Reset="120"))
+    assert PexelsQuota.stats()["reset_in"] == 120
+
+    PexelsQuota.record(_response(X_Ratelimit_Limit="lots", X_Ratelimit_Remaining="", X_Ratelimit_Reset=None))
+
+    stats = PexelsQuota.stats()
+    assert stats["limit"] is None
+    assert stats["remaining"] == 10
+    assert stats["reset_in"] == 120
+
+
+def test_allow_counts_down_and_stops_at_zero_until_reset(clock):
+    PexelsQuota.record(_response(X_Ratelimit_Remaining="2", X_Ratelimit_Reset=str(int(NOW) + 300)))
+
+    assert PexelsQuota.allow()
+    assert PexelsQuota.allow()
+    assert not PexelsQuota.allow()
+    assert PexelsQuota.stats()["skipped"] == 1
+
+    clock.now += 301
+    assert PexelsQuota.allow()
+
+
+def test_unknown_quota_always_allows(clock):
+    for _ in range(5):
+        assert PexelsQuota.allow()
+    assert PexelsQuota.stats()["requests"] == 5
+    assert PexelsQuota.stats()["remaining"] is None
+
+
+def test_429_honours_retry_after(clock):
+    delay = PexelsQuota.record(_response(429, Retry_After="30"))
+
+    assert delay == 30
+    assert PexelsQuota.blocked()
+    assert not PexelsQuota.allow()
+    assert PexelsQuota.stats()["throttled"] == 1
+
+    clock.now += 31
+    assert not PexelsQuota.blocked()
+    assert PexelsQuota.allow()
+
+
+def test_429_without_retry_after_waits_for_quota_reset(clock):
+    delay = PexelsQuota.record(_response(429, X_Ratelimit_Remaining="0", X_Ratelimit_Reset=str(int(NOW) + 900)))
+
+    assert delay == 900
+    clock.now += 899
+    assert PexelsQuota.blocked()
+    clock.now += 2
+    assert not PexelsQuota.blocked()
+
+
+def test_429_without_hints_backs_off_exponentially_up_to_the_cap(clock):
+    delays = []
+    for _ in range(8):
+        delays.append(PexelsQuota.record(_response(429)))
+        clock.now += delays[-1] + 1
+
+    assert delays[:4] == [60, 120, 240, 480]
+    assert max(delays) == 3600
+    assert delays[-1] == 3600
+
+    # A successful response resets the backoff
+    PexelsQuota.record(_response(200))
+    assert PexelsQuota.record(_response(429)) == 60
+
+
+def test_retry_after_is_capped(clock):
+    assert PexelsQuota.record(_response(429, Retry_After="86400")) == 3600
+
+
+def test_a_shorter_429_does_not_shorten_an_existing_block(clock):
+    PexelsQuota.record(_response(429, Retry_After="600"))
+    PexelsQuota.record(_response(429, Retry_After="5"))
+
+    clock.now += 10
+    assert PexelsQuota.blocked()
+    assert PexelsQuota.stats()["blocked_for"] == 590
+
+
+def test_concurrency_drops_to_one_below_the_reserve(clock):
+    assert PexelsQuota.concurrency(3) == 3
+    assert PexelsQuota.concurrency(0) == 1
+
+    PexelsQuota.record(_response(X_Ratelimit_Remaining="49"))
+    assert PexelsQuota.concurrency(3) == 1
+
+    PexelsQuota.record(_response(X_Ratelimit_Remaining="50"))
+    assert PexelsQuota.concurrency(3) == 3
+
+
+def test_search_skips_the_request_while_backing_off(clock, monkeypatch):
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(kwargs["params"]["query"])
+        return _response(429, Retry_After="120")
+
+    monkeypatch.setattr(image_service_module.requests, "get", fake_get)
+
+    assert ImageService._search_pexels("Eiffel Tower") is None
+    assert ImageService._search_pexels("Louvre Museum") is None
+
+    assert calls == ["Eiffel Tower"]
+    assert PexelsQuota.stats()["skipped"] == 1
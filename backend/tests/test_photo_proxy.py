@@ -0,0 +1,80 @@
+# backend/tests/test_photo_proxy.py
+import pytest
+from flask import Flask
+
+from config import Config
+from routes import maps_routes
+from routes.maps_routes import maps_bp
+from services.cache_backends import MemoryBackend
+
+PHOTO_URL = "https://images.pexels.com/photos/1/photo.jpeg"
+UPSTREAM_LAST_MODIFIED = "Wed, 01 May 2024 10:00:00 GMT"
+
+
+class FakeUpstream:
+    """requests.get stand-in serving one JPEG with a Last-Modified date"""
+
+    def __init__(self):
+        self.calls = 0
+        self.status_code = 200
+        self.headers = {"Content-Type": "image/jpeg", "Last-Modified": UPSTREAM_LAST_MODIFIED}
+
+    def __call__(self, url, stream=False, timeout=None):
+        self.calls += 1
+        return self
+
+    def iter_content(self, chunk_size=None):
+        yield b"jpeg-bytes"
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = FakeUpstream()
+    monkeypatch.setattr(maps_routes.requests, "get", fake)
+    monkeypatch.setattr(maps_routes, "photo_cache", MemoryBackend("photos-test", 60))
+    # Streamed (untranscoded) path: the one that passes Last-Modified on
+    monkeypatch.setattr(Config, "IMAGE_PIPELINE_ENABLED", False)
+    return fake
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(maps_bp)
+    return app.test_client()
+
+
+def _get(client, **headers):
+    return client.get("/api/maps/photo", query_string={"url": PHOTO_URL}, headers=headers)
+
+
+def test_matching_etag_gets_304_without_touching_upstream(client, upstream):
+    first = _get(client)
+    assert first.status_code == 200 and first.data == b"jpeg-bytes"
+    assert first.headers["Last-Modified"] == UPSTREAM_LAST_MODIFIED
+    response = _get(client, **{"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304
+    assert upstream.calls == 1
+
+
+def test_other_etag_is_not_overridden_by_if_modified_since(client, upstream):
+    response = _get(client, **{"If-None-Match": '"another-variant"',
+                               "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert response.status_code == 200 and response.data == b"jpeg-bytes"
+
+
+def test_if_modified_since_is_compared_with_the_sent_last_modified(client, upstream):
+    current = _get(client, **{"If-Modified-Since": UPSTREAM_LAST_MODIFIED})
+    assert current.status_code == 304
+    older = _get(client, **{"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    assert older.status_code == 200 and older.data == b"jpeg-bytes"
+
+
+def test_if_modified_since_alone_does_not_validate_responses_without_a_date(client, upstream):
+    assert _get(client).data == b"jpeg-bytes"  # cached now; cache hits carry no Last-Modified
+    response = _get(client, **{"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert response.status_code == 200 and "Last-Modified" not in response.headers
+    assert upstream.calls == 1
@@ -0,0 +1,88 @@
+# backend/tests/test_poi_index.py
+import pytest
+
+from services.poi_index import PoiIndex
+
+
+def _tile(prefix, lat, lng, count=10):
+    return [{"place_id": f"{prefix}_{i}", "name": f"{prefix} {i}", "lat": lat + i * 0.001,
+             "lng": lng + i * 0.001, "rating": 4.0} for i in range(count)]
+
+
+def test_within_and_nearest():
+    index = PoiIndex(max_places=1000)
+    index.add(_tile("paris", 48.85, 2.35))
+    found = index.within(48.85, 2.35, 0.5)
+    assert [place["place_id"] for place in found][:2] == ["paris_0", "paris_1"]
+    assert all(place["distance_km"] <= 0.5 for place in found)
+    assert [place["place_id"] for place in index.nearest(48.859, 2.359, 2)] == ["paris_9", "paris_8"]
+
+
+def test_least_recently_used_tiles_are_evicted_over_the_cap():
+    index = PoiIndex(max_places=30)
+    index.add(_tile("catalog", 41.90, 12.45, 5))
+    index.add_tile("a", _tile("a", 48.85, 2.35))
+    index.add_tile("b", _tile("b", 51.50, -0.12))
+    assert index.has_tile("a")  # a is now more recent than b
+    index.add_tile("c", _tile("c", 40.41, -3.70))
+
+    assert len(index) <= 30
+    assert index.has_tile("a") and index.has_tile("c") and not index.has_tile("b")
+    assert index.within(51.50, -0.12, 2) == []
+    # Catalog places are never evicted; remaining places are still found after compaction
+    assert len(index.within(41.90, 12.45, 2)) == 5
+    assert len(index.within(48.85, 2.35, 2)) == 10
+    assert index.stats()["evictions"] == 1
+
+
+def test_places_shared_by_tiles_stay_while_one_tile_holds_them():
+    index = PoiIndex(max_places=15)
+    shared = _tile("shared", 48.85, 2.35, 5)
+    index.add_tile("a", shared + _tile("a", 48.90, 2.40, 5))
+    index.add_tile("b", shared)
+    index.add_tile("c", _tile("c", 40.41, -3.70, 8))
+    assert not index.has_tile("a")
+    assert len(index.within(48.85, 2.35, 1)) == 5
+
+
+def test_ids_stay_valid_across_compaction():
+    index = PoiIndex(max_places=25)
+    index.add_tile("a", _tile("a", 48.85, 2.35))
+    index.add_tile("b", _tile("b", 51.50, -0.12))
+    ids, _, _, _ = index.in_bbox(51.4, -0.2, 51.6, 0.0)
+    names = {index.place(int(i))["name"] for i in ids}
+
+    index.has_tile("b")
+    index.add_tile("c", _tile("c", 40.41, -3.70))  # evicts a and compacts
+    assert not index.has_tile("a")
+    assert {index.place(int(i))["name"] for i in ids} == names
+    ids_a, _, _, _ = index.in_bbox(48.8, 2.3, 48.9, 2.4)
+    assert len(ids_a) == 0
+
+
+def test_version_changes_only_where_places_change():
+    index = PoiIndex(max_places=25)
+    paris, london = (48.0, 2.0, 49.0, 3.0), (51.0, -1.0, 52.0, 0.0)
+    index.add_tile("a", _tile("a", 48.85, 2.35))
+    paris_version, london_version = index.version(*paris), index.version(*london)
+    assert paris_version > 0 and london_version == 0
+
+    index.add_tile("b", _tile("b", 51.50, -0.12))
+    assert index.version(*paris) == paris_version
+    assert index.version(*london) > london_version
+
+    london_version = index.version(*london)
+    index.has_tile("a")
+    index.add_tile("c", _tile("c", 40.41, -3.70))  # evicts b
+    assert index.version(*paris) == paris_version
+    assert index.version(*london) > london_version
+    # A world-sized box sees every change
+    assert index.version(-90, -180, 90, 180) == max(index.version(*paris), index.version(*london),
+                                                    index.version(40.0, -4.0, 41.0, -3.0))
+
+
+@pytest.mark.parametrize("max_places", [0, 5])
+def test_a_tile_bigger_than_the_cap_does_not_loop(max_places):
+    index = PoiIndex(max_places=max_places)
+    index.add_tile("a", _tile("a", 48.85, 2.35))
+    assert len(index) == 0 and not index.has_tile("a")
@@ -0,0 +1,119 @@
+# backend/tests/test_poi_store.py
+import math
+
+import numpy as np
+import pytest
+
+from services.poi_store import KM_PER_DEGREE, PoiStore, PoiStoreWriter
+
+CENTER = (48.8566, 2.3522)
+
+
+def _distance_km(lat1, lng1, lat2, lng2):
+    # Same equirectangular approximation as the store (fine at city scale)
+    dx = (lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    return math.hypot(lat2 - lat1, dx) * KM_PER_DEGREE
+
+
+@pytest.fixture(scope="module")
+def places():
+    rng = np.random.default_rng(7)
+    points = rng.normal(CENTER, 0.05, size=(400, 2))
+    return [
+        {
+            "place_id": f"osm_node_{1000 + i}", "name": f"Place {i}", "lat": float(lat), "lng": float(lng),
+            "type": ("museum", "park", "monument")[i % 3], "rating": round(3.5 + (i % 15) / 10, 1),
+            "address": f"{i} Rue Test", "website": "", "opening_hours": "Mo-Su 09:00-18:00"
+        }
+        for i, (lat, lng) in enumerate(points)
+    ]
+
+
+@pytest.fixture(scope="module")
+def store(places, tmp_path_factory):
+    writer = PoiStoreWriter()
+    for place in places:
+        assert writer.add(place)
+    assert not writer.add(places[0])
+    path = str(tmp_path_factory.mktemp("poi") / "pois.bin")
+    writer.save(path, source="test")
+    return PoiStore.open(path)
+
+
+def test_round_trip(store, places):
+    assert len(store) == len(places)
+    by_id = {place["place_id"]: place for place in places}
+    for index in range(len(store)):
+        place = store.place(index)
+        original = by_id[place["place_id"]]
+        assert place["name"] == original["name"]
+        assert place["type"] == original["type"]
+        assert place["opening_hours"] == original["opening_hours"]
+        assert place["lat"] == pytest.approx(original["lat"], abs=1e-5)
+        assert place["rating"] == pytest.approx(original["rating"], abs=0.05)
+
+
+def test_within_matches_a_brute_force_scan(store, places):
+    lat, lng, radius_km = 48.87, 2.34, 2.5
+    expected = {place["place_id"] for place in places
+                if _distance_km(lat, lng, place["lat"], place["lng"]) <= radius_km}
+    found = store.within(lat, lng, radius_km)
+    assert {place["place_id"] for place in found} == expected
+    distances = [place["distance_km"] for place in found]
+    assert distances == sorted(distances)
+    assert len(store.within(lat, lng, radius_km, limit=3)) == min(3, len(expected))
+
+
+def test_nearest(store, places):
+    lat, lng = CENTER
+    ranked = sorted(places, key=lambda place: _distance_km(lat, lng, place["lat"], place["lng"]))
+    found = store.nearest(lat, lng, 5)
+    assert [place["place_id"] for place in found] == [place["place_id"] for place in ranked[:5]]
+    assert store.nearest(lat, lng, 0) == []
+
+
+def test_in_bbox(store, places):
+    south, west, north, east = 48.84, 2.33, 48.88, 2.38
+    indexes, lat, lng, rating = store.in_bbox(south, west, north, east)
+    expected = {place["place_id"] for place in places
+                if south <= place["lat"] <= north and west <= place["lng"] <= east}
+    assert {store.place(int(i))["place_id"] for i in indexes} == expected
+    assert len(lat) == len(lng) == len(rating) == len(indexes)
+
+
+def test_contains_uses_coverage_cells(tmp_path):
+    writer = PoiStoreWriter(coverage_degrees=0.05)
+    # Two clusters far apart: the bounding box spans the empty gap between them
+    for i, (lat, lng) in enumerate([(48.85, 2.35), (48.86, 2.36), (50.85, 4.35), (50.86, 4.36)]):
+        writer.add({"place_id": f"osm_node_{i + 1}", "name": f"P{i}", "lat": lat, "lng": lng})
+    path = str(tmp_path / "pois.bin")
+    writer.save(path)
+    store = PoiStore.open(path)
+    assert store.contains(48.855, 2.355)
+    assert store.contains(50.855, 4.355)
+    assert not store.contains(49.85, 3.35)
+    assert not store.contains(40.0, 2.0)
+    assert store.stats()["coverage_cells"] >= 2
+    # Every imported POI covers its own location, exactly at the extract's edges too
+    assert store.contains(48.85, 2.35) and store.contains(50.86, 4.36)
+    mask = store.covers([48.85, 49.85, 50.86], [2.35, 3.35, 4.36])
+    assert mask.tolist() == [True, False, True]
+
+
+def test_open_rejects_missing_and_foreign_files(tmp_path):
+    assert PoiStore.open(str(tmp_path / "missing.bin")) is None
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a poi store at all")
+    assert PoiStore.open(str(other)) is None
+
+
+def test_node_and_way_with_the_same_id_are_both_kept(tmp_path):
+    writer = PoiStoreWriter()
+    assert writer.add({"place_id": "osm_node_42", "name": "Fountain", "lat": 48.85, "lng": 2.35})
+    assert writer.add({"place_id": "osm_way_42", "name": "Park", "lat": 48.86, "lng": 2.36})
+    assert not writer.add({"place_id": "osm_way_42", "name": "Park again", "lat": 48.86, "lng": 2.36})
+    assert not writer.add({"place_id": "catalog_0_1", "name": "Not OSM", "lat": 48.86, "lng": 2.36})
+    path = str(tmp_path / "pois.bin")
+    writer.save(path)
+    store = PoiStore.open(path)
+    assert sorted(store.place(i)["place_id"] for i in range(len(store))) == ["osm_node_42", "osm_way_42"]
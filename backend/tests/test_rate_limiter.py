@@ -0,0 +1,50 @@
+# backend/tests/test_rate_limiter.py
+import multiprocessing
+import time
+
+from services.rate_limiter import TokenBucket
+
+
+def test_burst_then_reject_without_waiting(tmp_path):
+    bucket = TokenBucket("burst", rate=0.1, capacity=2, state_dir=str(tmp_path))
+    assert bucket.acquire()
+    assert bucket.acquire()
+    started = time.monotonic()
+    assert not bucket.acquire(timeout=1.0)
+    assert time.monotonic() - started < 0.5
+    stats = bucket.stats()
+    assert stats["acquired"] == 2 and stats["rejected"] == 1
+
+
+def test_waits_for_the_next_token(tmp_path):
+    bucket = TokenBucket("wait", rate=20, capacity=1, state_dir=str(tmp_path))
+    assert bucket.acquire()
+    started = time.monotonic()
+    assert bucket.acquire(timeout=1.0)
+    assert 0.02 <= time.monotonic() - started < 0.5
+    assert bucket.stats()["waited"] == 1
+
+
+def test_buckets_with_the_same_name_share_tokens(tmp_path):
+    first = TokenBucket("shared", rate=0.1, capacity=1, state_dir=str(tmp_path))
+    second = TokenBucket("shared", rate=0.1, capacity=1, state_dir=str(tmp_path))
+    other = TokenBucket("other", rate=0.1, capacity=1, state_dir=str(tmp_path))
+    assert first.acquire()
+    assert not second.acquire()
+    assert other.acquire()
+
+
+def _take(state_dir, results):
+    bucket = TokenBucket("procs", rate=0.1, capacity=3, state_dir=state_dir)
+    results.put(sum(bucket.acquire() for _ in range(3)))
+
+
+def test_budget_is_shared_across_processes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [context.Process(target=_take, args=(str(tmp_path), results)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(10)
+    assert sum(results.get(timeout=5) for _ in processes) == 3
@@ -0,0 +1,66 @@
+# backend/tests/test_route_optimizer.py
+import itertools
+
+import numpy as np
+import pytest
+
+from services.route_optimizer import RouteOptimizer
+
+
+def _matrix(points):
+    points = np.asarray(points, dtype=float)
+    return np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1))
+
+
+def _brute_force(matrix, start):
+    n = len(matrix)
+    starts = range(n) if start is None else [start]
+    best = None
+    for first in starts:
+        for rest in itertools.permutations([i for i in range(n) if i != first]):
+            order = [first, *rest]
+            length = RouteOptimizer.route_length(matrix, order)
+            if best is None or length < best:
+                best = length
+    return best
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("start", [0, None])
+def test_held_karp_is_optimal(seed, start):
+    matrix = _matrix(np.random.default_rng(seed).random((7, 2)))
+    order = RouteOptimizer.held_karp(matrix, start)
+    assert sorted(order) == list(range(7))
+    if start is not None:
+        assert order[0] == start
+    assert RouteOptimizer.route_length(matrix, order) == pytest.approx(_brute_force(matrix, start))
+
+
+def test_solve_visits_every_stop_once_from_start():
+    matrix = _matrix(np.random.default_rng(1).random((40, 2)))
+    order = RouteOptimizer.solve(matrix, start=3)
+    assert order[0] == 3
+    assert sorted(order) == list(range(40))
+
+
+def test_two_opt_untangles_a_crossing():
+    points = [(0, 0), (1, 1), (1, 0), (0, 1)]
+    matrix = _matrix(points)
+    improved = RouteOptimizer.two_opt(matrix, [0, 1, 2, 3])
+    assert RouteOptimizer.route_length(matrix, improved) < RouteOptimizer.route_length(matrix, [0, 1, 2, 3])
+
+
+def test_points_on_a_line_are_visited_in_order():
+    matrix = _matrix([(x, 0) for x in (0, 3, 1, 2)])
+    order = RouteOptimizer.solve(matrix, start=0)
+    assert order == [0, 2, 3, 1]
+    assert RouteOptimizer.optimal(matrix, start=None) == ([0, 2, 3, 1], True) or \
+        RouteOptimizer.optimal(matrix, start=None) == ([1, 3, 2, 0], True)
+
+
+def test_small_and_empty_inputs():
+    assert RouteOptimizer.solve(np.zeros((0, 0))) == []
+    assert RouteOptimizer.solve(np.zeros((1, 1))) == [0]
+    assert RouteOptimizer.solve(_matrix([(0, 0), (1, 0)]), start=1) == [1, 0]
+    assert RouteOptimizer.central_stop(_matrix([(0, 0), (1, 0), (2, 0)])) == 1
+    assert RouteOptimizer.route_length(np.zeros((1, 1)), [0]) == 0.0
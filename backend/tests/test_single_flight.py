@@ -0,0 +1,79 @@
+# backend/tests/test_single_flight.py
+import threading
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+def _run_concurrently(flight, fn, callers=5):
+    started = threading.Event()
+    results, errors = [], []
+
+    def call(function):
+        try:
+            results.append(flight.do("key", function))
+        except Exception as e:
+            errors.append(e)
+
+    def leader():
+        started.set()
+        return fn()
+
+    threads = [threading.Thread(target=call, args=(leader,))]
+    threads[0].start()
+    started.wait(5)
+    threads += [threading.Thread(target=call, args=(fn,)) for _ in range(callers - 1)]
+    for thread in threads[1:]:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution_and_get_their_own_copy():
+    release = threading.Event()
+    runs = []
+
+    def generate():
+        runs.append(1)
+        release.wait(5)
+        return {"days": [1, 2]}
+
+    flight = SingleFlight()
+    threads, results, _ = _run_concurrently(flight, generate)
+    while flight.stats()["coalesced"] < 4:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(runs) == 1
+    assert flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+    assert all(result == {"days": [1, 2]} for result in results)
+    results[0]["days"].append(3)
+    assert all(result == {"days": [1, 2]} for result in results[1:])
+    assert len({id(result) for result in results}) == len(results)
+
+
+def test_followers_receive_the_leaders_exception():
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    flight = SingleFlight()
+    threads, _, errors = _run_concurrently(flight, fail, callers=3)
+    while flight.stats()["coalesced"] < 2:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(errors) == 3 and all(isinstance(e, ValueError) for e in errors)
+
+
+def test_nothing_is_cached_after_the_call():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
@@ -0,0 +1,51 @@
+# backend/tests/test_trip_planner.py
+import os
+
+import pytest
+
+from services.destination_catalog import DestinationCatalog
+from services.trip_planner import TripPlanner
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "destinations.json")
+
+
+def _minutes(clock):
+    time, period = clock.split()
+    hour, minute = (int(part) for part in time.split(":"))
+    return (hour % 12 + (12 if period == "PM" else 0)) * 60 + minute
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return DestinationCatalog.load(CATALOG_PATH)
+
+
+@pytest.mark.parametrize("city, days", [("Paris", 1), ("Paris", 2), ("Paris", 3), ("Rome", 2), ("Tokyo", 4)])
+def test_lunch_starts_within_the_lunch_window(catalog, city, days):
+    city_id = catalog.resolve(city)
+    if city_id is None:
+        pytest.skip(f"{city} is not in the catalog")
+    itinerary = TripPlanner.build_itinerary(city, 1000, days, "leisure", catalog.attractions(city_id))
+    for day in itinerary["days"]:
+        lunches = [activity for activity in day["activities"] if activity["activity"].startswith("Lunch")]
+        assert len(lunches) == 1
+        assert TripPlanner.LUNCH_EARLIEST_MINUTES <= _minutes(lunches[0]["time"]) <= TripPlanner.LUNCH_LATEST_MINUTES
+
+
+def test_activities_are_in_time_order(catalog):
+    attractions = catalog.attractions(catalog.resolve("Paris"))
+    itinerary = TripPlanner.build_itinerary("Paris", 1000, 2, "leisure", attractions)
+    for day in itinerary["days"]:
+        times = [_minutes(activity["time"]) for activity in day["activities"]]
+        assert times == sorted(times)
+
+
+def test_days_without_stops_explore_around_a_nearby_stop():
+    attractions = [
+        {"name": "Louvre Museum", "lat": 48.8606, "lng": 2.3376},
+        {"name": "Eiffel Tower", "lat": 48.8584, "lng": 2.2945},
+    ]
+    itinerary = TripPlanner.build_itinerary("Paris", 900, 3, "leisure", attractions)
+    empty = [day for day in itinerary["days"] if not day["route"]]
+    assert len(empty) == 1
+    assert empty[0]["title"].startswith(f"Day {empty[0]['day']}: Around ")
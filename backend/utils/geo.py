@@ -0,0 +1,86 @@
+# backend/utils/geo.py
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Rough door-to-door speeds used when no routing engine is available
+WALKING_SPEED_KMH = 4.5
+CITY_TRANSIT_SPEED_KMH = 20.0
+# Straight-line distances under this are assumed to be walked
+WALKING_LIMIT_KM = 1.5
+
+
+def coordinates(places: Iterable[Dict]) -> np.ndarray:
+    """(n, 2) array of [lat, lng] from dicts with lat/lng or location {lat, lng}"""
+    points = []
+    for place in places:
+        point = place_coordinates(place)
+        if point is None:
+            raise ValueError(f"No coordinates for {place.get('name', place)}")
+        points.append(point)
+    return np.array(points, dtype=float).reshape(-1, 2)
+
+
+def place_coordinates(place: Dict) -> Optional[Tuple[float, float]]:
+    """(lat, lng) of a place dict, or None when it has no usable coordinates"""
+    location = place.get("location") if isinstance(place.get("location"), dict) else place
+    try:
+        lat, lng = float(location["lat"]), float(location["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    return float(haversine_matrix(np.array([[lat1, lng1]]), np.array([[lat2, lng2]]))[0, 0])
+
+
+def haversine_matrix(origins: np.ndarray, destinations: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Great-circle distances (km) between every origin and destination
+
+    Args:
+        origins: (n, 2) array of [lat, lng] in degrees
+        destinations: (m, 2) array; defaults to origins (square matrix)
+
+    Returns:
+        (n, m) distance matrix, computed in one vectorized pass
+    """
+    origins = np.radians(np.asarray(origins, dtype=float).reshape(-1, 2))
+    destinations = origins if destinations is None else np.radians(np.asarray(destinations, dtype=float).reshape(-1, 2))
+
+    lat1 = origins[:, 0][:, None]
+    lng1 = origins[:, 1][:, None]
+    lat2 = destinations[:, 0][None, :]
+    lng2 = destinations[:, 1][None, :]
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def travel_minutes(distance_km: np.ndarray) -> np.ndarray:
+    """Estimated travel time: walking for short hops, city transit beyond WALKING_LIMIT_KM"""
+    distance_km = np.asarray(distance_km, dtype=float)
+    return np.where(
+        distance_km <= WALKING_LIMIT_KM,
+        distance_km / WALKING_SPEED_KMH * 60,
+        distance_km / CITY_TRANSIT_SPEED_KMH * 60 + 10  # + waiting / transfers
+    )
+
+
+def project_km(points: np.ndarray) -> np.ndarray:
+    """Equirectangular projection to a local km plane (fine at city scale, used for clustering)"""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if not len(points):
+        return points
+    lat0 = np.radians(points[:, 0].mean())
+    km_per_degree = np.pi * EARTH_RADIUS_KM / 180
+    return np.column_stack((
+        points[:, 0] * km_per_degree,
+        points[:, 1] * km_per_degree * np.cos(lat0)
+    ))
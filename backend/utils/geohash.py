@@ -0,0 +1,82 @@
+# backend/utils/geohash.py
+from typing import List, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {ch: i for i, ch in enumerate(BASE32)}
+
+
+def encode(lat: float, lng: float, precision: int = 5) -> str:
+    """Geohash of a point ("u09tv" for central Paris at precision 5)"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate longitude / latitude, starting with longitude
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """(south, west, north, east) of a geohash cell"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for ch in geohash:
+        value = _DECODE[ch]
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            middle = (interval[0] + interval[1]) / 2
+            if (value >> shift) & 1:
+                interval[0] = middle
+            else:
+                interval[1] = middle
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(lat, lng) size in degrees of a cell at this precision"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def covering(south: float, west: float, north: float, east: float, precision: int = 5) -> List[str]:
+    """
+    Geohash cells (at one precision) that together cover a bounding box
+
+    Args:
+        south, west, north, east: box in degrees (not crossing the antimeridian)
+        precision: geohash length; every returned cell has this length
+
+    Returns:
+        Sorted list of distinct geohashes
+    """
+    lat_step, lng_step = cell_size(precision)
+    south, north = max(south, -90.0), min(north, 90.0)
+    west, east = max(west, -180.0), min(east, 180.0)
+
+    cells = set()
+    lat = south
+    while True:
+        lng = west
+        while True:
+            cells.add(encode(min(lat, north), min(lng, east), precision))
+            if lng >= east:
+                break
+            lng = min(lng + lng_step, east)
+        if lat >= north:
+            break
+        lat = min(lat + lat_step, north)
+    return sorted(cells)
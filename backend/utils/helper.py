@@ -1,2 +1,25 @@
 # backend/utils/helper.py
+import hashlib
+import re
+import unicodedata
 
+
+def fold_text(text: str) -> str:
+    """Case-, accent-, punctuation- and whitespace-insensitive form of a name.
+
+    "  Pâris, France " -> "paris, france"
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^\w,]+", " ", text.casefold())
+    return re.sub(r"\s+", " ", text).strip(" ,")
+
+
+def stable_hash(text: str) -> str:
+    """Hex digest of a string that is the same in every process (unlike hash())"""
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=10).hexdigest()
+
+
+def stable_seed(text: str, modulo: int = 10000) -> int:
+    """Deterministic number in [0, modulo) for a string, e.g. an image seed"""
+    return int(stable_hash(text), 16) % modulo
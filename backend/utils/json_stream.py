@@ -0,0 +1,133 @@
+# backend/utils/json_stream.py
+import json
+from typing import Any, List
+
+
+class JsonArrayStream:
+    """Incrementally extract the elements of one top-level JSON array.
+
+    Text is fed in arbitrary chunks (LLM tokens, HTTP body chunks). Each
+    element of the array stored under `key` in the top-level object is
+    returned from `feed` as soon as its closing bracket has arrived, so
+    callers can act on it before the rest of the document exists.
+    Anything before the first '{' (e.g. a markdown code fence) is ignored.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        # Structural scanner state used while seeking the array
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = None
+        self._pending_key = None
+
+    def feed(self, text: str) -> List[Any]:
+        """Add a chunk of text and return any newly completed array elements"""
+        if self.done or not text:
+            return []
+
+        self._buffer += text
+        elements = []
+
+        entered = False
+        if not self._in_array:
+            self._seek_array()
+            entered = self._in_array
+
+        # Object/array elements can only complete once a closing bracket has
+        # arrived, so skip decode attempts on chunks that can't finish one
+        if self._in_array and not self.done and (entered or "}" in text or "]" in text):
+            elements.extend(self._read_elements())
+
+        # Drop consumed elements so long streams don't grow the buffer
+        # (the short prefix before the array is kept while it is scanned)
+        if self._in_array and self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+        return elements
+
+    def _seek_array(self):
+        """Scan the object structure until the target array opens"""
+        buffer = self._buffer
+        pos = self._pos
+
+        while pos < len(buffer):
+            char = buffer[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = buffer[self._string_start:pos]
+                pos += 1
+                continue
+
+            if char == '"':
+                if self._depth >= 1:
+                    self._in_string = True
+                    self._string_start = pos + 1
+            elif char == ":" and self._depth == 1:
+                self._pending_key = self._last_string
+            elif char == "," and self._depth == 1:
+                self._pending_key = None
+            elif char == "[" and self._depth == 1 and self._pending_key == self.key:
+                self._in_array = True
+                self._pos = pos + 1
+                return
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    # Top-level object closed without the array
+                    self.done = True
+                    self._pos = pos + 1
+                    return
+            pos += 1
+
+        self._pos = pos
+
+    def _read_elements(self) -> List[Any]:
+        """Decode complete elements sitting at the front of the buffer"""
+        elements = []
+        buffer = self._buffer
+
+        while True:
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            self._pos = pos
+
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self.done = True
+                self._pos = pos + 1
+                break
+
+            try:
+                element, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element not complete yet - wait for more text
+                break
+
+            if end == len(buffer) and not isinstance(element, (dict, list, str)):
+                # A scalar at the very end may still be growing (e.g. "12" -> "123")
+                break
+
+            elements.append(element)
+            self._pos = end
+
+        return elements
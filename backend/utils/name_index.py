@@ -0,0 +1,118 @@
+# backend/utils/name_index.py
+import math
+import re
+from collections import defaultdict
+from typing import Any, Callable, Iterable, List, Optional
+
+from utils.helper import fold_text
+
+
+def _tokens(folded: str) -> List[str]:
+    return [token for token in re.split(r"[\W_]+", folded) if token]
+
+
+def _trigrams(folded: str) -> set:
+    padded = f"  {' '.join(_tokens(folded))} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Fuzzy lookup of items (e.g. attractions) by name.
+
+    Names are folded (case, accents, punctuation) so "Sagrada Família" and
+    "sagrada familia" are the same key. Non-exact lookups go through token
+    and trigram inverted indexes, so only items sharing at least one trigram
+    with the query are scored instead of every item in the set.
+    """
+
+    def __init__(self, items: Iterable = (), key: Callable[[Any], str] = None,
+                 threshold: float = 0.6, margin: float = 0.05):
+        self._key = key or (lambda item: item.get("name", "") if isinstance(item, dict) else str(item))
+        self._threshold = threshold
+        self._margin = margin
+        self._items = []
+        self._exact = {}                       # folded name -> item id
+        self._item_tokens = []
+        self._item_trigrams = []
+        self._token_postings = defaultdict(set)
+        self._trigram_postings = defaultdict(set)
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, name: str) -> bool:
+        return fold_text(name) in self._exact
+
+    def add(self, item) -> bool:
+        """Index an item; returns False (and skips it) if its name is already present"""
+        folded = fold_text(self._key(item))
+        if not folded or folded in self._exact:
+            return False
+
+        item_id = len(self._items)
+        tokens = set(_tokens(folded))
+        trigrams = _trigrams(folded)
+        self._items.append(item)
+        self._exact[folded] = item_id
+        self._item_tokens.append(tokens)
+        self._item_trigrams.append(trigrams)
+        for token in tokens:
+            self._token_postings[token].add(item_id)
+        for trigram in trigrams:
+            self._trigram_postings[trigram].add(item_id)
+        return True
+
+    def match(self, name: str) -> Optional[Any]:
+        """Return the best matching item, or None if nothing is close enough
+
+        Ambiguous matches (two candidates within `margin` of each other, e.g.
+        "Museum" against several museums) also return None.
+        """
+        folded = fold_text(name)
+        if not folded:
+            return None
+        if folded in self._exact:
+            return self._items[self._exact[folded]]
+
+        query_tokens = set(_tokens(folded))
+        query_trigrams = _trigrams(folded)
+
+        # Count shared trigrams per candidate straight from the postings
+        shared = defaultdict(int)
+        for trigram in query_trigrams:
+            for item_id in self._trigram_postings.get(trigram, ()):
+                shared[item_id] += 1
+
+        scores = []
+        for item_id, common in shared.items():
+            dice = 2 * common / (len(query_trigrams) + len(self._item_trigrams[item_id]))
+            # Token overlap handles extra/missing words, trigrams alone handle typos
+            overlap = self._token_overlap(query_tokens, self._item_tokens[item_id])
+            score = max(0.4 * dice + 0.6 * overlap, dice)
+            scores.append((score, item_id))
+
+        if not scores:
+            return None
+        scores.sort(reverse=True)
+        best_score, best_id = scores[0]
+        if best_score < self._threshold:
+            return None
+        if len(scores) > 1 and best_score - scores[1][0] < self._margin:
+            return None
+        return self._items[best_id]
+
+    def _token_overlap(self, query_tokens: set, item_tokens: set) -> float:
+        """IDF-weighted share of the shorter name's tokens found in the other"""
+        smaller = query_tokens if len(query_tokens) <= len(item_tokens) else item_tokens
+        if not smaller:
+            return 0.0
+        weights = {token: self._idf(token) for token in smaller}
+        total = sum(weights.values())
+        common = sum(weight for token, weight in weights.items() if token in query_tokens and token in item_tokens)
+        return common / total if total else 0.0
+
+    def _idf(self, token: str) -> float:
+        # Tokens shared by many items ("museum", "tower") say little about identity
+        return math.log(1 + len(self._items) / (1 + len(self._token_postings.get(token, ()))))
@@ -0,0 +1,97 @@
+# backend/utils/osm_tags.py
+from typing import Dict, Optional, Tuple
+
+# OpenStreetMap features we treat as attractions: (element kinds, tag key, accepted values).
+# Shared by the live Overpass queries and the offline importer (import_osm.py).
+ATTRACTION_FILTERS = [
+    (("node", "way"), "tourism", ("attraction", "museum", "monument")),
+    (("node",), "tourism", ("viewpoint", "zoo", "landmark")),
+    (("node", "way"), "leisure", ("park",)),
+    (("node", "way"), "historic", ("monument", "castle", "ruins")),
+    (("node",), "amenity", ("theatre", "cinema", "library")),
+]
+
+# OSM element kinds; node 42 and way 42 are different features
+OSM_TYPES = ("node", "way", "relation")
+
+DEFAULT_RATING = 4.3
+DEFAULT_OPENING_HOURS = "9:00 AM - 6:00 PM"
+
+
+def overpass_selectors() -> str:
+    """Overpass QL union body for ATTRACTION_FILTERS (named features only)"""
+    lines = []
+    for kinds, key, values in ATTRACTION_FILTERS:
+        for kind in kinds:
+            lines.append(f'{kind}["{key}"~"^({"|".join(values)})$"]["name"];')
+    return "\n".join(lines)
+
+
+def is_attraction(kind: str, tags: Dict) -> bool:
+    """Whether an OSM element of this kind ("node" / "way") passes ATTRACTION_FILTERS"""
+    if not tags.get("name"):
+        return False
+    return any(kind in kinds and tags.get(key) in values for kinds, key, values in ATTRACTION_FILTERS)
+
+
+def place_id(osm_type: str, osm_id: int) -> str:
+    """Place id of an OSM element ("osm_way_123")"""
+    return f"osm_{osm_type}_{osm_id}"
+
+
+def parse_place_id(value: str) -> Optional[Tuple[str, int]]:
+    """(osm_type, osm_id) of a place_id() string, or None for anything else"""
+    parts = str(value).split("_")
+    if len(parts) != 3 or parts[0] != "osm" or parts[1] not in OSM_TYPES:
+        return None
+    osm_id = element_id({"id": parts[2]})
+    return (parts[1], osm_id) if osm_id is not None else None
+
+
+def element_id(element: Dict) -> Optional[int]:
+    """Integer id of an OSM element, or None when missing or not an integer"""
+    value = element.get("id")
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def attraction_place(osm_type: str, osm_id: int, lat: float, lng: float, tags: Dict) -> Optional[Dict]:
+    """Place dict for a named OSM feature, or None for unnamed / placeholder names"""
+    name = tags.get("name")
+    if not name or name.startswith("Node") or name.startswith("Way"):
+        return None
+    try:
+        rating = float(tags.get("rating", DEFAULT_RATING))
+    except ValueError:
+        rating = DEFAULT_RATING
+    return {
+        "place_id": place_id(osm_type, osm_id),
+        "name": name,
+        "lat": lat,
+        "lng": lng,
+        "rating": rating,
+        "address": tags.get("addr:full", ""),
+        "type": tags.get("tourism", tags.get("leisure", tags.get("historic", "attraction"))),
+        "website": tags.get("website", ""),
+        "opening_hours": tags.get("opening_hours", DEFAULT_OPENING_HOURS)
+    }
+
+
+def element_place(element: Dict) -> Optional[Dict]:
+    """Place dict from an Overpass JSON node/way (with center), or None without id, position or name"""
+    osm_type = element.get("type", "node")
+    osm_id = element_id(element)
+    if osm_type not in OSM_TYPES or osm_id is None:
+        return None
+    if "center" in element:
+        lat, lng = element["center"]["lat"], element["center"]["lon"]
+    elif "lat" in element and "lon" in element:
+        lat, lng = element["lat"], element["lon"]
+    else:
+        return None
+    return attraction_place(osm_type, osm_id, lat, lng, element.get("tags", {}))
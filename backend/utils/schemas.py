@@ -1,2 +1,113 @@
 # backend/utils/schemas.py
+from typing import Dict, Optional
 
+# JSON Schema for one day of an itinerary (also sent to OpenAI for function calling)
+DAY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "day": {"type": "integer", "minimum": 1},
+        "title": {"type": "string"},
+        "activities": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "time": {"type": "string"},
+                    "activity": {"type": "string"},
+                    "cost": {"type": "string"},
+                    "duration": {"type": "string"}
+                },
+                "required": ["time", "activity", "cost", "duration"]
+            }
+        },
+        "meals": {
+            "type": "object",
+            "properties": {
+                "breakfast": {"type": "string"},
+                "lunch": {"type": "string"},
+                "dinner": {"type": "string"}
+            }
+        },
+        "total_cost": {"type": "string"}
+    },
+    "required": ["day", "title", "activities", "total_cost"]
+}
+
+ITINERARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "days": {"type": "array", "items": DAY_SCHEMA},
+        "tourist_spots": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "description": {"type": "string"},
+                    "ticket_price": {"type": "string"},
+                    "opening_hours": {"type": "string"}
+                },
+                "required": ["name"]
+            }
+        },
+        "tips": {"type": "array", "items": {"type": "string"}},
+        "estimated_total_cost": {"type": "string"}
+    },
+    "required": ["title", "days", "tourist_spots", "tips", "estimated_total_cost"]
+}
+
+
+def _as_text(value, money=False) -> str:
+    """Coerce scalars the model sometimes emits as numbers into strings"""
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"${value:g}" if money else f"{value:g}"
+    return value if isinstance(value, str) else str(value)
+
+
+def validate_day(day) -> Optional[Dict]:
+    """Validate one day object against DAY_SCHEMA.
+
+    Returns a cleaned copy (numbers coerced to strings, optional fields
+    defaulted) or None when the day is unusable: no valid day number or no
+    activity with a description.
+    """
+    if not isinstance(day, dict):
+        return None
+
+    try:
+        number = int(day.get("day"))
+    except (TypeError, ValueError):
+        return None
+    if number < 1:
+        return None
+
+    activities = []
+    for activity in day.get("activities") or []:
+        if not isinstance(activity, dict):
+            continue
+        description = _as_text(activity.get("activity")).strip()
+        if not description:
+            continue
+        activities.append({
+            "time": _as_text(activity.get("time")),
+            "activity": description,
+            "cost": _as_text(activity.get("cost"), money=True),
+            "duration": _as_text(activity.get("duration"))
+        })
+    if not activities:
+        return None
+
+    meals = day.get("meals") if isinstance(day.get("meals"), dict) else {}
+
+    cleaned = dict(day)
+    cleaned.update({
+        "day": number,
+        "title": _as_text(day.get("title")) or f"Day {number}",
+        "activities": activities,
+        "meals": {meal: _as_text(value) for meal, value in meals.items()},
+        "total_cost": _as_text(day.get("total_cost"), money=True)
+    })
+    return cleaned
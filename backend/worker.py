@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Background worker pool for AI Travel Buddy
+Claims queued itinerary generation jobs from MongoDB and runs them outside
+the web workers, so slow LLM calls never tie up gunicorn.
+
+Usage: python worker.py [--processes N]
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import traceback
+
+from config import Config
+
+
+def run_worker(index):
+    """Claim and process jobs until terminated"""
+    # Connect inside the child process - MongoClient is not fork-safe
+    from database import MongoDatabase
+    from services.ai_engine import AIEngine
+    from services.itinerary_store import ItineraryStore
+    from services.job_queue import JobQueue, LeaseHeartbeat, LeaseLostError
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    MongoDatabase.connect()
+    store = ItineraryStore()
+    print(f"[Worker {worker_id}] Ready")
+
+    while not stopping:
+        job = JobQueue.claim(worker_id)
+        if not job:
+            time.sleep(Config.JOB_POLL_INTERVAL)
+            continue
+
+        params = job["params"]
+        print(f"[Worker {worker_id}] Generating {params['destination']} (job {job['_id']})")
+        try:
+            with LeaseHeartbeat(job["_id"], worker_id) as heartbeat:
+                itinerary_data = AIEngine.generate(
+                    params["destination"],
+                    params["budget"],
+                    params["travel_duration"],
+                    params["travel_style"]
+                )
+                if heartbeat.lost.is_set():
+                    raise LeaseLostError(f"Lease on job {job['_id']} lost during generation")
+                itinerary_doc = store.save_generated(
+                    job["user_id"],
+                    params["destination"],
+                    params["budget"],
+                    params["travel_duration"],
+                    params["travel_style"],
+                    itinerary_data
+                )
+                JobQueue.complete(job["_id"], worker_id, itinerary_doc["_id"])
+        except LeaseLostError as e:
+            # Another worker owns the job now; its result is the one that counts
+            print(f"[Worker {worker_id}] Aborted: {e}")
+        except Exception as e:
+            traceback.print_exc()
+            try:
+                JobQueue.fail(job["_id"], worker_id, str(e), job.get("attempts", 1))
+            except LeaseLostError as lost:
+                print(f"[Worker {worker_id}] Aborted: {lost}")
+
+    MongoDatabase.close()
+    print(f"[Worker {worker_id}] Stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Travel Buddy job workers")
+    parser.add_argument("--processes", type=int, default=Config.JOB_WORKER_PROCESSES,
+                        help="number of worker processes")
+    args = parser.parse_args()
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(i,), name=f"job-worker-{i}")
+        for i in range(max(1, args.processes))
+    ]
+    for process in processes:
+        process.start()
+
+    def shutdown(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()